@@ -17,7 +17,11 @@ REVISIONS = "revisions"  # Only when enabled in config, not by default look at s
 ONLY_V2 = "only_v2"  # Remotes and virtuals from Artifactory returns this capability
 MATRIX_PARAMS = "matrix_params"
 OAUTH_TOKEN = "oauth_token"
-SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS]  # Server is always with revisions
+ZSTD_COMPRESSION = "zstd_compression"  # Packages can be uploaded as conan_package.tzst
+PACKAGES_INFO_BATCH = "packages_info_batch"  # Only v2, many conaninfo.txt in one request
+# Server is always with revisions
+SERVER_CAPABILITIES = [COMPLEX_SEARCH_CAPABILITY, REVISIONS, ZSTD_COMPRESSION,
+                       PACKAGES_INFO_BATCH]
 DEFAULT_REVISION_V1 = "0"
 
 __version__ = '1.66.0-dev'
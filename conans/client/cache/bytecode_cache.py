@@ -0,0 +1,74 @@
+import marshal
+import os
+import types
+import uuid
+from importlib.util import MAGIC_NUMBER
+
+from conans.util.files import mkdir
+from conans.util.sha import sha1
+
+# Before Python 3.8 the file name of the compiled code cannot be changed
+_RENAMEABLE_CODE = hasattr(types.CodeType, "replace")
+
+
+class RecipeBytecodeCache(object):
+    """ The compiled code of the recipes, by the sha1 of their source, so identical sources are
+    compiled only once in the process. If 'folder' is defined, the compiled code is also stored
+    there (marshal format) to be reused by other processes. The bytecode magic number of the
+    Python version is part of the key, so different Python versions don't share the code
+    """
+
+    def __init__(self, folder=None):
+        self.folder = folder
+        self._codes = {}  # {key: code}
+
+    def get_code(self, source, path):
+        """ The code of the module with 'source' bytes in the file 'path'
+        """
+        key = MAGIC_NUMBER + source
+        if not _RENAMEABLE_CODE:
+            key += path.encode("utf-8")
+        key = sha1(key)
+        code = self._codes.get(key)
+        if code is None:
+            code = self._load(key)
+            if code is None:
+                code = compile(source, path, "exec", dont_inherit=True)
+                self._save(key, code)
+            self._codes[key] = code
+        return _with_filename(code, path)
+
+    def _load(self, key):
+        if self.folder is None:
+            return None
+        try:
+            with open(os.path.join(self.folder, key), "rb") as f:
+                return marshal.load(f)
+        except (IOError, OSError):
+            return None
+        except (EOFError, ValueError, TypeError):  # Corrupted, it is compiled again
+            return None
+
+    def _save(self, key, code):
+        if self.folder is None:
+            return
+        path = os.path.join(self.folder, key)
+        tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+        try:
+            mkdir(self.folder)
+            with open(tmp, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(tmp, path)
+        except (IOError, OSError):  # The cache is an optimization, a read-only cache can be used
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def _with_filename(code, filename):
+    """ The same code, with the file name of the tracebacks and the inspect module replaced
+    """
+    if not _RENAMEABLE_CODE or code.co_filename == filename:
+        return code
+    consts = tuple(_with_filename(c, filename) if isinstance(c, types.CodeType) else c
+                   for c in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
@@ -7,8 +7,12 @@ from jinja2 import Environment, select_autoescape, FileSystemLoader, ChoiceLoade
 
 from conan import conan_version
 from conans.assets.templates import dict_loader
+from conans.client.cache.cache_index import CacheIndex
 from conans.client.cache.editable import EditablePackages
+from conans.client.cache.file_store import FileStore
+from conans.client.cache.graph_snapshots import GraphSnapshotCache
 from conans.client.cache.remote_registry import RemoteRegistry
+from conans.client.cache.search_cache import RemoteSearchCache
 from conans.client.conf import ConanClientConfigParser, get_default_client_conf, \
     get_default_settings_yml
 from conans.client.conf.detect import detect_defaults_settings
@@ -18,7 +22,8 @@ from conans.client.store.localdb import LocalDB
 from conans.errors import ConanException
 from conans.model.conf import ConfDefinition
 from conans.model.profile import Profile
-from conans.model.ref import ConanFileReference
+from conans.model.manifest import FileTreeManifest
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.model.settings import Settings
 from conans.paths import ARTIFACTS_PROPERTIES_FILE
 from conans.paths.package_layouts.package_cache_layout import PackageCacheLayout
@@ -34,6 +39,11 @@ PROFILES_FOLDER = "profiles"
 HOOKS_FOLDER = "hooks"
 TEMPLATES_FOLDER = "templates"
 GENERATORS_FOLDER = "generators"
+FILE_STORE_FOLDER = ".objects"
+REMOTE_SEARCH_CACHE_FOLDER = "search_cache"
+CACHE_INDEX_FILE = ".index.db"
+BYTECODE_FOLDER = "bytecode"
+GRAPH_SNAPSHOTS_FOLDER = "graph_snapshots"
 
 
 def _is_case_insensitive_os():
@@ -79,6 +89,7 @@ class ClientCache(object):
         self._no_lock = None
         self._config = None
         self._new_config = None
+        self._cache_index = None
         self.editable_packages = EditablePackages(self.cache_folder)
         # paths
         self._store_folder = self.config.storage_path or os.path.join(self.cache_folder, "data")
@@ -86,13 +97,112 @@ class ClientCache(object):
         _ = self.config.short_paths_home
 
     def all_refs(self):
+        cache_index = self.cache_index
+        if cache_index is not None:
+            return cache_index.refs()
+        return self._stored_refs()
+
+    def _stored_refs(self):
         subdirs = list_folder_subdirs(basedir=self._store_folder, level=4)
         return [ConanFileReference.load_dir_repr(folder) for folder in subdirs]
 
+    @property
+    def cache_index(self):
+        """ The index of the recipes and packages in the storage folder, None if not enabled.
+        It is created from the storage folders the first time it is used, or if it was created
+        by a version with a different format
+        """
+        if self._cache_index is None:
+            index_path = os.path.join(self._store_folder, CACHE_INDEX_FILE)
+            if not self.config.cache_index:
+                # Not updated while disabled, dropped so it is created again if enabled later
+                if os.path.exists(index_path):
+                    try:
+                        os.remove(index_path)
+                    except OSError as e:
+                        self._output.warn("Cannot remove the disabled cache index '%s': %s"
+                                          % (index_path, str(e)))
+                self._cache_index = False
+            elif os.path.exists(index_path) and CacheIndex(index_path).is_current():
+                self._cache_index = CacheIndex(index_path)
+            else:
+                self._cache_index = self._create_index(index_path)
+        return self._cache_index or None
+
+    def _create_index(self, index_path):
+        recipes = []
+        for ref in self._stored_refs():
+            entry = self._cache_layout(ref, short_paths=None, index=None).index_entry()
+            if entry is not None:
+                recipes.append((ref, ) + entry)
+        return CacheIndex.create(index_path, recipes)
+
+    def rebuild_index(self):
+        """ Recreates the cache index from the storage folders, returns the number of recipes
+        """
+        if not self.config.cache_index:
+            raise ConanException("The cache index is not enabled, enable it with "
+                                 "'conan config set general.cache_index=True'")
+        index_path = os.path.join(self._store_folder, CACHE_INDEX_FILE)
+        self._cache_index = self._create_index(index_path)
+        return len(self._cache_index.refs())
+
     @property
     def store(self):
         return self._store_folder
 
+    @property
+    def file_store(self):
+        """ The content addressed store deduplicating the packages files, None if not enabled.
+        It is inside the storage folder, so it is in the same filesystem as the packages
+        """
+        if not self.config.content_store:
+            return None
+        return FileStore(os.path.join(self._store_folder, FILE_STORE_FOLDER))
+
+    @property
+    def remote_search_cache(self):
+        """ The cache of the recipes searches in the remotes, to resolve version ranges, None if
+        not enabled
+        """
+        ttl = self.config.remote_search_cache_ttl
+        if not ttl:
+            return None
+        return RemoteSearchCache(os.path.join(self.cache_folder, REMOTE_SEARCH_CACHE_FOLDER), ttl)
+
+    @property
+    def bytecode_folder(self):
+        """ The folder of the compiled recipes, to compile every recipe source only once, None if
+        not enabled
+        """
+        if not self.config.recipe_bytecode_cache:
+            return None
+        return os.path.join(self.cache_folder, BYTECODE_FOLDER)
+
+    @property
+    def graph_snapshots(self):
+        """ The cache of the resolved dependency graphs, to not resolve them again if their inputs
+        didn't change, None if not enabled
+        """
+        if not self.config.graph_snapshot_cache:
+            return None
+        return GraphSnapshotCache(os.path.join(self.cache_folder, GRAPH_SNAPSHOTS_FOLDER))
+
+    def packages_files_md5s(self):
+        """ md5 of all the files of the packages in the cache, from their manifests
+        """
+        result = set()
+        for ref in self.all_refs():
+            layout = self.package_layout(ref, short_paths=None)
+            for package_id in layout.package_ids():
+                package_folder = layout.package(PackageReference(ref, package_id))
+                try:
+                    manifest = FileTreeManifest.load(package_folder)
+                except IOError:
+                    continue
+                result.update(manifest.file_sums.values())
+        return result
+
     def installed_as_editable(self, ref):
         return isinstance(self.package_layout(ref), PackageEditableLayout)
 
@@ -110,9 +220,12 @@ class ClientCache(object):
                                          conanfile_path, edited_ref.get("output_folder"))
         else:
             _check_ref_case(ref, self.store)
-            base_folder = os.path.normpath(os.path.join(self.store, ref.dir_repr()))
-            return PackageCacheLayout(base_folder=base_folder, ref=ref,
-                                      short_paths=short_paths, no_lock=self._no_locks())
+            return self._cache_layout(ref, short_paths, self.cache_index)
+
+    def _cache_layout(self, ref, short_paths, index):
+        base_folder = os.path.normpath(os.path.join(self.store, ref.dir_repr()))
+        return PackageCacheLayout(base_folder=base_folder, ref=ref, short_paths=short_paths,
+                                  no_lock=self._no_locks(), index=index)
 
     @property
     def remotes_path(self):
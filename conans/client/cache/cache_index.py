@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from conans.errors import ConanException
+from conans.model.ref import ConanFileReference
+from conans.util.files import mkdir
+
+RECIPES_TABLE = "recipes"
+PACKAGES_TABLE = "packages"
+# Increased when the tables change, to create the index again
+SCHEMA_VERSION = 1
+
+
+class CacheIndex(object):
+    """ Persistent index of the recipes, with their revision, and the packages of every recipe in
+    the local cache, so listing them doesn't need walking the storage folders. The packages are
+    stored with the settings and options of their conaninfo.txt (ConanInfo.serialize_min()), to
+    search them without loading every conaninfo.txt. It is updated transactionally by the cache
+    package layouts whenever the metadata of a recipe is updated, a package is completed or its
+    recipe or package folders are removed.
+
+    If it gets out of sync (e.g. folders manually removed) 'conan cache rebuild-index' recreates
+    it from the storage folders
+    """
+
+    def __init__(self, dbfile):
+        self._dbfile = dbfile
+
+    @staticmethod
+    def create(dbfile, recipes):
+        """ Creates the index with the 'recipes', tuples
+        (ref, revision, [(package_id, revision, serialize_min info)]).
+        The database is written in a temporary file and renamed, so concurrent readers always
+        find a complete index
+        """
+        tmp = "%s.%s.tmp" % (dbfile, uuid.uuid4().hex)
+        index = CacheIndex(tmp)
+        mkdir(os.path.dirname(dbfile))
+        try:
+            with index._connect() as connection:
+                connection.execute("CREATE TABLE %s (ref TEXT PRIMARY KEY, revision TEXT)"
+                                   % RECIPES_TABLE)
+                connection.execute("CREATE TABLE %s (ref TEXT, package_id TEXT, revision TEXT, "
+                                   "info TEXT, PRIMARY KEY (ref, package_id))" % PACKAGES_TABLE)
+                connection.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+                for ref, revision, packages in recipes:
+                    key = ref.dir_repr()
+                    connection.execute("INSERT INTO %s VALUES (?, ?)" % RECIPES_TABLE,
+                                       (key, revision))
+                    connection.executemany("INSERT INTO %s VALUES (?, ?, ?, ?)" % PACKAGES_TABLE,
+                                           [(key, package_id, prev, _dumps(info))
+                                            for package_id, prev, info in packages])
+            os.replace(tmp, dbfile)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return CacheIndex(dbfile)
+
+    @contextmanager
+    def _connect(self):
+        """ Connection in a transaction, committed if no error happens
+        """
+        try:
+            connection = sqlite3.connect(self._dbfile, timeout=30)
+        except sqlite3.Error as e:
+            raise ConanException("Could not open the cache index '%s': %s"
+                                 % (self._dbfile, str(e)))
+        try:
+            with connection:
+                yield connection
+        except sqlite3.Error as e:
+            raise ConanException("Cache index '%s' error: %s\nRun 'conan cache rebuild-index' "
+                                 "to recreate it" % (self._dbfile, str(e)))
+        finally:
+            connection.close()
+
+    def is_current(self):
+        """ False if the index was created by a version with different tables
+        """
+        with self._connect() as connection:
+            return connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+    def refs(self):
+        with self._connect() as connection:
+            rows = connection.execute("SELECT ref FROM %s ORDER BY ref" % RECIPES_TABLE)
+            return [ConanFileReference.load_dir_repr(row[0]) for row in rows]
+
+    def package_ids(self, ref):
+        with self._connect() as connection:
+            rows = connection.execute("SELECT package_id FROM %s WHERE ref=? ORDER BY package_id"
+                                      % PACKAGES_TABLE, (ref.dir_repr(),))
+            return [row[0] for row in rows]
+
+    def package_infos(self, ref):
+        """ {package_id: serialize_min info} of the indexed packages of the recipe
+        """
+        with self._connect() as connection:
+            rows = connection.execute("SELECT package_id, info FROM %s WHERE ref=? AND info IS NOT "
+                                      "NULL ORDER BY package_id" % PACKAGES_TABLE,
+                                      (ref.dir_repr(),))
+            return OrderedDict((package_id, json.loads(info)) for package_id, info in rows)
+
+    def save_recipe(self, ref, revision, packages_revisions):
+        """ Stores the recipe revision, and the revisions of its already indexed packages
+        """
+        key = ref.dir_repr()
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO %s VALUES (?, ?)" % RECIPES_TABLE,
+                               (key, revision))
+            connection.executemany("UPDATE %s SET revision=? WHERE ref=? AND package_id=?"
+                                   % PACKAGES_TABLE,
+                                   [(prev, key, package_id)
+                                    for package_id, prev in packages_revisions.items()])
+
+    def save_package(self, pref, revision, info):
+        with self._connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO %s VALUES (?, ?, ?, ?)" % PACKAGES_TABLE,
+                               (pref.ref.dir_repr(), pref.id, revision, _dumps(info)))
+
+    def remove_recipe(self, ref):
+        """ The packages are kept, as they are removed explicitly, and the recipe could be
+        exported or downloaded again
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM %s WHERE ref=?" % RECIPES_TABLE, (ref.dir_repr(),))
+
+    def remove_package(self, pref):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM %s WHERE ref=? AND package_id=?" % PACKAGES_TABLE,
+                               (pref.ref.dir_repr(), pref.id))
+
+
+def _dumps(info):
+    return json.dumps(info) if info is not None else None
@@ -0,0 +1,104 @@
+import errno
+import os
+import stat
+import uuid
+
+from conans.model.manifest import FileTreeManifest
+from conans.paths import CONAN_MANIFEST, CONANINFO
+from conans.util.files import md5sum, mkdir, reflink
+from conans.util.log import logger
+
+
+class FileStore(object):
+    """ Content addressed store of the files of the packages in the cache, to deduplicate the
+    identical files of different packages, typically headers shared by the different package_ids
+    of the same library. The files are keyed by the md5 of the package conanmanifest.txt, and
+    their permissions, and the package folders files are reflinks (when the filesystem supports
+    them) or hardlinks to the stored ones.
+
+    Files that cannot be linked, like in a different filesystem, are just kept as regular copies
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+        self._use_reflinks = None  # Lazily checked
+
+    def _object_path(self, md5, mode):
+        return os.path.join(self._folder, md5[:2], "%s_%o" % (md5, stat.S_IMODE(mode)))
+
+    def _clone(self, src, dst):
+        """ creates 'dst' as a reflink or hardlink of 'src', using a temporary file, so 'dst' is
+        replaced atomically if it exists
+        """
+        tmp = "%s.%s.tmp" % (dst, uuid.uuid4().hex)
+        if self._use_reflinks is not False:
+            self._use_reflinks = reflink(src, tmp)
+        if not self._use_reflinks:
+            os.link(src, tmp)
+        try:
+            os.replace(tmp, dst)
+        except OSError:
+            os.remove(tmp)
+            raise
+
+    def link(self, md5, size, mode, target):
+        """ Materializes the stored file with 'md5' in 'target' if it exists. Returns False if
+        it is not in the store, so the caller has to write it
+        """
+        object_path = self._object_path(md5, mode)
+        try:
+            st = os.stat(object_path)
+            if st.st_size != size or stat.S_IMODE(st.st_mode) != stat.S_IMODE(mode):
+                return False
+            self._clone(object_path, target)
+        except (IOError, OSError):
+            return False
+        return True
+
+    def add_folder(self, folder):
+        """ Stores the files of a package folder, and replaces the ones already stored by links
+        to them. The manifest md5 are verified before storing new files, as the manifest of a
+        downloaded package could differ from its contents
+        """
+        manifest = FileTreeManifest.load(folder)
+        for name, md5 in manifest.file_sums.items():
+            if name in (CONANINFO, CONAN_MANIFEST):
+                continue
+            path = os.path.join(folder, name)
+            try:
+                st = os.lstat(path)
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+                object_path = self._object_path(md5, st.st_mode)
+                try:
+                    object_st = os.stat(object_path)
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        raise
+                    if md5sum(path) == md5:
+                        mkdir(os.path.dirname(object_path))
+                        self._clone(path, object_path)
+                    continue
+                if object_st.st_ino != st.st_ino and object_st.st_size == st.st_size:
+                    self._clone(object_path, path)
+            except (IOError, OSError) as e:
+                logger.debug("FILE STORE: Cannot store '%s': %s" % (path, str(e)))
+
+    def remove_unused(self, used_md5s):
+        """ Removes the stored files not used by any package. 'used_md5s' are the md5 in the
+        manifests of the packages in the cache. Hardlinked files still linked are always kept
+        """
+        if not os.path.isdir(self._folder):
+            return
+        for subfolder in os.listdir(self._folder):
+            subfolder = os.path.join(self._folder, subfolder)
+            for filename in os.listdir(subfolder):
+                md5 = filename.split("_", 1)[0]
+                if md5 in used_md5s:
+                    continue
+                path = os.path.join(subfolder, filename)
+                try:
+                    if os.stat(path).st_nlink == 1:
+                        os.remove(path)
+                except OSError as e:
+                    logger.debug("FILE STORE: Cannot remove '%s': %s" % (path, str(e)))
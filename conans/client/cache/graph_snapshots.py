@@ -0,0 +1,62 @@
+import json
+import os
+import time
+import uuid
+
+from conans.util.files import load, mkdir
+from conans.util.log import logger
+
+
+class GraphSnapshotCache(object):
+    """ Persistent cache of the resolved dependency graphs, by the hash of all the inputs of the
+    graph computation. Every graph is stored as a lockfile with the full recipe and package
+    revisions of its nodes, so it is possible to check that the cache still contains them, and
+    the recipes in the cache with the names of the nodes, that could resolve the version ranges
+    differently
+    """
+
+    def __init__(self, folder):
+        self._folder = folder
+
+    def _path(self, key):
+        return os.path.join(self._folder, key)
+
+    def get(self, key):
+        """ returns (serialized GraphLock with revisions, recipes) of the graph stored with 'key',
+        or None if it is not cached or the entry cannot be read
+        """
+        path = self._path(key)
+        try:
+            entry = json.loads(load(path))
+            return entry["graph_lock"], entry["recipes"]
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            logger.debug("GRAPH SNAPSHOTS: Wrong entry '%s': %s" % (path, str(e)))
+            return None
+
+    def save(self, key, graph_lock, recipes):
+        """ stores the serialized GraphLock 'graph_lock' of the graph with 'key', and the
+        'recipes' references (strings) in the cache when it was computed
+        """
+        entry = {"time": time.time(),
+                 "graph_lock": graph_lock,
+                 "recipes": recipes}
+        path = self._path(key)
+        # Written in a temporary file and renamed, concurrent readers never see partial entries
+        tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+        try:
+            mkdir(self._folder)
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except (IOError, OSError) as e:
+            logger.debug("GRAPH SNAPSHOTS: Cannot save '%s': %s" % (path, str(e)))
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def remove(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from conans.model.ref import ConanFileReference
+from conans.util.files import load, mkdir
+from conans.util.log import logger
+
+
+class RemoteSearchCache(object):
+    """ Persistent cache of the recipes found in the remotes searching a pattern, to resolve
+    version ranges without searching the remotes in every command. Entries older than the TTL
+    are revalidated with the ETag and Last-Modified validators of the previous response, when
+    the remote provided them, so a not modified listing is not transferred again. There is one
+    entry per remote, user and pattern, as the recipes a user can see depend on its permissions
+    """
+
+    def __init__(self, folder, ttl):
+        self._folder = folder
+        self._ttl = ttl
+
+    def _path(self, remote, user, pattern):
+        key = "{}\n{}\n{}".format(remote.url, user or "", pattern)
+        key = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self._folder, key)
+
+    def get(self, remote, user, pattern):
+        """ returns (refs, fresh, etag, last_modified) of the last search of 'user' (None if
+        anonymous), or None if it is not cached or the entry cannot be read
+        """
+        path = self._path(remote, user, pattern)
+        try:
+            entry = json.loads(load(path))
+            refs = [ConanFileReference.loads(ref) for ref in entry["refs"]]
+            fresh = time.time() - entry["time"] < self._ttl
+            return refs, fresh, entry.get("etag"), entry.get("last_modified")
+        except (IOError, OSError):
+            return None
+        except Exception as e:
+            logger.debug("SEARCH CACHE: Wrong entry '%s': %s" % (path, str(e)))
+            return None
+
+    def save(self, remote, user, pattern, refs, etag=None, last_modified=None):
+        entry = {"remote": remote.url,
+                 "user": user,
+                 "pattern": pattern,
+                 "time": time.time(),
+                 "etag": etag,
+                 "last_modified": last_modified,
+                 "refs": [ref.full_str() for ref in refs]}
+        path = self._path(remote, user, pattern)
+        # Written in a temporary file and renamed, concurrent readers never see partial entries
+        tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+        try:
+            mkdir(self._folder)
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except (IOError, OSError) as e:
+            logger.debug("SEARCH CACHE: Cannot save '%s': %s" % (path, str(e)))
+            if os.path.exists(tmp):
+                os.remove(tmp)
@@ -76,6 +76,9 @@ def export_pkg(app, recorder, full_ref, source_folder, build_folder, package_fol
             prev = run_package_method(conanfile, package_id, hook_manager, conan_file_path, ref)
 
     packager.update_package_metadata(prev, layout, package_id, full_ref.revision)
+    file_store = cache.file_store
+    if file_store:
+        file_store.add_folder(dest_package_folder)
     pref = PackageReference(pref.ref, pref.id, prev)
     if pkg_node.graph_lock_node:
         pkg_node.graph_lock_node.relax()
@@ -9,14 +9,18 @@ from multiprocessing.pool import ThreadPool
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
 from conans.util.progress_bar import left_justify_message
-from conans.client.remote_manager import is_package_snapshot_complete, calc_files_checksum
+from conans.client.remote_manager import (is_package_snapshot_complete, calc_files_checksum,
+                                          register_file_checksum)
 from conans.client.source import retrieve_exports_sources
+from conans import ZSTD_COMPRESSION
 from conans.errors import ConanException, NotFoundException
 from conans.model.manifest import gather_files, FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference, check_valid_ref
 from conans.paths import (CONAN_MANIFEST, CONANFILE, EXPORT_SOURCES_TGZ_NAME,
-                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, CONANINFO)
+                          EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME, CONANINFO)
 from conans.search.search import search_packages, search_recipes
+from conans.util.compression import (ChecksumWriter, gzopen_parallel, zstdopen, is_zstd_file,
+                                     check_zstd_available)
 from conans.util.files import (load, clean_dirty, is_dirty,
                                gzopen_without_timestamps, set_dirty_context_manager)
 from conans.util.log import logger
@@ -313,14 +317,32 @@ class _PackagePreparator(object):
 
     def prepare_package(self, pref, integrity_check, policy, p_remote):
         pkg_layout = self._cache.package_layout(pref.ref)
-        cache_files = self._compress_package_files(pkg_layout, pref, integrity_check)
+        cache_files = self._compress_package_files(pkg_layout, pref, integrity_check, p_remote)
 
         if policy == UPLOAD_POLICY_SKIP:
             return None
         files_to_upload, deleted = self._package_files_to_upload(pref, policy, cache_files, p_remote)
         return files_to_upload, deleted, cache_files
 
-    def _compress_package_files(self, layout, pref, integrity_check):
+    def _package_tgz_names(self, remote):
+        """ The package is always compressed as the conan_package.tgz understood by every client.
+        With compression_format=zstd, if the remote supports it, it is also compressed as
+        conan_package.tzst, that the clients supporting it download instead
+        """
+        compression_format = get_env("CONAN_COMPRESSION_FORMAT", "gzip")
+        if compression_format == "gzip":
+            return [PACKAGE_TGZ_NAME]
+        if compression_format != "zstd":
+            raise ConanException("Invalid compression_format '%s', the possible values are "
+                                 "'gzip' and 'zstd'" % compression_format)
+        check_zstd_available(PACKAGE_TZST_NAME)
+        if not self._remote_manager.server_capable(remote, ZSTD_COMPRESSION):
+            logger.debug("UPLOAD: Remote '%s' doesn't support zstd, using %s"
+                         % (remote.name, PACKAGE_TGZ_NAME))
+            return [PACKAGE_TGZ_NAME]
+        return [PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME]
+
+    def _compress_package_files(self, layout, pref, integrity_check, remote):
         t1 = time.time()
         if layout.package_is_dirty(pref):
             raise ConanException("Package %s is corrupted, aborting upload.\n"
@@ -328,11 +350,14 @@ class _PackagePreparator(object):
                                  % (pref, pref.ref, pref.id))
 
         download_pkg_folder = layout.download_package(pref)
-        package_tgz = os.path.join(download_pkg_folder, PACKAGE_TGZ_NAME)
-        if is_dirty(package_tgz):
-            self._output.warn("%s: Removing %s, marked as dirty" % (str(pref), PACKAGE_TGZ_NAME))
-            os.remove(package_tgz)
-            clean_dirty(package_tgz)
+        package_tgzs = {name: os.path.join(download_pkg_folder, name)
+                        for name in self._package_tgz_names(remote)}
+        for package_tgz_name, package_tgz in package_tgzs.items():
+            if is_dirty(package_tgz):
+                self._output.warn("%s: Removing %s, marked as dirty"
+                                  % (str(pref), package_tgz_name))
+                os.remove(package_tgz)
+                clean_dirty(package_tgz)
 
         # Get all the files in that directory
         # existing package, will use short paths if defined
@@ -349,19 +374,21 @@ class _PackagePreparator(object):
             logger.debug("UPLOAD: Time remote_manager check package integrity : %f"
                          % (time.time() - t1))
 
-        if not os.path.isfile(package_tgz):
-            if self._output and not self._output.is_terminal:
-                self._output.writeln("Compressing package...")
-            tgz_files = {f: path for f, path in files.items() if
-                         f not in [CONANINFO, CONAN_MANIFEST]}
-            tgz_path = compress_files(tgz_files, symlinks, PACKAGE_TGZ_NAME, download_pkg_folder,
-                                      self._output)
-            assert tgz_path == package_tgz
-            assert os.path.exists(package_tgz)
-
-        return {PACKAGE_TGZ_NAME: package_tgz,
-                CONANINFO: files[CONANINFO],
-                CONAN_MANIFEST: files[CONAN_MANIFEST]}
+        for package_tgz_name, package_tgz in package_tgzs.items():
+            if not os.path.isfile(package_tgz):
+                if self._output and not self._output.is_terminal:
+                    self._output.writeln("Compressing package...")
+                tgz_files = {f: path for f, path in files.items() if
+                             f not in [CONANINFO, CONAN_MANIFEST]}
+                tgz_path = compress_files(tgz_files, symlinks, package_tgz_name,
+                                          download_pkg_folder, self._output)
+                assert tgz_path == package_tgz
+                assert os.path.exists(package_tgz)
+
+        result = {CONANINFO: files[CONANINFO],
+                  CONAN_MANIFEST: files[CONAN_MANIFEST]}
+        result.update(package_tgzs)
+        return result
 
     def _package_integrity_check(self, pref, files, package_folder):
         # If package has been modified remove tgz to regenerate it
@@ -635,10 +662,21 @@ class CmdUpload(object):
 
 def compress_files(files, symlinks, name, dest_dir, output=None):
     t1 = time.time()
-    # FIXME, better write to disk sequentially and not keep tgz contents in memory
     tgz_path = os.path.join(dest_dir, name)
+    threads = get_env("CONAN_COMPRESSION_THREADS", 1)
     with set_dirty_context_manager(tgz_path), open(tgz_path, "wb") as tgz_handle:
-        tgz = gzopen_without_timestamps(name, mode="w", fileobj=tgz_handle)
+        # The tgz is written sequentially to disk, hashing it on the fly, so it is not necessary
+        # to read it back again to compute its checksums
+        checksum_handle = ChecksumWriter(tgz_handle)
+        if is_zstd_file(name):
+            tgz = zstdopen(name, checksum_handle,
+                           compresslevel=get_env("CONAN_COMPRESSION_LEVEL", 9), threads=threads)
+        elif threads > 1:
+            tgz = gzopen_parallel(name, checksum_handle,
+                                  compresslevel=get_env("CONAN_COMPRESSION_LEVEL", 9),
+                                  threads=threads)
+        else:
+            tgz = gzopen_without_timestamps(name, mode="w", fileobj=checksum_handle)
 
         for filename, dest in sorted(symlinks.items()):
             info = tarfile.TarInfo(name=filename)
@@ -663,6 +701,7 @@ def compress_files(files, symlinks, name, dest_dir, output=None):
                     with open(abs_path, 'rb') as file_handler:
                         tgz.addfile(tarinfo=info, fileobj=file_handler)
         tgz.close()
+    register_file_checksum(tgz_path, checksum_handle.checksums)
 
     duration = time.time() - t1
     log_compressed_files(files, duration, tgz_path)
@@ -1937,6 +1937,26 @@ class Command(object):
                 self._out.writeln("    Path: %s" % v["path"])
                 self._out.writeln("    Layout: %s" % v["layout"])
 
+    def cache(self, *args):
+        """
+        Manages the local cache.
+
+        Use the subcommand 'rebuild-index' to recreate the index of the recipes and packages
+        in the cache (enabled with 'general.cache_index') from the storage folders.
+        """
+        parser = argparse.ArgumentParser(description=self.cache.__doc__,
+                                         prog="conan cache",
+                                         formatter_class=SmartFormatter)
+        subparsers = parser.add_subparsers(dest='subcommand', help='sub-command help')
+        subparsers.required = True
+        subparsers.add_parser('rebuild-index', help='Recreate the index of the cache contents')
+
+        args = parser.parse_args(*args)
+
+        if args.subcommand == "rebuild-index":
+            recipes = self._conan.cache_rebuild_index()
+            self._out.success("Cache index rebuilt: %s recipes" % recipes)
+
     def frogarian(self, *args):
         """
         Conan The Frogarian
@@ -2086,7 +2106,8 @@ class Command(object):
                 ("Package development commands", ("source", "build", "package", "editable",
                                                   "workspace")),
                 ("Misc commands", ("profile", "remote", "user", "imports", "copy", "remove",
-                                   "alias", "download", "inspect", "help", "lock", "frogarian"))]
+                                   "alias", "download", "inspect", "help", "lock", "cache",
+                                   "frogarian"))]
 
         def check_all_commands_listed():
             """Keep updated the main directory, raise if don't"""
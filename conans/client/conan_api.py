@@ -33,7 +33,7 @@ from conans.client.graph.range_resolver import RangeResolver
 from conans.client.hook_manager import HookManager
 from conans.client.importer import run_imports, undo_imports
 from conans.client.installer import BinaryInstaller
-from conans.client.loader import ConanFileLoader
+from conans.client.loader import ConanFileLoader, set_bytecode_cache_folder
 from conans.client.manager import deps_install
 from conans.client.migrations import ClientMigrator
 from conans.client.output import ConanOutput, colorama_initialize
@@ -203,6 +203,7 @@ class ConanApp(object):
         self.pyreq_loader = PyRequireLoader(self.proxy, self.range_resolver)
         self.loader = ConanFileLoader(self.runner, self.out, self.python_requires,
                                       self.generator_manager, self.pyreq_loader, self.requester)
+        set_bytecode_cache_folder(self.cache.bytecode_folder)
 
         self.binaries_analyzer = GraphBinariesAnalyzer(self.cache, self.out, self.remote_manager)
         self.graph_manager = GraphManager(self.out, self.cache, self.remote_manager, self.loader,
@@ -1337,6 +1338,10 @@ class ConanAPIV1(object):
     def editable_list(self):
         return {str(k): v for k, v in self.app.cache.editable_packages.edited_refs.items()}
 
+    @api_method
+    def cache_rebuild_index(self):
+        return self.app.cache.rebuild_index()
+
     @api_method
     def lock_update(self, old_lockfile, new_lockfile, cwd=None):
         cwd = cwd or os.getcwd()
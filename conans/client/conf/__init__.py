@@ -187,6 +187,8 @@ _t_default_client_conf = Template(textwrap.dedent("""
     [general]
     default_profile = {{default_profile}}
     compression_level = 9                 # environment CONAN_COMPRESSION_LEVEL
+    # compression_threads = 1               # environment CONAN_COMPRESSION_THREADS
+    # compression_format = gzip             # environment CONAN_COMPRESSION_FORMAT (gzip/zstd)
     sysrequires_sudo = True               # environment CONAN_SYSREQUIRES_SUDO
     request_timeout = 60                  # environment CONAN_REQUEST_TIMEOUT (seconds)
     default_package_id_mode = semver_direct_mode # environment CONAN_DEFAULT_PACKAGE_ID_MODE
@@ -232,6 +234,17 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # scm_to_conandata                    # environment CONAN_SCM_TO_CONANDATA
 
     # config_install_interval = 1h
+    # stream_downloads = False            # environment CONAN_STREAM_DOWNLOADS
+    # content_store = False               # environment CONAN_CONTENT_STORE
+    # download_segments = 4               # environment CONAN_DOWNLOAD_SEGMENTS
+    # download_segments_min_size = 33554432  # environment CONAN_DOWNLOAD_SEGMENTS_MIN_SIZE (bytes)
+    # upload_file_threads = 4             # environment CONAN_UPLOAD_FILE_THREADS
+    # max_connections = 32                # environment CONAN_MAX_CONNECTIONS
+    # remote_search_cache_ttl = 600       # environment CONAN_REMOTE_SEARCH_CACHE_TTL (seconds)
+    # cache_index = False                 # environment CONAN_CACHE_INDEX
+    # parallel_builds = 4                 # environment CONAN_PARALLEL_BUILDS (Linux only)
+    # recipe_bytecode_cache = False       # environment CONAN_RECIPE_BYTECODE_CACHE
+    # graph_snapshot_cache = False        # environment CONAN_GRAPH_SNAPSHOT_CACHE
     # required_conan_version = >=1.26
 
     # keep_python_files = False           # environment CONAN_KEEP_PYTHON_FILES
@@ -241,6 +254,9 @@ _t_default_client_conf = Template(textwrap.dedent("""
     # path beginning with "~" (if the environment var CONAN_USER_HOME is specified, this directory, even
     # with "~/", will be relative to the conan user home, not to the system user home)
     path = ./data
+    # download_cache = /path/to/my/cache
+    # download_cache_max_size = 10737418240  # environment CONAN_DOWNLOAD_CACHE_MAX_SIZE (bytes)
+    # download_cache_eviction = lru       # environment CONAN_DOWNLOAD_CACHE_EVICTION (lru, lfu)
 
     [proxies]
     # Empty (or missing) section will try to use system proxies.
@@ -281,6 +297,11 @@ class ConanClientConfigParser(ConfigParser, object):
         ],
         "general": [
             ("CONAN_COMPRESSION_LEVEL", "compression_level", 9),
+            ("CONAN_COMPRESSION_THREADS", "compression_threads", None),
+            ("CONAN_COMPRESSION_FORMAT", "compression_format", None),
+            ("CONAN_DOWNLOAD_SEGMENTS", "download_segments", None),
+            ("CONAN_DOWNLOAD_SEGMENTS_MIN_SIZE", "download_segments_min_size", None),
+            ("CONAN_UPLOAD_FILE_THREADS", "upload_file_threads", None),
             ("CONAN_NON_INTERACTIVE", "non_interactive", False),
             ("CONAN_SKIP_BROKEN_SYMLINKS_CHECK", "skip_broken_symlinks_check", False),
             ("CONAN_CACHE_NO_LOCKS", "cache_no_locks", False),
@@ -318,6 +339,10 @@ class ConanClientConfigParser(ConfigParser, object):
             ("CONAN_KEEP_PYTHON_FILES", "keep_python_files", False),
             # ("CONAN_DEFAULT_PROFILE_PATH", "default_profile", DEFAULT_PROFILE_NAME),
         ],
+        "storage": [
+            ("CONAN_DOWNLOAD_CACHE_MAX_SIZE", "download_cache_max_size", None),
+            ("CONAN_DOWNLOAD_CACHE_EVICTION", "download_cache_eviction", None),
+        ],
         "hooks": [
             ("CONAN_HOOKS", "", None),
         ]
@@ -496,6 +521,95 @@ class ConanClientConfigParser(ConfigParser, object):
         except ConanException:
             return None
 
+    @property
+    def stream_downloads(self):
+        try:
+            stream_downloads = get_env("CONAN_STREAM_DOWNLOADS")
+            if stream_downloads is None:
+                stream_downloads = self.get_item("general.stream_downloads")
+            return stream_downloads.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def parallel_builds(self):
+        parallel = get_env("CONAN_PARALLEL_BUILDS")
+        if parallel is None:
+            try:
+                parallel = self.get_item("general.parallel_builds")
+            except ConanException:
+                return None
+        try:
+            return int(parallel) if parallel is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'parallel_builds'")
+
+    @property
+    def max_connections(self):
+        max_connections = get_env("CONAN_MAX_CONNECTIONS")
+        if max_connections is None:
+            try:
+                max_connections = self.get_item("general.max_connections")
+            except ConanException:
+                return None
+        try:
+            return int(max_connections) if max_connections is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'max_connections'")
+
+    @property
+    def remote_search_cache_ttl(self):
+        ttl = get_env("CONAN_REMOTE_SEARCH_CACHE_TTL")
+        if ttl is None:
+            try:
+                ttl = self.get_item("general.remote_search_cache_ttl")
+            except ConanException:
+                return None
+        try:
+            return int(ttl) if ttl is not None else None
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'remote_search_cache_ttl'")
+
+    @property
+    def content_store(self):
+        try:
+            content_store = get_env("CONAN_CONTENT_STORE")
+            if content_store is None:
+                content_store = self.get_item("general.content_store")
+            return content_store.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def cache_index(self):
+        try:
+            cache_index = get_env("CONAN_CACHE_INDEX")
+            if cache_index is None:
+                cache_index = self.get_item("general.cache_index")
+            return cache_index.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def recipe_bytecode_cache(self):
+        try:
+            bytecode_cache = get_env("CONAN_RECIPE_BYTECODE_CACHE")
+            if bytecode_cache is None:
+                bytecode_cache = self.get_item("general.recipe_bytecode_cache")
+            return bytecode_cache.lower() in ("1", "true")
+        except ConanException:
+            return False
+
+    @property
+    def graph_snapshot_cache(self):
+        try:
+            snapshot_cache = get_env("CONAN_GRAPH_SNAPSHOT_CACHE")
+            if snapshot_cache is None:
+                snapshot_cache = self.get_item("general.graph_snapshot_cache")
+            return snapshot_cache.lower() in ("1", "true")
+        except ConanException:
+            return False
+
     @property
     def scm_to_conandata(self):
         try:
@@ -1,25 +1,44 @@
 import os
 import shutil
+import uuid
 from contextlib import contextmanager
 from threading import Lock
 
+import fasteners
 from six.moves.urllib_parse import urlsplit, urlunsplit
 
+from conans.client.downloaders.download_cache_index import DownloadCacheIndex
 from conans.client.downloaders.file_downloader import check_checksum
 from conans.errors import ConanException
+from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, \
+    PACKAGE_TZST_NAME
+from conans.util.compression import ChecksumReader
+from conans.util.env_reader import get_env
 from conans.util.log import logger
-from conans.util.files import mkdir, set_dirty, clean_dirty, is_dirty, remove
+from conans.util.files import mkdir, reflink, set_dirty, clean_dirty, is_dirty, remove
 from conans.util.locks import SimpleLock
 from conans.util.sha import sha256 as sha256_sum
 
+# Downloaded files that are never modified, served from the cache as hardlinks
+_HARDLINKED_FILES = (EXPORT_TGZ_NAME, EXPORT_SOURCES_TGZ_NAME, PACKAGE_TGZ_NAME,
+                     PACKAGE_TZST_NAME)
+
 
 class CachedFileDownloader(object):
+    """ Downloads the files through the download cache folder, where they are stored by the hash
+    of their url (and checksum). The accesses to the cached files are tracked in an index, and if
+    CONAN_DOWNLOAD_CACHE_MAX_SIZE is defined, the least recently used files (or the least
+    frequently used, CONAN_DOWNLOAD_CACHE_EVICTION=lfu) are removed when the cache exceeds it
+    """
     _thread_locks = {}  # Needs to be shared among all instances
 
     def __init__(self, cache_folder, file_downloader, user_download=False):
         self._cache_folder = cache_folder
         self._file_downloader = file_downloader
         self._user_download = user_download
+        self._index = DownloadCacheIndex(cache_folder)
+        self._max_size = get_env("CONAN_DOWNLOAD_CACHE_MAX_SIZE", 0)
+        self._eviction = get_env("CONAN_DOWNLOAD_CACHE_EVICTION", "lru")
 
     @contextmanager
     def _lock(self, lock_id):
@@ -34,6 +53,61 @@ class CachedFileDownloader(object):
             finally:
                 thread_lock.release()
 
+    def _try_remove(self, lock_id):
+        """ Removes the cached file if it is not being used by any thread or process, with the
+        same locks of _lock(), without waiting for them. Returns False if it is being used
+        """
+        lock = os.path.join(self._cache_folder, "locks", lock_id)
+        thread_lock = self._thread_locks.setdefault(lock, Lock())
+        if not thread_lock.acquire(False):
+            return False
+        try:
+            process_lock = fasteners.InterProcessLock(lock, logger=logger)
+            if not process_lock.acquire(blocking=False):
+                return False
+            try:
+                cached_path = os.path.join(self._cache_folder, lock_id)
+                if os.path.exists(cached_path):
+                    os.remove(cached_path)
+                clean_dirty(cached_path)
+                self._index.remove(lock_id)
+            finally:
+                process_lock.release()
+        finally:
+            thread_lock.release()
+        return True
+
+    def _evict(self):
+        if not self._max_size:
+            return
+        for name in self._index.eviction_candidates(self._max_size, self._eviction):
+            try:
+                if not self._try_remove(name):
+                    logger.debug("DOWNLOAD CACHE: %s in use, not evicted" % name)
+            except OSError as e:
+                logger.debug("DOWNLOAD CACHE: Cannot evict %s: %s" % (name, str(e)))
+
+    def _materialize(self, cached_path, file_path):
+        """ Creates 'file_path' as a reflink of the cached file, or as a hardlink for the
+        compressed Conan artifacts, that are only extracted and removed. Otherwise it is a copy,
+        as the file could be modified in place. A temporary file is renamed, so 'file_path' is
+        replaced atomically if it exists
+        """
+        tmp = "%s.%s.tmp" % (file_path, uuid.uuid4().hex)
+        try:
+            if not reflink(cached_path, tmp):
+                if self._user_download or os.path.basename(file_path) not in _HARDLINKED_FILES:
+                    shutil.copy2(cached_path, tmp)
+                else:
+                    try:
+                        os.link(cached_path, tmp)
+                    except OSError:  # Other filesystem, or not supported
+                        shutil.copy2(cached_path, tmp)
+            os.replace(tmp, file_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
     def download(self, url, file_path=None, md5=None, sha1=None, sha256=None, **kwargs):
         """ compatible interface of FileDownloader + checksum
         """
@@ -64,14 +138,46 @@ class CachedFileDownloader(object):
                                                sha1=sha1, sha256=sha256, **kwargs)
                 clean_dirty(cached_path)
 
+            self._index.touch(h, os.path.getsize(cached_path))
             if file_path is not None:
                 file_path = os.path.abspath(file_path)
                 mkdir(os.path.dirname(file_path))
-                shutil.copy2(cached_path, file_path)
+                self._materialize(cached_path, file_path)
+                result = None
             else:
                 with open(cached_path, 'rb') as handle:
-                    tmp = handle.read()
-                return tmp
+                    result = handle.read()
+        self._evict()
+        return result
+
+    def download_streamed(self, url, consumer, **kwargs):
+        """ compatible interface of FileDownloader.download_streamed(), the downloaded file is
+        teed to the cache, and if it is already there, it is streamed from the cache
+        """
+        h = self._get_hash(url)
+
+        with self._lock(h):
+            cached_path = os.path.join(self._cache_folder, h)
+            if is_dirty(cached_path):
+                if os.path.exists(cached_path):
+                    os.remove(cached_path)
+                clean_dirty(cached_path)
+
+            if not os.path.exists(cached_path):
+                set_dirty(cached_path)
+                checksums = self._file_downloader.download_streamed(url, consumer,
+                                                                    tee_path=cached_path,
+                                                                    **kwargs)
+                clean_dirty(cached_path)
+            else:
+                with open(cached_path, "rb") as handle:
+                    reader = ChecksumReader(handle)
+                    consumer(reader)
+                    reader.drain()
+                checksums = reader.checksums
+            self._index.touch(h, os.path.getsize(cached_path))
+        self._evict()
+        return checksums
 
     def _get_hash(self, url, checksum=None):
         """ For Api V2, the cached downloads always have recipe and package REVISIONS in the URL,
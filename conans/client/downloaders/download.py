@@ -9,3 +9,11 @@ def run_downloader(requester, output, verify, retry, retry_wait, download_cache,
     if download_cache:
         downloader = CachedFileDownloader(download_cache, downloader, user_download=user_download)
     return downloader.download(**kwargs)
+
+
+def run_streamed_downloader(requester, output, verify, download_cache, **kwargs):
+    downloader = FileDownloader(requester=requester, output=output, verify=verify,
+                                config_retry=None, config_retry_wait=None)
+    if download_cache:
+        downloader = CachedFileDownloader(download_cache, downloader)
+    return downloader.download_streamed(**kwargs)
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from conans.errors import ConanException
+from conans.util.files import mkdir
+
+# In the folder of the locks of the cached files, not mixed with the cached files
+INDEX_FILE = os.path.join("locks", "index.db")
+ENTRIES_TABLE = "entries"
+# Increased when the tables change, to create the index again
+SCHEMA_VERSION = 1
+
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class DownloadCacheIndex(object):
+    """ Index of the files of the download cache, with their size, last access time and number
+    of hits, to bound the total size of the cache evicting the least recently (lru) or the least
+    frequently (lfu) used files. It is shared by all the processes using the same download cache,
+    every update is a sqlite transaction.
+
+    The files already in the cache when the index is created are added with their modification
+    time as the last access time
+    """
+
+    def __init__(self, cache_folder):
+        self._cache_folder = cache_folder
+        self._dbfile = os.path.join(cache_folder, INDEX_FILE)
+
+    @contextmanager
+    def _connect(self):
+        """ Connection in an exclusive (for writing) transaction, committed if no error happens.
+        The index is created in the first connection
+        """
+        try:
+            mkdir(os.path.dirname(self._dbfile))
+            connection = sqlite3.connect(self._dbfile, timeout=30, isolation_level=None)
+        except sqlite3.Error as e:
+            raise ConanException("Could not open the download cache index '%s': %s"
+                                 % (self._dbfile, str(e)))
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    self._create(connection)
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            raise ConanException("Download cache index '%s' error: %s\nRemove it to recreate it"
+                                 % (self._dbfile, str(e)))
+        finally:
+            connection.close()
+
+    def _create(self, connection):
+        connection.execute("DROP TABLE IF EXISTS %s" % ENTRIES_TABLE)
+        connection.execute("CREATE TABLE %s (name TEXT PRIMARY KEY, size INTEGER, "
+                           "last_access REAL, hits INTEGER)" % ENTRIES_TABLE)
+        entries = []
+        for name in os.listdir(self._cache_folder):
+            path = os.path.join(self._cache_folder, name)
+            # The cached files are named with their hash, not the .dirty files
+            if "." in name or not os.path.isfile(path):
+                continue
+            stats = os.stat(path)
+            entries.append((name, stats.st_size, stats.st_mtime, 0))
+        connection.executemany("INSERT INTO %s VALUES (?, ?, ?, ?)" % ENTRIES_TABLE, entries)
+        connection.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+
+    def touch(self, name, size):
+        """ Records an access to the file 'name', adding it if it is not indexed
+        """
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute("UPDATE %s SET size=?, last_access=?, hits=hits + 1 "
+                                        "WHERE name=?" % ENTRIES_TABLE, (size, now, name))
+            if cursor.rowcount == 0:
+                connection.execute("INSERT INTO %s VALUES (?, ?, ?, 1)" % ENTRIES_TABLE,
+                                   (name, size, now))
+
+    def remove(self, name):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM %s WHERE name=?" % ENTRIES_TABLE, (name, ))
+
+    def total_size(self):
+        with self._connect() as connection:
+            total = connection.execute("SELECT SUM(size) FROM %s" % ENTRIES_TABLE).fetchone()[0]
+            return total or 0
+
+    def eviction_candidates(self, max_size, policy="lru"):
+        """ The names of the files to remove, in order, to bound the total size to 'max_size'
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ConanException("Invalid download cache eviction policy '%s', use one of %s"
+                                 % (policy, ", ".join(EVICTION_POLICIES)))
+        order = "last_access" if policy == "lru" else "hits, last_access"
+        with self._connect() as connection:
+            total = connection.execute("SELECT SUM(size) FROM %s" % ENTRIES_TABLE).fetchone()[0]
+            if not total or total <= max_size:
+                return []
+            rows = connection.execute("SELECT name, size FROM %s ORDER BY %s"
+                                      % (ENTRIES_TABLE, order))
+            result = []
+            for name, size in rows:
+                if total <= max_size:
+                    break
+                result.append(name)
+                total -= size
+            return result
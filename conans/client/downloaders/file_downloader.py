@@ -2,6 +2,9 @@ import os
 import re
 import time
 import traceback
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+from threading import Lock
 
 import six
 
@@ -10,6 +13,8 @@ from conans.client.tools.files import check_md5, check_sha1, check_sha256
 from conans.errors import ConanException, NotFoundException, AuthenticationException, \
     ForbiddenException, ConanConnectionError, RequestErrorException
 from conans.util import progress_bar
+from conans.util.compression import ChecksumReader
+from conans.util.env_reader import get_env
 from conans.util.files import mkdir
 from conans.util.log import logger
 from conans.util.tracer import log_download
@@ -24,6 +29,11 @@ def check_checksum(file_path, md5, sha1, sha256):
         check_sha256(file_path, sha256)
 
 
+@contextmanager
+def _null_context():
+    yield None
+
+
 class FileDownloader(object):
 
     def __init__(self, requester, output, verify, config_retry, config_retry_wait):
@@ -54,7 +64,7 @@ class FileDownloader(object):
 
         try:
             r = _call_with_retry(self._output, retry, retry_wait, self._download_file, url, auth,
-                                 headers, file_path)
+                                 headers, file_path, False, retry, retry_wait)
             if file_path:
                 check_checksum(file_path, md5, sha1, sha256)
             return r
@@ -63,7 +73,51 @@ class FileDownloader(object):
                 os.remove(file_path)
             raise
 
-    def _download_file(self, url, auth, headers, file_path, try_resume=False):
+    def download_streamed(self, url, consumer, auth=None, headers=None, tee_path=None):
+        """ Download the url, without saving it to disk (except a copy to tee_path if defined),
+        passing the response to consumer(fileobj), which reads it as a file. There are no
+        retries, as the consumer cannot be rewound.
+        returns the md5 and sha1 checksums of the whole downloaded file
+        """
+        t1 = time.time()
+        try:
+            response = self._requester.get(url, stream=True, verify=self._verify_ssl, auth=auth,
+                                           headers=headers)
+        except Exception as exc:
+            raise ConanException("Error downloading file %s: '%s'" % (url, exc))
+        _check_response(response, url, auth)
+
+        try:
+            logger.debug("DOWNLOAD: %s" % url)
+            total_length = int(response.headers.get("Content-Length") or 0)
+            description = "Downloading {}".format(os.path.basename(tee_path or url))
+            progress = progress_bar.Progress(total_length, self._output, description)
+            chunks = progress.update(response.iter_content(1024 * 100))
+            if tee_path:
+                mkdir(os.path.dirname(tee_path))
+            with open(tee_path, "wb") if tee_path else _null_context() as tee_handle:
+                reader = ChecksumReader(_ChunksReader(chunks), tee=tee_handle)
+                consumer(reader)
+                reader.drain()
+                downloaded_size = reader.size
+            gzip = (response.headers.get("content-encoding") == "gzip")
+            response.close()
+        except (NotFoundException, ForbiddenException, AuthenticationException):
+            raise
+        except Exception as e:
+            logger.debug(e.__class__)
+            logger.debug(traceback.format_exc())
+            raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
+                                       % str(e))
+
+        if total_length and downloaded_size != total_length and not gzip:
+            raise ConanConnectionError("Transfer interrupted before complete: %s < %s"
+                                       % (downloaded_size, total_length))
+        log_download(url, time.time() - t1)
+        return reader.checksums
+
+    def _download_file(self, url, auth, headers, file_path, try_resume=False, retry=0,
+                       retry_wait=0):
         t1 = time.time()
         if try_resume and file_path and os.path.exists(file_path):
             range_start = os.path.getsize(file_path)
@@ -78,17 +132,22 @@ class FileDownloader(object):
         except Exception as exc:
             raise ConanException("Error downloading file %s: '%s'" % (url, exc))
 
-        if not response.ok:
-            if response.status_code == 404:
-                raise NotFoundException("Not found: %s" % url)
-            elif response.status_code == 403:
-                if auth is None or (hasattr(auth, "token") and auth.token is None):
-                    # TODO: This is a bit weird, why this conversion? Need to investigate
-                    raise AuthenticationException(response_to_str(response))
-                raise ForbiddenException(response_to_str(response))
-            elif response.status_code == 401:
-                raise AuthenticationException()
-            raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+        _check_response(response, url, auth)
+
+        segments = _download_segments(response, file_path, range_start)
+        if segments:
+            try:
+                self._download_segmented(url, auth, headers, file_path, response, segments,
+                                         retry, retry_wait)
+            except (NotFoundException, ForbiddenException, AuthenticationException):
+                raise
+            except Exception as e:
+                logger.debug(traceback.format_exc())
+                # Every segment was already retried, the whole download is not retried again
+                raise _RetriedDownloadError("Download failed, check server, possibly try "
+                                            "again\n%s" % str(e))
+            log_download(url, time.time() - t1)
+            return None
 
         def read_response(size):
             for chunk in response.iter_content(size):
@@ -162,13 +221,150 @@ class FileDownloader(object):
             raise ConanConnectionError("Download failed, check server, possibly try again\n%s"
                                        % str(e))
 
+    def _download_segmented(self, url, auth, headers, file_path, response, segments, retry,
+                            retry_wait):
+        """ Downloads the file fetching several byte ranges concurrently, each one written at its
+        offset of the preallocated file. The first range is read from the already opened
+        response. Every range is resumed on failure, up to 'retry' times
+        """
+        total_length = segments[-1][1] + 1
+        logger.debug("DOWNLOAD: %s in %d segments" % (url, len(segments)))
+        description = "Downloading {}".format(os.path.basename(file_path))
+        progress = progress_bar.Progress(total_length, self._output, description)
+        progress_lock = Lock()
+
+        mkdir(os.path.dirname(file_path))
+        with open(file_path, "wb") as file_handler:
+            file_handler.truncate(total_length)
+
+        def download_segment(start, end, first_response=None):
+            # start is updated with the downloaded bytes, so retries resume the segment
+            state = {"offset": start, "response": first_response}
+
+            def fetch():
+                segment_response = state.pop("response", None)
+                try:
+                    if segment_response is None:
+                        range_headers = headers.copy() if headers else {}
+                        range_headers["range"] = "bytes={}-{}".format(state["offset"], end)
+                        segment_response = self._requester.get(url, stream=True, auth=auth,
+                                                               verify=self._verify_ssl,
+                                                               headers=range_headers)
+                        _check_response(segment_response, url, auth)
+                        content_range = segment_response.headers.get("Content-Range", "")
+                        match = re.match(r"^bytes (\d+)-(\d+)/(\d+)", content_range)
+                        if (segment_response.status_code != 206 or not match or
+                                int(match.group(1)) != state["offset"]):
+                            raise ConanException("Error in segmented download from %s\n"
+                                                 "Incorrect Content-Range header %s"
+                                                 % (url, content_range))
+                    with open(file_path, "r+b") as handler:
+                        handler.seek(state["offset"])
+                        for chunk in segment_response.iter_content(1024 * 100):
+                            chunk = chunk[:end + 1 - state["offset"]]
+                            handler.write(chunk)
+                            state["offset"] += len(chunk)
+                            with progress_lock:
+                                progress.increment(len(chunk))
+                            if state["offset"] > end:
+                                break
+                    segment_response.close()
+                except ConanException:
+                    raise
+                except Exception as exc:
+                    raise ConanException("Error downloading file %s: '%s'" % (url, exc))
+                if state["offset"] <= end:
+                    raise ConanException("Transfer interrupted before complete: %s < %s"
+                                         % (state["offset"], end + 1))
+
+            _call_with_retry(self._output, retry, retry_wait, fetch)
+
+        pool = ThreadPool(len(segments) - 1)
+        try:
+            results = [pool.apply_async(download_segment, segment) for segment in segments[1:]]
+            first_start, first_end = segments[0]
+            download_segment(first_start, first_end, first_response=response)
+            for result in results:
+                result.get()
+        finally:
+            pool.close()
+            pool.join()
+        progress.pb_close()
+
+
+def _download_segments(response, file_path, range_start):
+    """ Return the list of (start, end) byte ranges to download concurrently when the segmented
+    downloads are enabled (CONAN_DOWNLOAD_SEGMENTS > 1) and the server response allows it
+    """
+    segments = get_env("CONAN_DOWNLOAD_SEGMENTS", 1)
+    if segments <= 1 or not file_path or range_start:
+        return None
+    min_size = get_env("CONAN_DOWNLOAD_SEGMENTS_MIN_SIZE", 32 * 1024 * 1024)
+    if (response.headers.get("Accept-Ranges") != "bytes" or
+            response.headers.get("content-encoding")):
+        return None
+    try:
+        total_length = int(response.headers.get("Content-Length"))
+    except (TypeError, ValueError):
+        return None
+    if total_length < max(min_size, segments):
+        return None
+    segment_size = -(-total_length // segments)  # ceil
+    return [(start, min(start + segment_size, total_length) - 1)
+            for start in range(0, total_length, segment_size)]
+
+
+def _check_response(response, url, auth):
+    if not response.ok:
+        if response.status_code == 404:
+            raise NotFoundException("Not found: %s" % url)
+        elif response.status_code == 403:
+            if auth is None or (hasattr(auth, "token") and auth.token is None):
+                # TODO: This is a bit weird, why this conversion? Need to investigate
+                raise AuthenticationException(response_to_str(response))
+            raise ForbiddenException(response_to_str(response))
+        elif response.status_code == 401:
+            raise AuthenticationException()
+        raise ConanException("Error %d downloading file %s" % (response.status_code, url))
+
+
+class _ChunksReader(object):
+    """ Minimal read-only file-like object over an iterator of bytes chunks
+    """
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._current = b""
+        self._pos = 0
+
+    def read(self, size=-1):
+        parts = []
+        while size != 0:
+            if self._pos >= len(self._current):
+                self._current = next(self._chunks, b"")
+                self._pos = 0
+                if not self._current:
+                    break
+            if size < 0:
+                part = self._current[self._pos:]
+            else:
+                part = self._current[self._pos:self._pos + size]
+                size -= len(part)
+            self._pos += len(part)
+            parts.append(part)
+        return b"".join(parts)
+
+
+class _RetriedDownloadError(ConanConnectionError):
+    """ The download failed after retrying its parts, it shouldn't be retried again
+    """
+
 
 def _call_with_retry(out, retry, retry_wait, method, *args, **kwargs):
     for counter in range(retry + 1):
         try:
             return method(*args, **kwargs)
         except (NotFoundException, ForbiddenException, AuthenticationException,
-                RequestErrorException):
+                RequestErrorException, _RetriedDownloadError):
             raise
         except ConanException as exc:
             if counter == retry:
@@ -1,5 +1,6 @@
 from collections import OrderedDict
 
+from conans.errors import ConanException
 from conans.model.ref import PackageReference
 
 RECIPE_DOWNLOADED = "Downloaded"
@@ -247,6 +248,42 @@ class Edge(object):
         return hash((self.src, self.dst))
 
 
+def topological_levels(nodes, dependencies):
+    """ Orders the 'nodes' by levels, every node in the level following the one of its last
+    dependency, being 'dependencies(node)' the dependencies of a node. The dependencies that are
+    not in 'nodes' are ignored. Every level is sorted.
+
+    It is linear in the number of nodes and dependencies (Kahn algorithm): the dependencies of
+    every node still not in a level are counted, and decremented when each level is computed
+    return [[node1, node34], [node3], [node23, node8],...]
+    """
+    pending = {}  # {node: number of dependencies without level}
+    dependants = {node: [] for node in nodes}
+    for node in dependants:
+        node_dependencies = set(dep for dep in dependencies(node) if dep in dependants)
+        pending[node] = len(node_dependencies)
+        for dep in node_dependencies:
+            dependants[dep].append(node)
+
+    result = []
+    current_level = [node for node, count in pending.items() if count == 0]
+    while current_level:
+        current_level.sort()
+        result.append(current_level)
+        next_level = []
+        for node in current_level:
+            for dependant in dependants[node]:
+                pending[dependant] -= 1
+                if pending[dependant] == 0:
+                    next_level.append(dependant)
+        current_level = next_level
+
+    if sum(len(level) for level in result) != len(pending):
+        cycle = sorted(str(node) for node, count in pending.items() if count)
+        raise ConanException("There is a cycle in the graph between: %s" % ", ".join(cycle))
+    return result
+
+
 class DepsGraph(object):
     def __init__(self, initial_node_id=None):
         self.nodes = set()
@@ -357,21 +394,10 @@ class DepsGraph(object):
         first level nodes, and so on
         return [[node1, node34], [node3], [node23, node8],...]
         """
-        result = []
-        opened = nodes_subset if nodes_subset is not None else self.nodes
-        while opened:
-            current_level = []
-            for o in opened:
-                o_neighs = o.neighbors() if direct else o.inverse_neighbors()
-                if not any(n in opened for n in o_neighs):
-                    current_level.append(o)
-
-            current_level.sort()
-            result.append(current_level)
-            # now initialize new level
-            opened = opened.difference(current_level)
-
-        return result
+        nodes = nodes_subset if nodes_subset is not None else self.nodes
+        if direct:
+            return topological_levels(nodes, lambda n: n.neighbors())
+        return topological_levels(nodes, lambda n: n.inverse_neighbors())
 
     def mark_private_skippable(self, nodes_subset=None, root=None):
         """ check which nodes are reachable from the root, mark the non reachable as BINARY_SKIP.
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.compatibility import BinaryCompatibility
 from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLOAD, BINARY_MISSING,
@@ -5,11 +7,48 @@ from conans.client.graph.graph import (BINARY_BUILD, BINARY_CACHE, BINARY_DOWNLO
                                        RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_SKIP, BINARY_UNKNOWN,
                                        BINARY_INVALID)
 from conans.errors import NoRemoteAvailable, NotFoundException, conanfile_exception_formatter, \
-    ConanException, ConanInvalidConfiguration
+    ConanException, ConanInvalidConfiguration, PackageNotFoundException
+from conans.model.conan_file import ConanFile
+from conans.model.env_info import EnvValues
 from conans.model.info import ConanInfo, PACKAGE_ID_UNKNOWN, PACKAGE_ID_INVALID
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
 from conans.util.conan_v2_mode import conan_v2_property
+from conans.util.log import logger
+
+
+def _package_id_memoizable(conanfile):
+    """ The package_id of a recipe only depends on its settings, options and requirements, and
+    can be reused for other node with the same ones, if the recipe doesn't define methods that
+    could change it or its compatible packages
+    """
+    return (type(conanfile).package_id is ConanFile.package_id and
+            not hasattr(conanfile, "validate") and not hasattr(conanfile, "validate_build") and
+            not conanfile.compatible_packages)
+
+
+class _ComputedPackageID(object):
+    """ The package_id computed for a node, and the information to reuse it for other nodes with
+    the same package_id inputs, as ConanInfo.create() would do
+    """
+    def __init__(self, node):
+        conanfile = node.conanfile
+        self._info = conanfile.info.clone()
+        self._original_info = conanfile.original_info.clone()
+        self._compatible_packages = [c.clone() for c in conanfile.compatible_packages]
+        self._package_id = node.package_id
+
+    def apply(self, node):
+        conanfile = node.conanfile
+        info = self._info.clone()
+        info.full_settings = conanfile.settings.values
+        info.full_options = conanfile.options.values
+        info.recipe_hash = None
+        info.env_values = EnvValues()
+        conanfile.info = info
+        conanfile.original_info = self._original_info.clone()
+        conanfile.compatible_packages.extend(c.clone() for c in self._compatible_packages)
+        node.package_id = self._package_id
 
 
 class GraphBinariesAnalyzer(object):
@@ -20,7 +59,11 @@ class GraphBinariesAnalyzer(object):
         self._remote_manager = remote_manager
         # These are the nodes with pref (not including PREV) that have been evaluated
         self._evaluated = {}  # {pref: [nodes]}
+        # Packages info requested in advance to the remotes, in batches
+        self._remotes_infos = {}  # {(remote_name, pref): (info, pref with revisions) or None}
         self._fixed_package_id = cache.config.full_transitive_package_id
+        # The package_ids computed for the recipes without package_id() or validate() methods
+        self._package_ids = {}  # {package_id inputs: _ComputedPackageID}
         self._compatibility = BinaryCompatibility(self._cache)
 
     @staticmethod
@@ -104,7 +147,79 @@ class GraphBinariesAnalyzer(object):
             assert node.prev, "PREV for %s is None: %s" % (str(pref), metadata.dumps())
 
     def _get_package_info(self, node, pref, remote):
-        return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        try:
+            remote_info = self._remotes_infos[(remote.name, pref)]
+        except KeyError:
+            return self._remote_manager.get_package_info(pref, remote, info=node.conanfile.info)
+        if remote_info is None:
+            raise PackageNotFoundException(pref, remote=remote)
+        return remote_info
+
+    def _prefetch_packages_info(self, nodes, build_mode, remotes):
+        """ Gets the info of the binaries of a level of the graph, including their compatible
+        packages, that are not in the cache, with one request per remote (or concurrent ones if
+        the remote doesn't support it) instead of one sequential request per binary. The
+        evaluation of the nodes uses these results, falling back to regular requests
+        """
+        if build_mode.all or not remotes:
+            return
+        revisions_enabled = self._cache.config.revisions_enabled
+        pending = []  # [(pref, info, [remotes to check in order])]
+        for node in nodes:
+            conanfile = node.conanfile
+            if conanfile.build_policy_always:
+                continue
+            locked = node.graph_lock_node
+            if locked and locked.package_id and locked.package_id != PACKAGE_ID_UNKNOWN:
+                prefs = [PackageReference(locked.ref, locked.package_id, locked.prev)]
+            else:
+                prefs = [PackageReference(node.ref, node.package_id)]
+                prefs.extend(PackageReference(node.ref, c.package_id())
+                             for c in conanfile.compatible_packages)
+            package_layout = self._cache.package_layout(node.ref,
+                                                        short_paths=conanfile.short_paths)
+            metadata = None
+            for pref in prefs:
+                if (pref.id == PACKAGE_ID_INVALID or pref in self._evaluated or
+                        package_layout.package_id_exists(pref.id)):
+                    continue
+                remote = remotes.selected
+                if remote:
+                    pref_remotes = [remote]
+                else:
+                    metadata = metadata or package_layout.load_metadata()
+                    if pref.id in metadata.packages:
+                        remote_name = metadata.packages[pref.id].remote or metadata.recipe.remote
+                    else:
+                        remote_name = metadata.recipe.remote
+                    remote = remotes.get(remote_name)
+                    pref_remotes = [remote] if remote else []
+                    if not remote or revisions_enabled:
+                        pref_remotes.extend(r for r in remotes.values() if r != remote)
+                pending.append((pref, conanfile.info, pref_remotes))
+
+        if len(pending) < 2:  # Nothing to gain
+            return
+        while pending:
+            # Every binary is checked in its next remote only if not found in the previous one
+            by_remote = OrderedDict()
+            for pref, info, pref_remotes in pending:
+                if pref_remotes:
+                    by_remote.setdefault(pref_remotes[0], []).append((pref, info, pref_remotes))
+            pending = []
+            for remote, remote_pending in by_remote.items():
+                prefs_infos = [(pref, info) for pref, info, _ in remote_pending]
+                try:
+                    infos = self._remote_manager.get_packages_info(prefs_infos, remote)
+                except ConanException as e:
+                    logger.debug("GRAPH: Error getting packages info from '%s': %s"
+                                 % (remote.name, str(e)))
+                    continue
+                for pref, info, pref_remotes in remote_pending:
+                    if pref in infos:
+                        self._remotes_infos[(remote.name, pref)] = infos[pref]
+                        if infos[pref] is None:
+                            pending.append((pref, info, pref_remotes[1:]))
 
     def _evaluate_remote_pkg(self, node, pref, remote, remotes, remote_selected):
         remote_info = None
@@ -385,6 +500,19 @@ class GraphBinariesAnalyzer(object):
                 python_requires = None  # Legacy python-requires do not change package-ID
             else:
                 python_requires = python_requires.all_refs()
+        msvc_incompatible = self._cache.new_config["core.package_id:msvc_visual_incompatible"]
+        key = None
+        if _package_id_memoizable(conanfile):
+            key = (conanfile.settings.values.dumps(), conanfile.options.values.dumps(),
+                   tuple(sorted(repr(p) for p in direct_reqs)),
+                   tuple(sorted(repr(p) for p in indirect_reqs)), default_package_id_mode,
+                   tuple(repr(r) for r in python_requires or []),
+                   default_python_requires_id_mode, bool(msvc_incompatible))
+            computed = self._package_ids.get(key)
+            if computed is not None:
+                computed.apply(node)
+                return
+
         conanfile.info = ConanInfo.create(conanfile.settings.values,
                                           conanfile.options.values,
                                           direct_reqs,
@@ -394,7 +522,7 @@ class GraphBinariesAnalyzer(object):
                                           default_python_requires_id_mode=
                                           default_python_requires_id_mode)
         conanfile.original_info = conanfile.info.clone()
-        if not self._cache.new_config["core.package_id:msvc_visual_incompatible"]:
+        if not msvc_incompatible:
             msvc_compatible = conanfile.info.msvc_compatible()
             if msvc_compatible:
                 conanfile.compatible_packages.append(msvc_compatible)
@@ -428,11 +556,27 @@ class GraphBinariesAnalyzer(object):
 
         info = conanfile.info
         node.package_id = info.package_id()
+        if key is not None:
+            self._package_ids[key] = _ComputedPackageID(node)
 
     def evaluate_graph(self, deps_graph, build_mode, update, remotes, nodes_subset=None, root=None):
         default_package_id_mode = self._cache.config.default_package_id_mode
         default_python_requires_id_mode = self._cache.config.default_python_requires_id_mode
-        for node in deps_graph.ordered_iterate(nodes_subset=nodes_subset):
+        try:
+            for level in deps_graph.by_levels(nodes_subset):
+                self._evaluate_level(level, build_mode, update, remotes, default_package_id_mode,
+                                     default_python_requires_id_mode)
+        finally:
+            self._remotes_infos = {}  # Might be outdated in later evaluations
+        deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
+
+    def _evaluate_level(self, level, build_mode, update, remotes, default_package_id_mode,
+                        default_python_requires_id_mode):
+        """ The package_ids of all the nodes of the level are computed first, so their binaries
+        can be requested in advance together
+        """
+        nodes = []
+        for node in level:
             self._propagate_options(node)
 
             # Make sure that locked options match
@@ -457,8 +601,11 @@ class GraphBinariesAnalyzer(object):
                 # annotate pattern, so unused patterns in --build are not displayed as errors
                 build_mode.forced(node.conanfile, node.ref)
                 continue
+            nodes.append(node)
+
+        self._prefetch_packages_info(nodes, build_mode, remotes)
+        for node in nodes:
             self._evaluate_node(node, build_mode, update, remotes)
-        deps_graph.mark_private_skippable(nodes_subset=nodes_subset, root=root)
 
     def reevaluate_node(self, node, remotes, build_mode, update):
         """ reevaluate the node is necessary when there is some PACKAGE_ID_UNKNOWN due to
@@ -4,7 +4,7 @@ from conans.client.conanfile.configure import run_configure_method
 from conans.client.graph.graph import DepsGraph, Node, RECIPE_EDITABLE, CONTEXT_HOST, CONTEXT_BUILD
 from conans.errors import (ConanException, ConanExceptionInUserConanfileMethod,
                            conanfile_exception_formatter, ConanInvalidConfiguration)
-from conans.model.conan_file import get_env_context_manager
+from conans.model.conan_file import get_env_context_manager, create_requirements
 from conans.model.ref import ConanFileReference
 from conans.model.requires import Requirements, Requirement
 from conans.util.log import logger
@@ -63,8 +63,11 @@ class DepsGraphBuilder(object):
 
         # enter recursive computation
         t1 = time.time()
-        self._expand_node(root_node, dep_graph, Requirements(), None, None, check_updates,
-                          update, remotes, profile_host, profile_build, graph_lock)
+        try:
+            self._expand_node(root_node, dep_graph, Requirements(), None, None, check_updates,
+                              update, remotes, profile_host, profile_build, graph_lock)
+        finally:
+            self._proxy.discard_prefetched()
 
         logger.debug("GRAPH: Time to load deps %s" % (time.time() - t1))
 
@@ -104,13 +107,17 @@ class DepsGraphBuilder(object):
             self._resolve_alias(node, require, graph, update, update, remotes)
         self._resolve_ranges(graph, build_requires, scope, update, remotes)
 
-        for br in build_requires:
-            context_switch = bool(br.build_require_context == CONTEXT_BUILD)
-            populate_settings_target = context_switch  # Avoid 'settings_target' for BR-host
-            self._expand_require(br, node, graph, check_updates, update,
-                                 remotes, profile_host, profile_build, new_reqs, new_options,
-                                 graph_lock, context_switch=context_switch,
-                                 populate_settings_target=populate_settings_target)
+        try:
+            self._prefetch_recipes(node, build_requires, remotes)
+            for br in build_requires:
+                context_switch = bool(br.build_require_context == CONTEXT_BUILD)
+                populate_settings_target = context_switch  # Avoid 'settings_target' for BR-host
+                self._expand_require(br, node, graph, check_updates, update,
+                                     remotes, profile_host, profile_build, new_reqs, new_options,
+                                     graph_lock, context_switch=context_switch,
+                                     populate_settings_target=populate_settings_target)
+        finally:
+            self._proxy.discard_prefetched()
 
         new_nodes = set(n for n in graph.nodes if n.package_id is None)
         # This is to make sure that build_requires have precedence over the normal requires
@@ -130,6 +137,7 @@ class DepsGraphBuilder(object):
         new_options, new_reqs = self._get_node_requirements(node, graph, down_ref, down_options,
                                                             down_reqs, graph_lock, update, remotes)
 
+        self._prefetch_recipes(node, node.conanfile.requires.values(), remotes)
         # Expand each one of the current requirements
         for require in node.conanfile.requires.values():
             if require.override:
@@ -138,6 +146,39 @@ class DepsGraphBuilder(object):
                                  profile_build, new_reqs, new_options, graph_lock,
                                  context_switch=False)
 
+    def _prefetch_recipes(self, node, requires, remotes):
+        """ Downloads together the missing recipes of the new nodes that the requirements of
+        'node' will create, before expanding them one by one. As the expansion is depth-first,
+        the static 'requires' of the downloaded recipes are prefetched too, level by level, so
+        the recipes of a deep graph are not downloaded one at a time either
+        """
+        refs = []
+        for require in requires:
+            if require.override or str(require.ref.version).startswith("<host_version"):
+                continue
+            build_context = require.build_require and \
+                require.build_require_context == CONTEXT_BUILD
+            context = CONTEXT_BUILD if build_context else node.context
+            if node.public_deps.get(require.ref.name, context=context) is None:
+                refs.append(require.ref)
+        while refs:
+            prefetched = self._proxy.prefetch_recipes(refs, remotes)
+            refs = []
+            for ref, conanfile_path in prefetched:
+                refs.extend(self._static_requires(ref, conanfile_path))
+
+    def _static_requires(self, ref, conanfile_path):
+        """ The references in the 'requires' attribute of the recipe, without evaluating any of
+        its methods. Version ranges and overrides are skipped, they are resolved on expansion
+        """
+        try:
+            conanfile = self._loader.load_basic(conanfile_path, user=ref.user, channel=ref.channel)
+            requires = create_requirements(conanfile)
+        except Exception as e:
+            logger.debug("GRAPH: Cannot read the requirements of %s: %s" % (str(ref), str(e)))
+            return []
+        return [r.ref for r in requires.values() if not r.override and not r.version_range]
+
     def _resolve_ranges(self, graph, requires, consumer, update, remotes):
         for require in requires:
             if require.locked_id:  # if it is locked, nothing to resolved
@@ -1,21 +1,25 @@
 import fnmatch
+import json
 import os
 from collections import OrderedDict, defaultdict
 
+from conans import __version__ as client_version
 from conans.client.conanfile.configure import run_configure_method
 from conans.client.generators.text import TXTGenerator
 from conans.client.graph.build_mode import BuildMode
 from conans.client.graph.graph import BINARY_BUILD, Node, CONTEXT_HOST, CONTEXT_BUILD
 from conans.client.graph.graph_binaries import RECIPE_CONSUMER, RECIPE_VIRTUAL, BINARY_EDITABLE, \
-    BINARY_UNKNOWN
+    BINARY_UNKNOWN, RECIPE_EDITABLE
 from conans.client.graph.graph_builder import DepsGraphBuilder
 from conans.errors import ConanException, conanfile_exception_formatter
 from conans.model.conan_file import get_env_context_manager
 from conans.model.graph_info import GraphInfo
 from conans.model.graph_lock import GraphLock, GraphLockFile
-from conans.model.ref import ConanFileReference
-from conans.paths import BUILD_INFO
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import BUILD_INFO, DATA_YML
 from conans.util.files import load
+from conans.util.log import logger
+from conans.util.sha import sha1
 
 
 class _RecipeBuildRequires(OrderedDict):
@@ -121,15 +125,40 @@ class GraphManager(object):
         profile_host, profile_build = graph_info.profile_host, graph_info.profile_build
         graph_lock, root_ref = graph_info.graph_lock, graph_info.root
 
-        root_node = self._load_root_node(reference, create_reference, profile_host, graph_lock,
-                                         root_ref, lockfile_node_id, is_build_require,
-                                         require_overrides)
-
-        deps_graph = self._resolve_graph(root_node, profile_host, profile_build, graph_lock,
-                                         build_mode, check_updates, update, remotes, recorder,
-                                         apply_build_requires=apply_build_requires)
-        # Run some validations once the graph is built
-        self._validate_graph_provides(deps_graph)
+        def _load(lock):
+            root = self._load_root_node(reference, create_reference, profile_host, lock,
+                                        root_ref, lockfile_node_id, is_build_require,
+                                        require_overrides)
+            graph = self._resolve_graph(root, profile_host, profile_build, lock, build_mode,
+                                        check_updates, update, remotes, recorder,
+                                        apply_build_requires=apply_build_requires)
+            # Run some validations once the graph is built
+            self._validate_graph_provides(graph)
+            return root, graph
+
+        graph_snapshots = self._cache.graph_snapshots
+        snapshot_key = None
+        if (graph_snapshots is not None and graph_lock is None and create_reference is None and
+                not check_updates and not update and lockfile_node_id is None and
+                not is_build_require and not isinstance(reference, list) and
+                (build_mode is None or build_mode in (["missing"], ["never"]))):
+            snapshot_key = self._graph_snapshot_key(reference, graph_info, build_mode, remotes,
+                                                    apply_build_requires, require_overrides)
+
+        deps_graph = None
+        snapshot_lock = self._load_graph_snapshot(snapshot_key) if snapshot_key else None
+        if snapshot_lock is not None:
+            try:
+                root_node, deps_graph = _load(snapshot_lock)
+            except ConanException as e:  # The graph changed in ways the inputs don't capture
+                logger.debug("GRAPH SNAPSHOTS: Cannot use the snapshot '%s': %s"
+                             % (snapshot_key, str(e)))
+                graph_snapshots.remove(snapshot_key)
+                deps_graph = None
+        if deps_graph is None:
+            root_node, deps_graph = _load(graph_lock)
+            if snapshot_key:
+                self._save_graph_snapshot(snapshot_key, deps_graph)
 
         # THIS IS NECESSARY to store dependencies options in profile, for consumer
         # FIXME: This is a hack. Might dissapear if graph for local commands is always recomputed
@@ -142,6 +171,105 @@ class GraphManager(object):
 
         return deps_graph
 
+    def _graph_snapshot_key(self, reference, graph_info, build_mode, remotes,
+                            apply_build_requires, require_overrides):
+        """ hash of all the inputs of the graph computation, except the contents of the cache,
+        that are checked when the snapshot is loaded
+        """
+        if isinstance(reference, ConanFileReference):
+            consumer = [repr(reference)]
+        else:
+            consumer = [reference, load(reference)]
+            conandata = os.path.join(os.path.dirname(reference), DATA_YML)
+            if os.path.exists(conandata):
+                consumer.append(load(conandata))
+        root = graph_info.root
+        profile_build = graph_info.profile_build
+        config_files = [self._cache.conan_conf_path, self._cache.new_config_path,
+                        self._cache.settings_path]
+        inputs = {"version": client_version,
+                  "consumer": consumer,
+                  "root": [root.name, root.version, root.user, root.channel] if root else None,
+                  "profile_host": graph_info.profile_host.dumps(),
+                  "profile_build": profile_build.dumps() if profile_build else None,
+                  "build_mode": build_mode,
+                  "apply_build_requires": apply_build_requires,
+                  "require_overrides": [str(r) for r in require_overrides or []],
+                  "remotes": [[r.name, r.url] for r in remotes.values()] if remotes else None,
+                  "selected_remote": remotes.selected.name if remotes and remotes.selected
+                  else None,
+                  "config": [load(f) if os.path.exists(f) else None for f in config_files],
+                  "environment": sorted((k, v) for k, v in os.environ.items()
+                                        if k.startswith("CONAN_"))}
+        return sha1(json.dumps(inputs, sort_keys=True).encode())
+
+    def _load_graph_snapshot(self, snapshot_key):
+        """ the GraphLock to resolve the graph stored with 'snapshot_key' again, if all its recipe
+        and package revisions are still the ones in the cache, otherwise None
+        """
+        entry = self._cache.graph_snapshots.get(snapshot_key)
+        if entry is None:
+            return None
+        data, recipes = entry
+        def recipe_layout(ref):
+            """ the layout of the locked recipe revision, None if it is not the one in the cache
+            """
+            if self._cache.installed_as_editable(ref):
+                return None
+            layout = self._cache.package_layout(ref.copy_clear_rev())
+            return layout if layout.recipe_revision() == ref.revision else None
+
+        try:
+            snapshot = GraphLock.deserialize(data, revisions_enabled=True)
+            for node in snapshot.nodes.values():
+                for ref in node.python_requires or []:
+                    if recipe_layout(ref) is None:
+                        return None
+                if node.ref and not node.path:  # The consumer is not in the cache
+                    layout = recipe_layout(node.ref)
+                    if layout is None:
+                        return None
+                    pref = PackageReference(layout.ref, node.package_id)
+                    if (not os.path.isdir(layout.package(pref)) or
+                            layout.package_revision(pref) != node.prev):
+                        return None
+            # Version ranges could resolve other references
+            if self._cached_recipes(snapshot) != recipes:
+                return None
+        except (ConanException, KeyError):
+            return None
+        # The revisions are only locked in the graph if they are enabled in the client
+        revisions_enabled = self._cache.config.revisions_enabled
+        data["revisions_enabled"] = revisions_enabled
+        return GraphLock.deserialize(data, revisions_enabled)
+
+    def _save_graph_snapshot(self, snapshot_key, deps_graph):
+        """ stores the resolved graph, only if all its binaries are known (not built, editable or
+        missing), so restoring it doesn't need to compute them again. The aliases are not locked,
+        the graphs using them are not stored
+        """
+        if deps_graph.aliased or deps_graph.new_aliased:
+            return
+        for node in deps_graph.nodes:
+            if node.recipe in (RECIPE_CONSUMER, RECIPE_VIRTUAL):
+                continue
+            if node.recipe == RECIPE_EDITABLE or not node.prev or not node.ref.revision:
+                return
+        graph_lock = GraphLock(deps_graph, revisions_enabled=True)
+        self._cache.graph_snapshots.save(snapshot_key, graph_lock.serialize(),
+                                         self._cached_recipes(graph_lock))
+
+    def _cached_recipes(self, graph_lock):
+        """ the references in the cache of the recipes and python_requires of the graph, including
+        other versions
+        """
+        names = set()
+        for node in graph_lock.nodes.values():
+            if node.ref and not node.path:
+                names.add(node.ref.name)
+            names.update(ref.name for ref in node.python_requires or [])
+        return sorted(repr(ref) for ref in self._cache.all_refs() if ref.name in names)
+
     def _load_root_node(self, reference, create_reference, profile_host, graph_lock, root_ref,
                         lockfile_node_id, is_build_require, require_overrides):
         """ creates the first, root node of the graph, loading or creating a conanfile
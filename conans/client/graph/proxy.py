@@ -1,15 +1,19 @@
 import os
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import RequestException
+from six import StringIO
 
 from conans.client.graph.graph import (RECIPE_DOWNLOADED, RECIPE_INCACHE, RECIPE_NEWER,
                                        RECIPE_NOT_IN_REMOTE, RECIPE_NO_REMOTE, RECIPE_UPDATEABLE,
                                        RECIPE_UPDATED, RECIPE_EDITABLE)
-from conans.client.output import ScopedOutput
-from conans.client.recorder.action_recorder import INSTALL_ERROR_MISSING, INSTALL_ERROR_NETWORK
+from conans.client.output import ConanOutput, ScopedOutput
+from conans.client.recorder.action_recorder import INSTALL_ERROR_MISSING, \
+    INSTALL_ERROR_NETWORK, ActionRecorder
 from conans.client.remover import DiskRemover
 from conans.errors import ConanException, NotFoundException, RecipeNotFoundException
 from conans.paths.package_layouts.package_editable_layout import PackageEditableLayout
+from conans.util.log import logger
 from conans.util.tracer import log_recipe_got_from_local_cache
 
 
@@ -23,6 +27,59 @@ class ConanProxy(object):
         self._cache = cache
         self._out = output
         self._remote_manager = remote_manager
+        # Recipes already downloaded by prefetch_recipes(), {ref: (remote, new_ref, output)}
+        self._prefetched = {}
+
+    def prefetch_recipes(self, refs, remotes):
+        """ Downloads concurrently, with the parallel_download threads, the recipes of 'refs' that
+        are not in the cache, so get_recipe() doesn't need to download them one by one. Errors
+        are ignored, get_recipe() will try again and report them. Returns the list of
+        (ref, conanfile_path) of the recipes downloaded
+        """
+        parallel = self._cache.config.parallel_download
+        if parallel is None:
+            return []
+        missing = []
+        for ref in refs:
+            if ref in self._prefetched:
+                continue
+            layout = self._cache.package_layout(ref)
+            if isinstance(layout, PackageEditableLayout) or os.path.exists(layout.conanfile()):
+                continue
+            missing.append((ref, layout))
+        if not missing:
+            return []
+
+        def _prefetch(ref_layout):
+            ref, layout = ref_layout
+            # The messages are kept, to be output in order when the recipe is used
+            stream = StringIO()
+            output = ScopedOutput(str(ref), ConanOutput(stream, color=self._out._color))
+            try:
+                with layout.conanfile_write_lock(self._out):
+                    if os.path.exists(layout.conanfile()):
+                        return None
+                    remote, new_ref = self._download_recipe(layout, ref, output, remotes,
+                                                            remotes.selected, ActionRecorder())
+            except Exception as e:
+                logger.debug("PROXY: Error prefetching recipe %s: %s" % (str(ref), str(e)))
+                return None
+            self._prefetched[ref] = remote, new_ref, stream.getvalue()
+            return ref, layout.conanfile()
+
+        pool = ThreadPool(min(parallel, len(missing)))
+        try:
+            downloaded = pool.map(_prefetch, missing)
+        finally:
+            pool.close()
+            pool.join()
+        return [d for d in downloaded if d is not None]
+
+    def discard_prefetched(self):
+        """ The prefetched recipes that were not used, like when the requirement was finally
+        overridden, are already in the cache, and would be reported as downloaded later
+        """
+        self._prefetched.clear()
 
     def get_recipe(self, ref, check_updates, update, remotes, recorder):
         layout = self._cache.package_layout(ref)
@@ -48,6 +105,13 @@ class ConanProxy(object):
         # check if it is in disk
         conanfile_path = layout.conanfile()
 
+        prefetched = self._prefetched.pop(ref, None)
+        if prefetched is not None and os.path.exists(conanfile_path):
+            remote, new_ref, prefetch_output = prefetched
+            self._out.write(prefetch_output)
+            recorder.recipe_downloaded(ref, remote.url)
+            return conanfile_path, RECIPE_DOWNLOADED, remote, new_ref
+
         # NOT in disk, must be retrieved from remotes
         if not os.path.exists(conanfile_path):
             remote, new_ref = self._download_recipe(layout, ref, output, remotes, remotes.selected,
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 from conans.errors import ConanException
 from conans.model.ref import ConanFileReference
@@ -51,34 +52,72 @@ def _parse_versionexpr(versionexpr, result):
     return version_range, loose, include_prerelease
 
 
-def satisfying(list_versions, versionexpr, result):
-    """ returns the maximum version that satisfies the expression
-    if some version cannot be converted to loose SemVer, it is discarded with a msg
-    This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
+@lru_cache(maxsize=1024)
+def _compile_range(versionexpr):
+    """ returns the (Range, loose, include_prerelease, warnings) of a version range expression,
+    parsed only once per expression
     """
-    from semver import SemVer, Range, max_satisfying
-    version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, result)
-
-    # Check version range expression
+    from semver import Range
+    warnings = []
+    version_range, loose, include_prerelease = _parse_versionexpr(versionexpr, warnings)
     try:
         act_range = Range(version_range, loose)
     except ValueError:
         raise ConanException("version range expression '%s' is not valid" % version_range)
+    return act_range, loose, include_prerelease, tuple(warnings)
+
 
-    # Validate all versions
-    candidates = {}
-    for v in list_versions:
+def _semver_key(ver):
+    """ sort key equivalent to SemVer.compare(): numeric identifiers are lower than alphanumeric
+    ones, and a version without prerelease is greater than with it
+    """
+    if ver.prerelease:
+        prerelease = (0, tuple((0, i) if isinstance(i, int) else (1, str(i))
+                               for i in ver.prerelease))
+    else:
+        prerelease = (1, )
+    return ver.major, ver.minor, ver.patch, prerelease
+
+
+@lru_cache(maxsize=256)
+def _sorted_candidates(versions, loose):
+    """ parses the versions only once for every list of versions, returns the (SemVer, version)
+    from the highest to the lowest, and the versions that are not semver
+    """
+    from semver import SemVer
+    candidates = []
+    invalid = []
+    for index, v in enumerate(versions):
         try:
             ver = SemVer(v, loose=loose)
-            candidates[ver] = v
         except (ValueError, AttributeError):
-            result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
-                          % str(v))
+            invalid.append(v)
+        else:
+            # Equal versions keep the input order, the first one is selected
+            candidates.append((_semver_key(ver), -index, ver, v))
+    candidates.sort(key=lambda c: c[:2], reverse=True)
+    return tuple((ver, v) for _, _, ver, v in candidates), tuple(invalid)
+
 
-    # Search best matching version in range
-    result = max_satisfying(candidates, act_range, loose=loose,
-                            include_prerelease=include_prerelease)
-    return candidates.get(result)
+def satisfying(list_versions, versionexpr, result):
+    """ returns the maximum version that satisfies the expression
+    if some version cannot be converted to loose SemVer, it is discarded with a msg
+    This provides some workaround for failing comparisons like "2.1" not matching "<=2.1"
+    """
+    act_range, loose, include_prerelease, warnings = _compile_range(versionexpr)
+    for warning in warnings:
+        result.append(warning)
+    candidates, invalid = _sorted_candidates(tuple(list_versions), loose)
+    for v in invalid:
+        result.append("WARN: Version '%s' is not semver, cannot be compared with a range"
+                      % str(v))
+
+    # The first one from the highest is the best matching version. Not a binary search, as
+    # ranges can be disjoint (||) and the prereleases are only matched in some cases
+    for ver, v in candidates:
+        if act_range.test(ver, include_prerelease=include_prerelease):
+            return v
+    return None
 
 
 class RangeResolver(object):
@@ -119,7 +158,8 @@ class RangeResolver(object):
         search_ref = ConanFileReference(ref.name, "*", ref.user, ref.channel)
 
         if update:
-            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+            resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes,
+                                                             update)
             if not resolved_ref:
                 remote_name = None
                 resolved_ref = self._resolve_local(search_ref, version_range)
@@ -127,7 +167,8 @@ class RangeResolver(object):
             remote_name = None
             resolved_ref = self._resolve_local(search_ref, version_range)
             if not resolved_ref:
-                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range, remotes)
+                resolved_ref, remote_name = self._resolve_remote(search_ref, version_range,
+                                                                 remotes, update)
 
         origin = ("remote '%s'" % remote_name) if remote_name else "local cache"
         if resolved_ref:
@@ -147,23 +188,51 @@ class RangeResolver(object):
         if local_found:
             return self._resolve_version(version_range, local_found)
 
-    def _search_remotes(self, search_ref, remotes):
+    def _search_remote(self, remote, pattern, update):
+        """ The results of previous searches are reused from the persistent remote search cache,
+        if enabled, while not expired. Expired ones, or all of them with --update, are revalidated
+        """
+        search_cache = self._cache.remote_search_cache
+        if search_cache is None:
+            return self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+
+        localdb = self._cache.localdb
+        cached_refs = etag = last_modified = None
+        cached = search_cache.get(remote, localdb.get_username(remote.url), pattern)
+        if cached is not None:
+            cached_refs, fresh, etag, last_modified = cached
+            if fresh and not update:
+                return cached_refs
+        result = self._remote_manager.search_recipes_revalidate(remote, pattern, False,
+                                                                etag, last_modified)
+        refs, etag, last_modified = result
+        if refs is None:  # Not modified
+            if cached_refs is None:
+                raise ConanException("Unexpected 'Not modified' response searching '%s' in "
+                                     "remote '%s'" % (pattern, remote.name))
+            refs = cached_refs
+        # The search might have authenticated the user
+        search_cache.save(remote, localdb.get_username(remote.url), pattern, refs, etag,
+                          last_modified)
+        return refs
+
+    def _search_remotes(self, search_ref, remotes, update):
         pattern = str(search_ref)
         for remote in remotes.values():
             if not remotes.selected or remote == remotes.selected:
-                result = self._remote_manager.search_recipes(remote, pattern, ignorecase=False)
+                result = self._search_remote(remote, pattern, update)
                 result = [ref for ref in result
                           if ref.user == search_ref.user and ref.channel == search_ref.channel]
                 if result:
                     return result, remote.name
         return None, None
 
-    def _resolve_remote(self, search_ref, version_range, remotes):
+    def _resolve_remote(self, search_ref, version_range, remotes, update):
         # We should use ignorecase=False, we want the exact case!
         found_refs, remote_name = self._cached_remote_found.get(search_ref, (None, None))
         if found_refs is None:
             # Searching for just the name is much faster in remotes like Artifactory
-            found_refs, remote_name = self._search_remotes(search_ref, remotes)
+            found_refs, remote_name = self._search_remotes(search_ref, remotes, update)
             if found_refs:
                 self._result.append("%s versions found in '%s' remote" % (search_ref, remote_name))
             else:
@@ -3,7 +3,7 @@ import sys
 import traceback
 import uuid
 from collections import defaultdict
-from threading import Lock
+from threading import Lock, RLock
 
 from conans.client.output import ScopedOutput
 from conans.client.tools.files import chdir
@@ -42,6 +42,7 @@ class HookManager(object):
         self.output = output
         self._attribute_checker_path = os.path.join(self._hooks_folder, "attribute_checker.py")
         self._mutex = Lock()
+        self._execute_mutex = RLock()
 
     def execute(self, method_name, **kwargs):
         # It is necessary to protect the lazy loading of hooks with a mutex, because it can be
@@ -57,12 +58,15 @@ class HookManager(object):
 
         assert method_name in valid_hook_methods, \
             "Method '{}' not in valid hooks methods".format(method_name)
-        for name, method in self.hooks[method_name]:
-            try:
-                output = ScopedOutput("[HOOK - %s] %s()" % (name, method_name), self.output)
-                method(output=output, **kwargs)
-            except Exception as e:
-                raise ConanException("[HOOK - %s] %s(): %s" % (name, method_name, str(e)))
+        # The hooks are not required to be thread-safe, and their output shouldn't interleave,
+        # so they are never run concurrently (e.g. parallel recipe downloads)
+        with self._execute_mutex:
+            for name, method in self.hooks[method_name]:
+                try:
+                    output = ScopedOutput("[HOOK - %s] %s()" % (name, method_name), self.output)
+                    method(output=output, **kwargs)
+                except Exception as e:
+                    raise ConanException("[HOOK - %s] %s(): %s" % (name, method_name, str(e)))
 
     def load_hooks(self):
         for name in self._hook_names:
@@ -1,7 +1,13 @@
+import functools
+import json
+import multiprocessing
 import os
+import platform
 import shutil
+import tempfile
 import textwrap
 import time
+from multiprocessing.connection import wait
 from multiprocessing.pool import ThreadPool
 
 from conans.client import tools
@@ -32,7 +38,8 @@ from conans.model.user_info import DepsUserInfo
 from conans.model.user_info import UserInfo
 from conans.paths import BUILD_INFO, CONANINFO, RUN_LOG_NAME
 from conans.util.env_reader import get_env
-from conans.util.files import clean_dirty, is_dirty, make_read_only, mkdir, rmdir, save, set_dirty
+from conans.util.files import clean_dirty, is_dirty, load, make_read_only, mkdir, rmdir, save, \
+    set_dirty
 from conans.util.log import logger
 from conans.util.tracer import log_package_built, log_package_got_from_local_cache
 
@@ -181,6 +188,10 @@ class _PackageBuilder(object):
 
         update_package_metadata(prev, package_layout, package_id, pref.ref.revision)
 
+        file_store = self._cache.file_store
+        if file_store:
+            file_store.add_folder(conanfile.folders.base_package)
+
         if get_env("CONAN_READ_ONLY_CACHE", False):
             make_read_only(conanfile.folders.base_package)
         # FIXME: Conan 2.0 Clear the registry entry (package ref)
@@ -242,6 +253,60 @@ class _PackageBuilder(object):
             return node.pref
 
 
+# The errors of the builds in the parallel jobs, to raise them with the same type
+_BUILD_JOB_ERRORS = {error.__name__: error
+                     for error in (ConanException, ConanExceptionInUserConanfileMethod,
+                                   ConanInvalidConfiguration)}
+
+
+class _BuildJob(object):
+    """ Runs 'build', a callable receiving the stream to write the output, in a child process.
+    All its output is buffered in a file, also the one written directly to the standard file
+    descriptors, like the output of the commands it runs
+    """
+    def __init__(self, node, build, context):
+        self.node = node
+        self.bare_pref = PackageReference(node.pref.ref, node.pref.id)
+        self._folder = tempfile.mkdtemp(prefix="conan_build_job")
+        self._output_path = os.path.join(self._folder, "output.log")
+        self._error_path = os.path.join(self._folder, "error.json")
+        self.process = context.Process(target=self._run, args=(build, ))
+        self.process.start()
+
+    def _run(self, build):
+        with open(self._output_path, "w") as stream:
+            os.dup2(stream.fileno(), 1)
+            os.dup2(stream.fileno(), 2)
+            try:
+                build(stream)
+            except Exception as exc:
+                save(self._error_path, json.dumps({"type": type(exc).__name__,
+                                                   "message": str(exc)}))
+
+    def finish(self, output):
+        """ Writes the buffered output of the finished build to 'output', and returns its error
+        if it failed
+        """
+        self.process.join()
+        try:
+            if os.path.exists(self._output_path):
+                output.write(load(self._output_path))
+            if os.path.exists(self._error_path):
+                error = json.loads(load(self._error_path))
+                return _BUILD_JOB_ERRORS.get(error["type"], ConanException)(error["message"])
+            if self.process.exitcode != 0:
+                return ConanException("The build of %s exited with code %s"
+                                      % (self.node.pref, self.process.exitcode))
+            return None
+        finally:
+            rmdir(self._folder)
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join()
+        rmdir(self._folder)
+
+
 def _remove_folder_raising(folder):
     try:
         rmdir(folder)
@@ -296,6 +361,7 @@ class BinaryInstaller(object):
         self._cache = app.cache
         self._out = app.out
         self._remote_manager = app.remote_manager
+        self._requester = app.requester
         self._recorder = recorder
         self._binaries_analyzer = app.binaries_analyzer
         self._hook_manager = app.hook_manager
@@ -437,37 +503,154 @@ class BinaryInstaller(object):
         processed_package_refs = {}
         self._download(downloads, processed_package_refs)
 
-        for level in nodes_by_level:
-            for node in level:
-                ref, conan_file = node.ref, node.conanfile
-                output = conan_file.output
-
-                self._propagate_info(node, using_build_profile)
-                if node.binary == BINARY_EDITABLE:
-                    self._handle_node_editable(node, profile_host, profile_build, graph_lock)
-                    # Need a temporary package revision for package_revision_mode
-                    # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                    node.prev = "editable"
-                else:
-                    if node.binary == BINARY_SKIP:  # Privates not necessary
-                        continue
-                    assert ref.revision is not None, "Installer should receive RREV always"
-                    if node.binary == BINARY_UNKNOWN:
-                        self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
-                        if node.binary == BINARY_MISSING:
-                            self._raise_missing([node])
-                    if node.binary == BINARY_EDITABLE:
-                        self._handle_node_editable(node, profile_host, profile_build, graph_lock)
-                        # Need a temporary package revision for package_revision_mode
-                        # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
-                        node.prev = "editable"
-                    else:
-                        _handle_system_requirements(conan_file, node.pref, self._cache, output)
+        def prepare(n):
+            return self._prepare_node(n, using_build_profile, profile_host, profile_build,
+                                      graph_lock, remotes, build_mode, update)
+
+        parallel = self._cache.config.parallel_builds
+        # The jobs are forked processes, only in Linux, as in macOS the system frameworks don't
+        # support fork
+        if parallel and parallel > 1 and platform.system() == "Linux":
+            nodes = [node for level in nodes_by_level for node in level]
+            self._build_parallel(nodes, parallel, prepare, keep_build, processed_package_refs,
+                                 remotes)
+        else:
+            for level in nodes_by_level:
+                for node in level:
+                    if prepare(node):
                         self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
 
         # Finally, propagate information to root node (ref=None)
         self._propagate_info(root_node, using_build_profile)
 
+    def _build_parallel(self, nodes, jobs, prepare, keep_build, processed_package_refs, remotes):
+        """ Handles every node as soon as all its dependencies have been handled, building the
+        packages of up to 'jobs' nodes at the same time, every build in a child process with its
+        output buffered and written when it finishes. The rest of the nodes are handled in this
+        process, as in the serial installation
+        """
+        pending = list(nodes)  # In levels order, so the lower levels are started first
+        done = set()
+        ready = []  # Nodes whose dependencies are done, waiting for a free job to build
+        running = []
+        failures = []
+        context = multiprocessing.get_context("fork")
+        try:
+            while pending or ready or running:
+                progress = True
+                while progress and not failures:
+                    progress = False
+                    for node in list(pending):
+                        if any(dep not in done for dep in node.neighbors()):
+                            continue
+                        pending.remove(node)
+                        progress = True
+                        if prepare(node):
+                            ready.append(node)
+                        else:
+                            done.add(node)
+                    for node in list(ready):
+                        bare_pref = PackageReference(node.pref.ref, node.pref.id)
+                        if node.binary == BINARY_BUILD and bare_pref not in processed_package_refs:
+                            # The same package could be already building for another node
+                            if (len(running) < jobs and
+                                    not any(job.bare_pref == bare_pref for job in running)):
+                                ready.remove(node)
+                                node.conanfile.output.info("Building package in a parallel job")
+                                build = functools.partial(self._build_package_job, node,
+                                                          keep_build, remotes)
+                                running.append(_BuildJob(node, build, context))
+                            continue
+                        ready.remove(node)
+                        self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+                        done.add(node)
+                        progress = True
+
+                if not running:
+                    assert failures or not (pending or ready), "Nodes that cannot be built"
+                    break
+                finished = wait([job.process.sentinel for job in running])
+                for job in [job for job in running if job.process.sentinel in finished]:
+                    running.remove(job)
+                    error = job.finish(self._out)
+                    node = job.node
+                    if error is None:
+                        self._build_job_done(node, processed_package_refs)
+                        self._handle_node_cache(node, keep_build, processed_package_refs, remotes)
+                        done.add(node)
+                    else:
+                        # The running builds are completed, but no new one is started
+                        self._recorder.package_install_error(node.pref, INSTALL_ERROR_BUILDING,
+                                                             str(error), remote_name=None)
+                        failures.append(error)
+        finally:
+            for job in running:  # Only if this process is interrupted
+                job.terminate()
+        if failures:
+            raise failures[0]
+
+    def _build_package_job(self, node, keep_build, remotes, stream):
+        """ Builds the package of the node in the child process of a parallel job, writing all
+        the output to 'stream'
+        """
+        # The connections of the parent are still used by it and by the other jobs
+        self._requester.reset_connections()
+        conanfile = node.conanfile
+        self._out.redirect(stream)
+        conanfile.output.redirect(stream)
+        pref = node.pref
+        layout = self._cache.package_layout(pref.ref, conanfile.short_paths)
+        with layout.package_lock(pref):
+            layout.package_remove(pref)
+            with layout.set_dirty_context_manager(pref):
+                self._build_package(node, conanfile.output, keep_build, remotes)
+
+    def _build_job_done(self, node, processed_package_refs):
+        """ Updates the node with the package built by a parallel job, as the build did in its
+        own process, so it is handled as any other already processed package
+        """
+        pref = node.pref
+        layout = self._cache.package_layout(pref.ref, node.conanfile.short_paths)
+        prev = layout.load_metadata().packages[pref.id].revision
+        assert prev, "PREV for %s to be built is None" % str(pref)
+        node.prev = prev
+        if node.graph_lock_node:
+            node.graph_lock_node.prev = prev
+        node.conanfile.info.recipe_hash = layout.recipe_manifest().summary_hash
+        self._recorder.package_built(node.pref)
+        processed_package_refs[PackageReference(pref.ref, pref.id)] = prev
+
+    def _prepare_node(self, node, using_build_profile, profile_host, profile_build, graph_lock,
+                      remotes, build_mode, update):
+        """ Propagates the information of the dependencies to the node and handles it if it is
+        editable. Returns True if its package has to be handled in the cache
+        """
+        ref, conan_file = node.ref, node.conanfile
+        output = conan_file.output
+
+        self._propagate_info(node, using_build_profile)
+        if node.binary == BINARY_EDITABLE:
+            self._handle_node_editable(node, profile_host, profile_build, graph_lock)
+            # Need a temporary package revision for package_revision_mode
+            # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+            node.prev = "editable"
+            return False
+        if node.binary == BINARY_SKIP:  # Privates not necessary
+            return False
+        assert ref.revision is not None, "Installer should receive RREV always"
+        if node.binary == BINARY_UNKNOWN:
+            self._binaries_analyzer.reevaluate_node(node, remotes, build_mode, update)
+            if node.binary == BINARY_MISSING:
+                self._raise_missing([node])
+        if node.binary == BINARY_EDITABLE:
+            self._handle_node_editable(node, profile_host, profile_build, graph_lock)
+            # Need a temporary package revision for package_revision_mode
+            # Cannot be PREV_UNKNOWN otherwise the consumers can't compute their packageID
+            node.prev = "editable"
+            return False
+        _handle_system_requirements(conan_file, node.pref, self._cache, output)
+        return True
+
     def _handle_node_editable(self, node, profile_host, profile_build, graph_lock):
         # Get source of information
         conanfile = node.conanfile
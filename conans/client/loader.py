@@ -5,6 +5,8 @@ import re
 import sys
 import types
 import uuid
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_file_location
 
 import yaml
 
@@ -13,6 +15,7 @@ from pathlib import Path
 from conan.tools.cmake import cmake_layout
 from conan.tools.google import bazel_layout
 from conan.tools.microsoft import vs_layout
+from conans.client.cache.bytecode_cache import RecipeBytecodeCache
 from conans.client.conf.required_version import validate_conan_version
 from conans.client.loader_txt import ConanFileTextLoader
 from conans.client.tools.files import chdir
@@ -27,6 +30,17 @@ from conans.paths import DATA_YML
 from conans.util.files import load
 
 
+# The compiled recipes, shared by all the loaders of the process
+_bytecode_cache = RecipeBytecodeCache()
+
+
+def set_bytecode_cache_folder(folder):
+    """ The folder to store the compiled recipes and reuse them in other processes, None to keep
+    them only in memory
+    """
+    _bytecode_cache.folder = folder
+
+
 class ConanFileLoader(object):
 
     def __init__(self, runner, output, python_requires, generator_manager=None, pyreq_loader=None,
@@ -425,6 +439,30 @@ def parse_conanfile(conanfile_path, python_requires, generator_manager):
             raise ConanException("%s: %s" % (conanfile_path, str(e)))
 
 
+class _RecipeLoader(SourceFileLoader):
+    """ Loader of the recipes modules, with the code compiled by the bytecode cache instead of the
+    __pycache__ folders
+    """
+    def get_code(self, fullname):
+        path = self.get_filename(fullname)
+        return _bytecode_cache.get_code(self.get_data(path), path)
+
+
+def _load_recipe_module(module_id, conan_file_path):
+    """ Same as the deprecated imp.load_source(), removed in Python 3.12
+    """
+    loader = _RecipeLoader(module_id, conan_file_path)
+    spec = spec_from_file_location(module_id, conan_file_path, loader=loader)
+    module = module_from_spec(spec)
+    sys.modules[module_id] = module
+    try:
+        loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_id, None)
+        raise
+    return module
+
+
 def _parse_conanfile(conan_file_path):
     """ From a given path, obtain the in memory python import module
     """
@@ -441,15 +479,7 @@ def _parse_conanfile(conan_file_path):
             old_dont_write_bytecode = sys.dont_write_bytecode
             try:
                 sys.dont_write_bytecode = True
-                # imp is deprecated in favour of importlib, removed in 3.12
-                if sys.version_info.major >= 3 and sys.version_info.minor >= 12:
-                    from importlib import util as imp_util
-                    spec = imp_util.spec_from_file_location(module_id, conan_file_path)
-                    loaded = imp_util.module_from_spec(spec)
-                    spec.loader.exec_module(loaded)
-                else:
-                    import imp
-                    loaded = imp.load_source(module_id, conan_file_path)
+                loaded = _load_recipe_module(module_id, conan_file_path)
                 sys.dont_write_bytecode = old_dont_write_bytecode
             except ImportError:
                 version_txt = _get_required_conan_version_without_loading(conan_file_path)
@@ -159,6 +159,11 @@ class ConanOutput(object):
     def flush(self):
         self._stream.flush()
 
+    def redirect(self, stream):
+        """ Writes from now on all the output, also the errors, to 'stream'
+        """
+        self._stream = self._stream_err = stream
+
 
 class ScopedOutput(ConanOutput):
     def __init__(self, scope, output):
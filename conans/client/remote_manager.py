@@ -2,19 +2,25 @@ import os
 import shutil
 import time
 import traceback
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 
 from requests.exceptions import ConnectionError
 
 from conans import DEFAULT_REVISION_V1
 from conans.client.cache.remote_registry import Remote
+from conans.client.tools.oss import cpu_count
 from conans.errors import ConanConnectionError, ConanException, NotFoundException, \
-    NoRestV2Available, PackageNotFoundException
+    NoRestV2Available, PackageNotFoundException, AuthenticationException, ForbiddenException
 from conans.model.info import ConanInfo
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME, rm_conandir
+from conans.model.manifest import FileTreeManifest
+from conans.paths import CONAN_MANIFEST, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME, rm_conandir
 from conans.search.search import filter_packages
 from conans.util import progress_bar
 from conans.util.env_reader import get_env
-from conans.util.files import make_read_only, mkdir, tar_extract, touch_folder, md5sum, sha1sum
+from conans.util.compression import extract_parallel, check_zstd_available, zstandard
+from conans.util.files import make_read_only, mkdir, rmdir, touch_folder, md5sum, sha1sum
 from conans.util.log import logger
 # FIXME: Eventually, when all output is done, tracer functions should be moved to the recorder class
 from conans.util.tracer import (log_package_download,
@@ -24,6 +30,9 @@ from conans.util.tracer import (log_package_download,
 CONAN_REQUEST_HEADER_SETTINGS = 'Conan-PkgID-Settings'
 CONAN_REQUEST_HEADER_OPTIONS = 'Conan-PkgID-Options'
 
+# Concurrent requests to get the packages info from remotes without batch requests
+_PACKAGES_INFO_THREADS = 8
+
 
 def _headers_for_info(info):
     if not info:
@@ -55,6 +64,9 @@ class RemoteManager(object):
     def check_credentials(self, remote):
         self._call_remote(remote, "check_credentials")
 
+    def server_capable(self, remote, capability):
+        return self._call_remote(remote, "server_capable", capability)
+
     def get_recipe_snapshot(self, ref, remote):
         assert ref.revision, "get_recipe_snapshot requires revision"
         return self._call_remote(remote, "get_recipe_snapshot", ref)
@@ -91,6 +103,43 @@ class RemoteManager(object):
         # FIXME Conan 2.0: With revisions, it is not needed to pass headers to this second function
         return self._call_remote(remote, "get_package_info", pref, headers=headers), pref
 
+    def get_packages_info(self, prefs_infos, remote):
+        """ Read the ConanInfo of many packages from the remote, in a single request if the remote
+        supports it, or with concurrent requests otherwise. 'prefs_infos' is a list of
+        (pref, info) with the ConanInfo of the consumer, as in get_package_info()
+
+        returns {pref: (ConanInfo, pref with revisions)}, with None for the packages not found.
+        The packages that fail for other reasons are not returned, so they can be retried
+        """
+        if not prefs_infos:
+            return {}
+        try:
+            prefs = [pref for pref, _ in prefs_infos]
+            return self._call_remote(remote, "get_packages_info", prefs)
+        except NoRestV2Available:
+            pass
+
+        def _package_info(pref_info):
+            pref, info = pref_info
+            try:
+                return pref, self.get_package_info(pref, remote, info=info)
+            except NotFoundException:
+                return pref, None
+            except ConanException as e:
+                logger.debug("REMOTE: Error getting package info %s: %s" % (repr(pref), str(e)))
+                return pref, False
+
+        # The first request is done alone, so a possible authentication is done only once
+        ret = [_package_info(prefs_infos[0])]
+        if len(prefs_infos) > 1:
+            pool = ThreadPool(min(_PACKAGES_INFO_THREADS, len(prefs_infos) - 1))
+            try:
+                ret.extend(pool.map(_package_info, prefs_infos[1:]))
+            finally:
+                pool.close()
+                pool.join()
+        return {pref: result for pref, result in ret if result is not False}
+
     def get_recipe(self, ref, remote):
         """
         Read the conans from remotes
@@ -181,11 +230,18 @@ class RemoteManager(object):
                 raise PackageNotFoundException(pref)
 
             download_pkg_folder = layout.download_package(pref)
-            # Download files to the pkg_tgz folder, not to the final one
-            zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
-
-            # Compute and update the package metadata
-            package_checksums = calc_files_checksum(zipped_files)
+            package_folder = layout.package(pref)
+            file_store = self._cache.file_store
+            zipped_files = None
+            if self._cache.config.stream_downloads:
+                zipped_files, package_checksums = self._get_package_streamed(
+                    pref, remote, download_pkg_folder, package_folder, output, file_store)
+            if zipped_files is None:
+                # Download files to the pkg_tgz folder, not to the final one
+                zipped_files = self._call_remote(remote, "get_package", pref, download_pkg_folder)
+                package_checksums = calc_files_checksum(zipped_files)
+
+            # Update the package metadata
             with layout.update_metadata() as metadata:
                 metadata.packages[pref.id].revision = pref.revision
                 metadata.packages[pref.id].recipe_revision = pref.ref.revision
@@ -195,15 +251,18 @@ class RemoteManager(object):
             duration = time.time() - t1
             log_package_download(pref, duration, remote, zipped_files)
 
-            tgz_file = zipped_files.pop(PACKAGE_TGZ_NAME, None)
+            tgz_files = [zipped_files.pop(f, None) for f in (PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME)]
             check_compressed_files(PACKAGE_TGZ_NAME, zipped_files)
-            package_folder = layout.package(pref)
-            if tgz_file:  # This must happen always, but just in case
-                # TODO: The output could be changed to the package one, but
-                uncompress_file(tgz_file, package_folder, output=self._output)
+            for tgz_file in tgz_files:  # One of them must exist always, but just in case
+                if tgz_file:
+                    # TODO: The output could be changed to the package one, but
+                    uncompress_file(tgz_file, package_folder, output=self._output,
+                                    file_linker=_file_linker(file_store, download_pkg_folder))
             mkdir(package_folder)  # Just in case it doesn't exist, because uncompress did nothing
             for file_name, file_path in zipped_files.items():  # copy CONANINFO and CONANMANIFEST
                 shutil.move(file_path, os.path.join(package_folder, file_name))
+            if file_store:
+                file_store.add_folder(package_folder)
 
             # Issue #214 https://github.com/conan-io/conan/issues/214
             touch_folder(package_folder)
@@ -219,12 +278,49 @@ class RemoteManager(object):
             output.error("Exception: %s %s" % (type(e), str(e)))
             raise
 
+    def _get_package_streamed(self, pref, remote, download_pkg_folder, package_folder, output,
+                              file_store):
+        """ Downloads the package, extracting the conan_package.tgz (or .tzst) while it is received,
+        without saving it to disk. If it fails, the partial results are removed and (None, None) is
+        returned, so the regular download, with retries, can be used instead
+        """
+        def extract(tgz_name, fileobj):
+            # The other package files, like the manifest, have been already downloaded
+            extract_parallel(tgz_name, fileobj, package_folder, threads=cpu_count(),
+                             file_linker=_file_linker(file_store, download_pkg_folder))
+
+        try:
+            zipped_files, tgz_checksums = self._call_remote(remote, "get_package_streamed", pref,
+                                                            download_pkg_folder, extract)
+        except NoRestV2Available:
+            return None, None
+        except (NotFoundException, AuthenticationException, ForbiddenException):
+            raise
+        except ConanException as e:
+            output.warn("Streamed download of package %s failed, downloading it again: %s"
+                        % (pref.id, str(e)))
+            rmdir(download_pkg_folder)
+            rmdir(package_folder)
+            return None, None
+
+        package_checksums = calc_files_checksum(zipped_files)
+        package_checksums.update(tgz_checksums)
+        return zipped_files, package_checksums
+
     def search_recipes(self, remote, pattern=None, ignorecase=True):
         """
         returns (dict str(ref): {packages_info}
         """
         return self._call_remote(remote, "search", pattern, ignorecase)
 
+    def search_recipes_revalidate(self, remote, pattern, ignorecase, etag=None,
+                                  last_modified=None):
+        """ search_recipes() as a conditional request with the validators of a previous search
+        returns (refs or None if not modified, etag, last_modified)
+        """
+        return self._call_remote(remote, "search_revalidate", pattern, ignorecase, etag,
+                                 last_modified)
+
     def search_packages(self, remote, ref, query):
         packages = self._call_remote(remote, "search_packages", ref)
         # Avoid serializing conaninfo in server side
@@ -302,9 +398,34 @@ class RemoteManager(object):
             raise ConanException(exc, remote=remote)
 
 
+# Checksums of the files that were hashed while being written, like the compressed tgz files,
+# {path: (size, mtime, checksums)}. The size and mtime detect if the file changed afterwards.
+# The uploads use them (several times) right after compressing, only the last ones are kept
+_written_files_checksums = OrderedDict()
+_MAX_WRITTEN_FILES_CHECKSUMS = 32
+
+
+def register_file_checksum(path, checksums):
+    st = os.stat(path)
+    _written_files_checksums.pop(path, None)
+    _written_files_checksums[path] = (st.st_size, st.st_mtime_ns, checksums)
+    while len(_written_files_checksums) > _MAX_WRITTEN_FILES_CHECKSUMS:
+        _written_files_checksums.popitem(last=False)
+
+
+def _file_checksum(path):
+    cached = _written_files_checksums.get(path)
+    if cached is not None:
+        size, mtime, checksums = cached
+        st = os.stat(path)
+        if st.st_size == size and st.st_mtime_ns == mtime:
+            return dict(checksums)
+        _written_files_checksums.pop(path, None)
+    return {"md5": md5sum(path), "sha1": sha1sum(path)}
+
+
 def calc_files_checksum(files):
-    return {file_name: {"md5": md5sum(path), "sha1": sha1sum(path)}
-            for file_name, path in files.items()}
+    return {file_name: _file_checksum(path) for file_name, path in files.items()}
 
 
 def is_package_snapshot_complete(snapshot):
@@ -314,23 +435,53 @@ def is_package_snapshot_complete(snapshot):
     return True
 
 
+def select_package_files(files):
+    """ The packages compressed with zstd also contain the conan_package.tgz, for the clients
+    without zstd support. Only one of them is downloaded, the .tzst if it can be extracted
+    """
+    if PACKAGE_TGZ_NAME in files and PACKAGE_TZST_NAME in files:
+        skipped = PACKAGE_TZST_NAME if zstandard is None else PACKAGE_TGZ_NAME
+        if isinstance(files, dict):
+            return {f: v for f, v in files.items() if f != skipped}
+        return [f for f in files if f != skipped]
+    return files
+
+
 def check_compressed_files(tgz_name, files):
     bare_name = os.path.splitext(tgz_name)[0]
     for f in files:
         if f == tgz_name:
             continue
+        if tgz_name == PACKAGE_TGZ_NAME and f == PACKAGE_TZST_NAME:
+            check_zstd_available(f)
+            continue
         if bare_name == os.path.splitext(f)[0]:
             raise ConanException("This Conan version is not prepared to handle '%s' file format. "
                                  "Please upgrade conan client." % f)
 
 
-def uncompress_file(src_path, dest_folder, output):
+def _file_linker(file_store, manifest_folder):
+    """ While extracting a package, links the files that are already in the file store instead
+    of writing them, using the md5 of the downloaded manifest
+    """
+    if file_store is None or not os.path.isfile(os.path.join(manifest_folder, CONAN_MANIFEST)):
+        return None
+    file_sums = FileTreeManifest.load(manifest_folder).file_sums
+
+    def link(name, size, mode, target):
+        md5 = file_sums.get(name)
+        return md5 is not None and file_store.link(md5, size, mode, target)
+    return link
+
+
+def uncompress_file(src_path, dest_folder, output, file_linker=None):
     t1 = time.time()
     try:
         with progress_bar.open_binary(src_path, output,
                                       "Decompressing %s" % os.path.basename(src_path)) \
                 as file_handler:
-            tar_extract(file_handler, dest_folder)
+            extract_parallel(src_path, file_handler, dest_folder, threads=cpu_count(),
+                             file_linker=file_linker)
     except Exception as e:
         error_msg = "Error while extracting downloaded file '%s' to %s\n%s\n"\
                     % (src_path, dest_folder, str(e))
@@ -225,6 +225,9 @@ class ConanRemover(object):
 
         if not remote_name:
             self._cache.delete_empty_dirs(deleted_refs)
+            file_store = self._cache.file_store
+            if file_store and deleted_refs:
+                file_store.remove_unused(self._cache.packages_files_md5s())
 
     def _ask_permission(self, ref, src, build_ids, package_ids_filter, force):
         def stringlist(alist):
@@ -173,6 +173,10 @@ class ClientV2Router(ClientCommonRouter):
         """Remove recipe url"""
         return self.base_url + self._for_recipe(ref)
 
+    def packages_info(self):
+        """Get the conaninfo.txt of many packages in one request"""
+        return self.base_url + self.routes.packages_info
+
     def recipe_revisions(self, ref):
         """Get revisions for a recipe url"""
         return self.base_url + _format_ref(self.routes.recipe_revisions, ref)
@@ -2,15 +2,17 @@ import fnmatch
 import logging
 import os
 import platform
+import threading
 import time
 import warnings
 
 import urllib3
 import requests
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 
 from conans import __version__ as client_version
 from conans.util.files import save
+from conans.util.log import logger
 from conans.util.tracer import log_client_rest_api_call
 
 # Capture SSL warnings as pointed out here:
@@ -18,18 +20,59 @@ from conans.util.tracer import log_client_rest_api_call
 # TODO: Fix this security warning
 logging.captureWarnings(True)
 
+# Connections kept open to every host, by default. The threads of the parallel downloads and
+# uploads share them, if there are more threads than connections they would open new ones
+DEFAULT_MAX_CONNECTIONS = max(DEFAULT_POOLSIZE, 32)
+
+
+class _ConnectionPoolAdapter(HTTPAdapter):
+    """ HTTPAdapter keeping the connection pools it creates, to know how many connections were
+    opened for how many requests
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._pools = []
+        self._pools_lock = threading.Lock()
+        super(_ConnectionPoolAdapter, self).__init__(*args, **kwargs)
+
+    def _track_pools(self, manager):
+        new_pool = manager._new_pool
+
+        def _new_pool(*args, **kwargs):
+            pool = new_pool(*args, **kwargs)
+            with self._pools_lock:
+                self._pools.append(pool)
+            return pool
+        manager._new_pool = _new_pool
+        return manager
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(_ConnectionPoolAdapter, self).init_poolmanager(*args, **kwargs)
+        self._track_pools(self.poolmanager)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        new_manager = proxy not in self.proxy_manager
+        manager = super(_ConnectionPoolAdapter, self).proxy_manager_for(proxy, **proxy_kwargs)
+        return self._track_pools(manager) if new_manager else manager
+
+    def connection_stats(self):
+        with self._pools_lock:
+            pools = list(self._pools)
+        return {"requests": sum(pool.num_requests for pool in pools),
+                "connections": sum(pool.num_connections for pool in pools)}
+
 
 class ConanRequester(object):
 
     def __init__(self, config, http_requester=None):
         if http_requester:
             self._http_requester = http_requester
+            self._adapter = None
         else:
             self._http_requester = requests.Session()
-            adapter = HTTPAdapter(max_retries=self._get_retries(config.retry))
-
-            self._http_requester.mount("http://", adapter)
-            self._http_requester.mount("https://", adapter)
+            self._max_retries = self._get_retries(config.retry)
+            self._max_connections = config.max_connections or DEFAULT_MAX_CONNECTIONS
+            self._mount_adapter()
 
         self._timeout_seconds = config.request_timeout
         self.proxies = config.proxies or {}
@@ -63,6 +106,20 @@ class ConanRequester(object):
             else:
                 self._client_certificates = self._client_cert_path
 
+    def _mount_adapter(self):
+        self._adapter = _ConnectionPoolAdapter(max_retries=self._max_retries,
+                                               pool_maxsize=self._max_connections)
+        self._http_requester.mount("http://", self._adapter)
+        self._http_requester.mount("https://", self._adapter)
+
+    def reset_connections(self):
+        """ Discards the open connections, without closing them, to be called in a forked child
+        process, so it never shares the connections of the parent, that could interleave their
+        requests and responses. The connections of custom http_requesters are not managed
+        """
+        if self._adapter is not None:
+            self._mount_adapter()
+
     def _get_retries(self, retry):
         retry = retry if retry is not None else 2
         if retry == 0:
@@ -114,6 +171,15 @@ class ConanRequester(object):
 
         return kwargs
 
+    def connection_stats(self):
+        """ {"requests": number of requests, "connections": number of connections opened}, the
+        requests not opening a connection reused an existing one. None if the requests are done
+        by a custom http_requester
+        """
+        if self._adapter is None:
+            return None
+        return self._adapter.connection_stats()
+
     def get(self, url, **kwargs):
         return self._call_method("get", url, **kwargs)
 
@@ -140,6 +206,10 @@ class ConanRequester(object):
             tmp = getattr(self._http_requester, method)(url, **all_kwargs)
             duration = time.time() - t1
             log_client_rest_api_call(url, method.upper(), duration, all_kwargs.get("headers"))
+            if self._adapter is not None:
+                stats = self._adapter.connection_stats()
+                logger.debug("REST: %s requests, %s connections opened"
+                             % (stats["requests"], stats["connections"]))
             return tmp
         finally:
             if popped:
@@ -1,7 +1,8 @@
-from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS
+from conans import CHECKSUM_DEPLOY, REVISIONS, ONLY_V2, OAUTH_TOKEN, MATRIX_PARAMS, \
+    PACKAGES_INFO_BATCH
 from conans.client.rest.rest_client_v1 import RestV1Methods
 from conans.client.rest.rest_client_v2 import RestV2Methods
-from conans.errors import OnlyV2Available, AuthenticationException
+from conans.errors import OnlyV2Available, AuthenticationException, NoRestV2Available
 from conans.search.search import filter_packages
 from conans.util.log import logger
 
@@ -82,6 +83,12 @@ class RestApiClient(object):
     def get_package_info(self, pref, headers):
         return self._get_api().get_package_info(pref, headers=headers)
 
+    def get_packages_info(self, prefs):
+        api = self._get_api()
+        if not self._capable(PACKAGES_INFO_BATCH):
+            raise NoRestV2Available("The remote doesn't support packages info batch requests")
+        return api.get_packages_info(prefs)
+
     def get_recipe(self, ref, dest_folder):
         return self._get_api().get_recipe(ref, dest_folder)
 
@@ -94,6 +101,9 @@ class RestApiClient(object):
     def get_package(self, pref, dest_folder):
         return self._get_api().get_package(pref, dest_folder)
 
+    def get_package_streamed(self, pref, dest_folder, tgz_consumer):
+        return self._get_api().get_package_streamed(pref, dest_folder, tgz_consumer)
+
     def get_package_snapshot(self, ref):
         return self._get_api().get_package_snapshot(ref)
 
@@ -138,6 +148,9 @@ class RestApiClient(object):
     def search(self, pattern=None, ignorecase=True):
         return self._get_api().search(pattern, ignorecase)
 
+    def search_revalidate(self, pattern, ignorecase, etag, last_modified):
+        return self._get_api().search_revalidate(pattern, ignorecase, etag, last_modified)
+
     def search_packages(self, reference):
         return self._get_api().search_packages(reference)
 
@@ -150,6 +163,9 @@ class RestApiClient(object):
     def server_capabilities(self):
         return self._get_api().server_capabilities()
 
+    def server_capable(self, capability):
+        return self._capable(capability)
+
     def get_recipe_revisions(self, ref):
         return self._get_api().get_recipe_revisions(ref)
 
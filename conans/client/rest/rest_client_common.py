@@ -174,6 +174,12 @@ class RestCommonMethods(object):
         return [cap.strip() for cap in server_capabilities.split(",") if cap]
 
     def get_json(self, url, data=None, headers=None):
+        return self._json_request(url, data, headers)[0]
+
+    def _json_request(self, url, data=None, headers=None, not_modified=False):
+        """ returns the (json, response) of the request. With 'not_modified', for requests with
+        conditional headers, a 304 Not Modified response is accepted and the json is None
+        """
         req_headers = self.custom_headers.copy()
         req_headers.update(headers or {})
         if data:  # POST request
@@ -190,6 +196,8 @@ class RestCommonMethods(object):
                                           verify=self.verify_ssl,
                                           stream=True)
 
+        if not_modified and response.status_code == 304:
+            return None, response
         if response.status_code != 200:  # Error message is text
             response.charset = "utf-8"  # To be able to access ret.text (ret.content are bytes)
             raise get_exception_from_error(response.status_code)(response_to_str(response))
@@ -206,7 +214,7 @@ class RestCommonMethods(object):
             raise ConanException("Remote responded with broken json: %s" % content)
         if not isinstance(result, dict):
             raise ConanException("Unexpected server response %s" % result)
-        return result
+        return result, response
 
     def upload_recipe(self, ref, files_to_upload, deleted, retry, retry_wait):
         if files_to_upload:
@@ -241,7 +249,27 @@ class RestCommonMethods(object):
         the_files: dict with relative_path: content
         """
         url = self.router.search(pattern, ignorecase)
-        response = self.get_json(url)["results"]
+        return self._search_results(url, self.get_json(url)["results"])
+
+    def search_revalidate(self, pattern, ignorecase, etag=None, last_modified=None):
+        """ search() with a conditional request, using the validators of a previous response
+        returns (refs, etag, last_modified), refs is None if the results didn't change
+        """
+        url = self.router.search(pattern, ignorecase)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        data, response = self._json_request(url, headers=headers, not_modified=True)
+        if data is None:  # Not modified, the validators might not be repeated
+            return (None, response.headers.get("ETag", etag),
+                    response.headers.get("Last-Modified", last_modified))
+        refs = self._search_results(url, data["results"])
+        return refs, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    @staticmethod
+    def _search_results(url, response):
         result = []
         try:
             for reference in response:
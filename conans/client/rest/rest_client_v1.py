@@ -7,7 +7,7 @@ from six.moves.urllib.parse import parse_qs, urljoin, urlparse, urlsplit
 
 from conans.client.downloaders.download import run_downloader
 from conans.client.downloaders.file_downloader import FileDownloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.remote_manager import check_compressed_files, select_package_files
 from conans.client.rest.client_routes import ClientV1Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, handle_return_deserializer
@@ -236,8 +236,10 @@ class RestV1Methods(RestCommonMethods):
 
     def get_package(self, pref, dest_folder):
         urls = self._get_package_urls(pref)
-        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conanmanifest.txt"]
+        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conan_package.tzst",
+                          "conanmanifest.txt"]
         urls = {f: url for f, url in urls.items() if any(f.startswith(m) for m in accepted_files)}
+        urls = select_package_files(urls)
         check_compressed_files(PACKAGE_TGZ_NAME, urls)
         md5s = self.get_package_snapshot(pref) if self._config.download_cache else None
         zipped_files = self._download_files_to_folder(urls, dest_folder, md5s)
@@ -345,6 +347,12 @@ class RestV1Methods(RestCommonMethods):
     def get_latest_package_revision(self, pref, headers):
         raise NoRestV2Available("The remote doesn't support revisions")
 
+    def get_package_streamed(self, pref, dest_folder, tgz_consumer):
+        raise NoRestV2Available("The remote doesn't support streamed downloads")
+
+    def get_packages_info(self, prefs):
+        raise NoRestV2Available("The remote doesn't support packages info batch requests")
+
     def _post_json(self, url, payload):
         logger.debug("REST: post: %s" % url)
         response = self.requester.post(url,
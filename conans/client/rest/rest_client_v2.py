@@ -1,10 +1,15 @@
+import functools
 import os
 import time
 import traceback
+from multiprocessing.pool import ThreadPool
+
+from requests.utils import parse_header_links
+from six.moves.urllib.parse import urlencode, urljoin
 
 from conans import DEFAULT_REVISION_V1
-from conans.client.downloaders.download import run_downloader
-from conans.client.remote_manager import check_compressed_files
+from conans.client.downloaders.download import run_downloader, run_streamed_downloader
+from conans.client.remote_manager import check_compressed_files, select_package_files
 from conans.client.rest.client_routes import ClientV2Router
 from conans.client.rest.file_uploader import FileUploader
 from conans.client.rest.rest_client_common import RestCommonMethods, get_exception_from_error
@@ -13,10 +18,15 @@ from conans.errors import ConanException, NotFoundException, PackageNotFoundExce
 from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import PackageReference
-from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, PACKAGE_TGZ_NAME
+from conans.paths import CONAN_MANIFEST, CONANINFO, EXPORT_SOURCES_TGZ_NAME, EXPORT_TGZ_NAME, \
+    PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME
+from conans.util.env_reader import get_env
 from conans.util.files import decode_text
 from conans.util.log import logger
 
+# Number of packages requested in every page of a packages search
+SEARCH_PACKAGES_PAGE_SIZE = 500
+
 
 class RestV2Methods(RestCommonMethods):
 
@@ -38,6 +48,21 @@ class RestV2Methods(RestCommonMethods):
         data["files"] = list(data["files"].keys())
         return data
 
+    def search_packages(self, ref):
+        """ Client is filtering by the query. The packages are requested in pages, following the
+        "next" links of the responses. Servers not paginating the search return them all at once
+        """
+        url = self.router.search_packages(ref)
+        url = "%s?%s" % (url, urlencode({"page_size": SEARCH_PACKAGES_PAGE_SIZE}))
+        package_infos = {}
+        while url:
+            data, response = self._json_request(url)
+            package_infos.update(data)
+            links = parse_header_links(response.headers.get("Link", ""))
+            next_urls = [link["url"] for link in links if link.get("rel") == "next"]
+            url = urljoin(url, next_urls[0]) if next_urls else None
+        return package_infos
+
     def _get_remote_file_contents(self, url, use_cache, headers=None):
         # We don't want traces in output of these downloads, they are ugly in output
         retry = self._config.retry
@@ -84,6 +109,27 @@ class RestV2Methods(RestCommonMethods):
         content = self._get_remote_file_contents(url, use_cache=cache, headers=headers)
         return ConanInfo.loads(decode_text(content))
 
+    def get_packages_info(self, prefs):
+        """ ConanInfo of many packages in a single request. Returns {pref: (info, pref with
+        revisions)}, with None for the packages not in the remote. The packages not allowed to be
+        read are not returned
+        """
+        data = {"packages": [pref.full_str() for pref in prefs]}
+        packages = self.get_json(self.router.packages_info(), data=data)["packages"]
+        ret = {}
+        for pref in prefs:
+            try:
+                package = packages[pref.full_str()]
+            except KeyError:
+                continue
+            if package is None:
+                ret[pref] = None
+            else:
+                # The server resolves the latest revisions if not specified
+                pref_revs = pref.copy_with_revs(package["recipe_revision"], package["revision"])
+                ret[pref] = ConanInfo.loads(package["content"]), pref_revs
+        return ret
+
     def get_recipe(self, ref, dest_folder):
         url = self.router.recipe_snapshot(ref)
         data = self._get_file_list_json(url)
@@ -122,8 +168,10 @@ class RestV2Methods(RestCommonMethods):
         url = self.router.package_snapshot(pref)
         data = self._get_file_list_json(url)
         files = data["files"]
-        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conanmanifest.txt"]
+        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conan_package.tzst",
+                          "conanmanifest.txt"]
         files = [f for f in files if any(f.startswith(m) for m in accepted_files)]
+        files = select_package_files(files)
         check_compressed_files(PACKAGE_TGZ_NAME, files)
         # If we didn't indicated reference, server got the latest, use absolute now, it's safer
         urls = {fn: self.router.package_file(pref, fn) for fn in files}
@@ -132,6 +180,38 @@ class RestV2Methods(RestCommonMethods):
         ret = {fn: os.path.join(dest_folder, fn) for fn in files}
         return ret
 
+    def get_package_streamed(self, pref, dest_folder, tgz_consumer):
+        """ Same as get_package(), but the conan_package.tgz (or .tzst) is not saved in dest_folder,
+        its download is passed to tgz_consumer(tgz_name, fileobj) while it is being received.
+        returns the files saved in dest_folder and the {tgz_name: checksums} of the streamed file
+        """
+        url = self.router.package_snapshot(pref)
+        data = self._get_file_list_json(url)
+        files = data["files"]
+        accepted_files = ["conaninfo.txt", "conan_package.tgz", "conan_package.tzst",
+                          "conanmanifest.txt"]
+        files = [f for f in files if any(f.startswith(m) for m in accepted_files)]
+        files = select_package_files(files)
+        check_compressed_files(PACKAGE_TGZ_NAME, files)
+        urls = {fn: self.router.package_file(pref, fn) for fn in files}
+        cache = (pref.revision != DEFAULT_REVISION_V1)
+        tgz_names = [f for f in files if f in (PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME)]
+        saved_files = [f for f in files if f not in tgz_names]
+        self._download_and_save_files(urls, dest_folder, saved_files, use_cache=cache)
+        ret = {fn: os.path.join(dest_folder, fn) for fn in saved_files}
+        tgz_checksums = {}
+        for tgz_name in tgz_names:
+            if self._output and not self._output.is_terminal:
+                self._output.writeln("Downloading %s" % tgz_name)
+            download_cache = False if not cache else self._config.download_cache
+            consumer = functools.partial(tgz_consumer, tgz_name)
+            tgz_checksums[tgz_name] = run_streamed_downloader(self.requester, self._output,
+                                                              self.verify_ssl,
+                                                              download_cache=download_cache,
+                                                              url=urls[tgz_name],
+                                                              consumer=consumer, auth=self.auth)
+        return ret, tgz_checksums
+
     def get_recipe_path(self, ref, path):
         url = self.router.recipe_snapshot(ref)
         files = self._get_file_list_json(url)
@@ -193,9 +273,8 @@ class RestV2Methods(RestCommonMethods):
         t1 = time.time()
         failed = []
         uploader = FileUploader(self.requester, self._output, self.verify_ssl, self._config)
-        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
-        # or conanamanifest.txt with missing files due to a network failure
-        for filename in sorted(files):
+
+        def upload(filename):
             if self._output and not self._output.is_terminal:
                 msg = "Uploading: %s" % filename if not display_name else (
                     "Uploading %s -> %s" % (filename, display_name))
@@ -212,9 +291,28 @@ class RestV2Methods(RestCommonMethods):
                 self._output.error("\nError uploading file: %s, '%s'" % (filename, exc))
                 failed.append(filename)
 
+        # conan_package.tgz and conan_export.tgz are uploaded first to avoid uploading conaninfo.txt
+        # or conanamanifest.txt with missing files due to a network failure. Those first files
+        # are uploaded concurrently (with their dedup checks), and the manifest always the last
+        last_files = [f for f in (CONANINFO, CONAN_MANIFEST) if f in files]
+        first_files = sorted(f for f in files if f not in last_files)
+        threads = min(get_env("CONAN_UPLOAD_FILE_THREADS", 4), len(first_files))
+        if threads > 1:
+            pool = ThreadPool(threads)
+            try:
+                pool.map(upload, first_files)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            for filename in first_files:
+                upload(filename)
+        for filename in last_files:
+            upload(filename)
+
         if failed:
             raise ConanException("Execute upload again to retry upload the failed files: %s"
-                                 % ", ".join(failed))
+                                 % ", ".join(sorted(failed)))
         else:
             logger.debug("\nUPLOAD: All uploaded! Total time: %s\n" % str(time.time() - t1))
 
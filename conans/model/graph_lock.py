@@ -3,7 +3,7 @@ import os
 from collections import OrderedDict
 
 from conans import DEFAULT_REVISION_V1
-from conans.client.graph.graph import RECIPE_VIRTUAL, RECIPE_CONSUMER
+from conans.client.graph.graph import RECIPE_VIRTUAL, RECIPE_CONSUMER, topological_levels
 from conans.client.graph.python_requires import PyRequires
 from conans.client.graph.range_resolver import satisfying
 from conans.client.profile_loader import _load_profile
@@ -357,24 +357,12 @@ class GraphLock(object):
                  reference (as string), possibly including revision, of the node
         """
         # First do a topological order by levels, the ids of the nodes are stored
-        levels = []
-        opened = list(self._nodes.keys())
-        while opened:
-            current_level = []
-            for o in opened:
-                node = self._nodes[o]
-                requires = node.requires
-                if node.python_requires:
-                    requires += node.python_requires
-                if node.build_requires:
-                    requires += node.build_requires
-                if not any(n in opened for n in requires):
-                    current_level.append(o)
-
-            current_level.sort()
-            levels.append(current_level)
-            # now initialize new level
-            opened = set(opened).difference(current_level)
+        def dependencies(node_id):
+            node = self._nodes[node_id]
+            return ((node.requires or []) + (node.python_requires or []) +
+                    (node.build_requires or []))
+
+        levels = topological_levels(self._nodes, dependencies)
 
         # Now compute the list of list with prev=None, and prepare them with the right
         # references to be used in cmd line
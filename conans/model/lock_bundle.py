@@ -1,6 +1,7 @@
 import json
 import os
 
+from conans.client.graph.graph import topological_levels
 from conans.errors import ConanException
 from conans.model.graph_lock import GraphLockFile
 from conans.util.files import load, save
@@ -95,27 +96,15 @@ class LockBundle(object):
 
     def build_order(self):
         # First do a topological order by levels, the ids of the nodes are stored
-        levels = []
-        opened = list(self._nodes.keys())
-        while opened:
-            current_level = []
-            closed = []
-            for o in opened:
-                node = self._nodes[o]
-                requires = node.get("requires", [])
-                if not any(n in opened for n in requires):  # Doesn't have an open requires
-                    # iterate all packages to see if some has prev=null
-                    if any(pkg["prev"] is None for pkg in node["packages"]):
-                        current_level.append(o)
-                    closed.append(o)
-
-            if current_level:
-                current_level.sort()
-                levels.append(current_level)
-            # now initialize new level
-            opened = set(opened).difference(closed)
-
-        return levels
+        levels = topological_levels(self._nodes, lambda o: self._nodes[o].get("requires", []))
+        result = []
+        for level in levels:
+            # The nodes with some package with prev=null
+            level = [o for o in level
+                     if any(pkg["prev"] is None for pkg in self._nodes[o]["packages"])]
+            if level:
+                result.append(level)
+        return result
 
     @staticmethod
     def update_bundle(bundle_path, revisions_enabled):
@@ -41,6 +41,7 @@ SYSTEM_REQS = "system_reqs.txt"
 ARTIFACTS_PROPERTIES_FILE = "artifacts.properties"
 ARTIFACTS_PROPERTIES_PUT_PREFIX = "artifact_property_"
 PACKAGE_TGZ_NAME = "conan_package.tgz"
+PACKAGE_TZST_NAME = "conan_package.tzst"
 EXPORT_TGZ_NAME = "conan_export.tgz"
 EXPORT_SOURCES_TGZ_NAME = "conan_sources.tgz"
 RUN_LOG_NAME = "conan_run.log"
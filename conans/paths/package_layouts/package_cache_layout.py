@@ -3,6 +3,7 @@
 import os
 import platform
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 
 import fasteners
@@ -10,13 +11,15 @@ import fasteners
 from conans.client.tools.oss import OSInfo
 from conans.errors import NotFoundException, ConanException
 from conans.errors import RecipeNotFoundException, PackageNotFoundException
+from conans.model.info import ConanInfo
 from conans.model.manifest import FileTreeManifest
 from conans.model.manifest import discarded_file
 from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference
 from conans.model.ref import PackageReference
-from conans.paths import CONANFILE, SYSTEM_REQS, EXPORT_FOLDER, EXPORT_SRC_FOLDER, SRC_FOLDER, \
-    BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, PACKAGE_METADATA, SCM_SRC_FOLDER, rm_conandir
+from conans.paths import CONANFILE, CONANINFO, SYSTEM_REQS, EXPORT_FOLDER, EXPORT_SRC_FOLDER, \
+    SRC_FOLDER, BUILD_FOLDER, PACKAGES_FOLDER, SYSTEM_REQS_FOLDER, PACKAGE_METADATA, \
+    SCM_SRC_FOLDER, rm_conandir
 from conans.util.env_reader import get_env
 from conans.util.files import load, save, rmdir, set_dirty, clean_dirty, is_dirty
 from conans.util.locks import Lock, NoLock, ReadLock, SimpleLock, WriteLock
@@ -39,12 +42,13 @@ def short_path(func):
 class PackageCacheLayout(object):
     """ This is the package layout for Conan cache """
 
-    def __init__(self, base_folder, ref, short_paths, no_lock):
+    def __init__(self, base_folder, ref, short_paths, no_lock, index=None):
         assert isinstance(ref, ConanFileReference)
         self._ref = ref
         self._base_folder = os.path.normpath(base_folder)
         self._short_paths = short_paths
         self._no_lock = no_lock
+        self._index = index
 
     @property
     def ref(self):
@@ -117,6 +121,15 @@ class PackageCacheLayout(object):
         set_dirty(pkg_folder)
         yield
         clean_dirty(pkg_folder)
+        if self._index is not None:
+            self._index_package(pref, self._package_info_min(pref.id))
+
+    def _index_package(self, pref, info):
+        try:
+            revision = self.package_revision(pref)
+        except (RecipeNotFoundException, PackageNotFoundException):
+            revision = None
+        self._index.save_package(pref, revision, info)
 
     def download_package(self, pref):
         return os.path.join(self._base_folder, "dl", "pkg", pref.id)
@@ -150,6 +163,8 @@ class PackageCacheLayout(object):
                                  "Close any app using it, and retry" % (pkg_folder, str(e)))
         if is_dirty(pkg_folder):
             clean_dirty(pkg_folder)
+        if self._index is not None:
+            self._index.remove_package(pref)
         # FIXME: This fails at the moment, but should be fixed
         # with self.update_metadata() as metadata:
         #    metadata.clear_package(pref.id)
@@ -179,6 +194,8 @@ class PackageCacheLayout(object):
         rmdir(download_export)
         scm_folder = os.path.join(self._base_folder, SCM_SRC_FOLDER)
         rm_conandir(scm_folder)
+        if self._index is not None:
+            self._index.remove_recipe(self._ref)
 
     def package_metadata(self):
         return os.path.join(self._base_folder, PACKAGE_METADATA)
@@ -236,6 +253,49 @@ class PackageCacheLayout(object):
             packages = []
         return packages
 
+    def index_entry(self):
+        """ (recipe revision, [(package_id, package revision, serialize_min info)]) to store in
+        the cache index, None if the recipe is not in the cache
+        """
+        try:
+            metadata = self.load_metadata()
+        except RecipeNotFoundException:
+            return None
+        packages = [(package_id, metadata.packages[package_id].revision
+                     if package_id in metadata.packages else None,
+                     self._package_info_min(package_id))
+                    for package_id in self.package_ids()]
+        return metadata.recipe.revision, packages
+
+    def _package_info_min(self, package_id):
+        info_path = os.path.join(self.package(PackageReference(self._ref, package_id)), CONANINFO)
+        try:
+            return ConanInfo.loads(load(info_path)).serialize_min()
+        except IOError:
+            return None
+
+    def indexed_package_infos(self):
+        """ {package_id: serialize_min info} of the packages in the cache, from the cache index,
+        None if the index is not enabled. The packages written without indexing them (e.g.
+        "conan copy") are read from disk and indexed
+        """
+        if self._index is None:
+            return None
+        indexed = self._index.package_infos(self._ref)
+        result = OrderedDict()
+        for package_id in sorted(self.package_ids()):
+            info = indexed.get(package_id)
+            if info is None:
+                pref = PackageReference(self._ref, package_id)
+                info = self._package_info_min(package_id)
+                if info is None:
+                    logger.error("There is no ConanInfo: %s"
+                                 % os.path.join(self.package(pref), CONANINFO))
+                    continue
+                self._index_package(pref, info)
+            result[package_id] = info
+        return result
+
     # Metadata
     def load_metadata(self):
         try:
@@ -261,6 +321,10 @@ class PackageCacheLayout(object):
                     metadata = PackageMetadata()
                 yield metadata
                 save(metadata_path, metadata.dumps())
+                if self._index is not None:
+                    self._index.save_recipe(self._ref, metadata.recipe.revision,
+                                            {package_id: package.revision
+                                             for package_id, package in metadata.packages.items()})
             finally:
                 thread_lock.release()
 
@@ -312,7 +376,7 @@ class PackageCacheLayout(object):
             raise NotFoundException("The specified path doesn't exist")
         if os.path.isdir(abs_path):
             keep_python = get_env("CONAN_KEEP_PYTHON_FILES", False)
-            return sorted([path for path in os.listdir(abs_path) if not discarded_file(path,
-                                                                                       keep_python)])
+            return sorted([path for path in os.listdir(abs_path)
+                           if not discarded_file(path, keep_python)])
         else:
             return load(abs_path)
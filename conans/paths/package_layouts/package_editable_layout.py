@@ -67,3 +67,6 @@ class PackageEditableLayout(object):
 
     def package_ids(self):
         raise ConanException("Package in editable mode cannot list binaries")
+
+    def indexed_package_infos(self):
+        raise ConanException("Package in editable mode cannot list binaries")
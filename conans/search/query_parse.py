@@ -68,6 +68,34 @@ def evaluate_postfix(postfix, evaluator):
         return stack[0]
 
 
+def compile_postfix(postfix, compiler):
+    """
+    Compiles a postfix expression into a function, to evaluate it many times without parsing
+    its expressions again
+    @param postfix:  Postfix expression as a list
+    @param compiler: Function receiving expressions like "compiler.version=12" and returning
+                     a function that evaluates them to a bool
+    @return: function evaluating the whole expression to a bool
+    """
+    if not postfix:  # If no query return all
+        return lambda _: True
+
+    stack = []
+    for el in postfix:
+        if not is_operator(el):
+            stack.append(compiler(el))
+        else:
+            o1 = stack.pop()
+            o2 = stack.pop()
+            if el == "|":
+                stack.append(lambda arg, o1=o1, o2=o2: o1(arg) or o2(arg))
+            elif el == "&":
+                stack.append(lambda arg, o1=o1, o2=o2: o1(arg) and o2(arg))
+    if len(stack) != 1:
+        raise Exception("Bad stack: %s" % str(stack))
+    return stack[0]
+
+
 def infix_to_postfix(exp):
     """
     Translates an infix expression to postfix using an standard algorithm
@@ -7,7 +7,7 @@ from conans.errors import ConanException, RecipeNotFoundException
 from conans.model.info import ConanInfo
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO
-from conans.search.query_parse import evaluate_postfix, infix_to_postfix
+from conans.search.query_parse import compile_postfix, infix_to_postfix
 from conans.util.files import load
 from conans.util.log import logger
 
@@ -47,49 +47,38 @@ def filter_packages(query, package_infos):
         if " not " in query or query.startswith("not "):
             raise ConanException("'not' operator is not allowed")
         postfix = infix_to_postfix(query) if query else []
+        query_function = compile_postfix(postfix, _compile_expression)
         result = OrderedDict()
         for package_id, info in package_infos.items():
-            if _evaluate_postfix_with_info(postfix, info):
+            if query_function(info):
                 result[package_id] = info
         return result
     except Exception as exc:
         raise ConanException("Invalid package query: %s. %s" % (query, exc))
 
 
-def _evaluate_postfix_with_info(postfix, conan_vars_info):
+_COMMON_SETTINGS = ("os", "os_build", "compiler", "arch", "arch_build", "build_type")
 
-    # Evaluate conaninfo with the expression
 
-    def evaluate_info(expression):
-        """Receives an expression like compiler.version="12"
-        Uses conan_vars_info in the closure to evaluate it"""
-        name, value = expression.split("=", 1)
-        value = value.replace("\"", "")
-        return _evaluate(name, value, conan_vars_info)
-
-    return evaluate_postfix(postfix, evaluate_info)
-
-
-def _evaluate(prop_name, prop_value, conan_vars_info):
+def _compile_expression(expression):
     """
-    Evaluates a single prop_name, prop_value like "os", "Windows" against
+    Compiles a single expression like 'os="Windows"' into a function evaluating it against
     conan_vars_info.serialize_min()
     """
+    prop_name, prop_value = expression.split("=", 1)
+    prop_value = prop_value.replace("\"", "")
+    if prop_name in _COMMON_SETTINGS or \
+            any(prop_name.startswith(setting + '.') for setting in _COMMON_SETTINGS):
+        field = "settings"
+    else:
+        field = "options"
+    match_none = prop_value == "None"
 
-    def compatible_prop(setting_value, _prop_value):
-        return (_prop_value == setting_value) or (_prop_value == "None" and setting_value is None)
-
-    info_settings = conan_vars_info.get("settings", [])
-    info_options = conan_vars_info.get("options", [])
-    properties = ["os", "os_build", "compiler", "arch", "arch_build", "build_type"]
+    def evaluate(conan_vars_info):
+        value = conan_vars_info.get(field, {}).get(prop_name, None)
+        return prop_value == value or (match_none and value is None)
 
-    def starts_with_common_settings(_prop_name):
-        return any(_prop_name.startswith(setting + '.') for setting in properties)
-
-    if prop_name in properties or starts_with_common_settings(prop_name):
-        return compatible_prop(info_settings.get(prop_name, None), prop_value)
-    else:
-        return compatible_prop(info_options.get(prop_name, None), prop_value)
+    return evaluate
 
 
 def search_recipes(cache, pattern=None, ignorecase=True):
@@ -146,25 +135,25 @@ def search_packages(package_layout, query):
 
 
 def _get_local_infos_min(package_layout):
-    result = OrderedDict()
+    result = package_layout.indexed_package_infos()
+    if result is None:
+        result = OrderedDict()
+        for package_id in package_layout.package_ids():
+            # Read conaninfo
+            pref = PackageReference(package_layout.ref, package_id)
+            info_path = os.path.join(package_layout.package(pref), CONANINFO)
+            if not os.path.exists(info_path):
+                logger.error("There is no ConanInfo: %s" % str(info_path))
+                continue
+            conan_info_content = load(info_path)
+            info = ConanInfo.loads(conan_info_content)
+            result[package_id] = info.serialize_min()
 
-    package_ids = package_layout.package_ids()
-    for package_id in package_ids:
-        # Read conaninfo
-        pref = PackageReference(package_layout.ref, package_id)
-        info_path = os.path.join(package_layout.package(pref), CONANINFO)
-        if not os.path.exists(info_path):
-            logger.error("There is no ConanInfo: %s" % str(info_path))
-            continue
-        conan_info_content = load(info_path)
-
-        info = ConanInfo.loads(conan_info_content)
-        if package_layout.ref.revision:
-            metadata = package_layout.load_metadata()
+    if package_layout.ref.revision:
+        metadata = package_layout.load_metadata()
+        for package_id in list(result):
             recipe_revision = metadata.packages[package_id].recipe_revision
             if recipe_revision and recipe_revision != package_layout.ref.revision:
-                continue
-        conan_vars_info = info.serialize_min()
-        result[package_id] = conan_vars_info
+                del result[package_id]
 
     return result
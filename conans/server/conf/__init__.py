@@ -54,6 +54,9 @@ class ConanServerConfigParser(ConfigParser):
                            "host_name": get_env("CONAN_HOST_NAME", None, environment),
                            "custom_authenticator": get_env("CONAN_CUSTOM_AUTHENTICATOR", None, environment),
                            "custom_authorizer": get_env("CONAN_CUSTOM_AUTHORIZER", None, environment),
+                           "workers": get_env("CONAN_SERVER_WORKERS", None, environment),
+                           "keep_alive_timeout": get_env("CONAN_SERVER_KEEP_ALIVE_TIMEOUT", None,
+                                                         environment),
                            # "user:pass,user2:pass2"
                            "users": get_env("CONAN_SERVER_USERS", None, environment)}
 
@@ -108,6 +111,31 @@ class ConanServerConfigParser(ConfigParser):
         except ConanException:
             return self.port
 
+    @property
+    def workers(self):
+        try:
+            workers = self._get_conf_server_string("workers")
+        except ConanException:
+            return 1
+        try:
+            workers = int(workers)
+        except ValueError:
+            workers = 0
+        if workers < 1:
+            raise ConanException("Specify a positive numeric parameter for 'workers'")
+        return workers
+
+    @property
+    def keep_alive_timeout(self):
+        try:
+            keep_alive_timeout = self._get_conf_server_string("keep_alive_timeout")
+        except ConanException:
+            return None
+        try:
+            return int(keep_alive_timeout)
+        except ValueError:
+            raise ConanException("Specify a numeric parameter for 'keep_alive_timeout'")
+
     @property
     def host_name(self):
         try:
@@ -11,6 +11,12 @@ port: 9300
 public_port:
 host_name: localhost
 
+# Threads serving the requests concurrently. With 1 the requests are served one at a time
+# workers: 8
+# Seconds an idle client connection is kept open for new requests. Only with the waitress
+# server installed (pip install waitress), otherwise connections are closed after every request
+# keep_alive_timeout: 120
+
 # Authorize timeout are seconds the client has to upload/download files until authorization expires
 authorize_timeout: 1800
 
@@ -58,14 +58,18 @@ class ServerLauncher(object):
         self.server = ConanServer(server_config.port, credentials_manager, updown_auth_manager,
                                   authorizer, authenticator, server_store,
                                   server_capabilities)
+        self.workers = server_config.workers
+        self.keep_alive_timeout = server_config.keep_alive_timeout
         if not self.force_migration:
             print("***********************")
             print("Using config: %s" % server_config.config_filename)
             print("Storage: %s" % server_config.disk_storage_path)
             print("Public URL: %s" % server_config.public_url)
             print("PORT: %s" % server_config.port)
+            print("Workers: %s" % self.workers)
             print("***********************")
 
     def launch(self):
         if not self.force_migration:
-            self.server.run(host="0.0.0.0")
+            self.server.run(host="0.0.0.0", workers=self.workers,
+                            keep_alive_timeout=self.keep_alive_timeout)
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import mimetypes
+import os
+import time
+
+from bottle import HTTPError, HTTPResponse, parse_range_header, request, response
+
+
+def _etag_matches(etag, if_none_match):
+    return if_none_match.strip() == "*" or etag in [it.strip() for it in if_none_match.split(",")]
+
+
+def json_with_etag(result):
+    """ Returns the json 'result' with an ETag header, or an empty 304 Not Modified response if
+    the client already has it (If-None-Match)
+    """
+    body = json.dumps(result, sort_keys=True)
+    etag = '"%s"' % hashlib.md5(body.encode()).hexdigest()
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return HTTPResponse(status=304, headers={"ETag": etag})
+    response.set_header("ETag", etag)
+    response.content_type = "application/json"
+    return body
+
+
+class FileRange(object):
+    """ Readable 'length' bytes of a file from 'offset', the body of the file responses. The
+    servers of conans.server.rest.wsgi_server send it with os.sendfile(), without copying it
+    """
+
+    def __init__(self, path, offset, length):
+        self._file = open(path, "rb")
+        self._file.seek(offset)
+        self.offset = offset
+        self.length = length
+        self._remaining = length
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def file_response(path, mimetype="auto", checksum=None):
+    """ Serves the file in 'path' with a strong ETag, and supports the conditional requests
+    (If-None-Match) and a single range of bytes (Range), so clients can resume downloads or
+    get segments of the file in parallel. The ETag is the stored 'checksum' of the file if
+    known. Otherwise, as the files of the store are never modified in place, they are removed
+    and written again, their inode, size and modification time identify their contents
+    """
+    if not os.path.isfile(path):
+        return HTTPError(404, "File does not exist.")
+    if not os.access(path, os.R_OK):
+        return HTTPError(403, "You do not have permission to access this file.")
+
+    stats = os.stat(path)
+    if checksum:
+        etag = '"%s"' % checksum
+    else:
+        etag = '"%x-%x-%x"' % (stats.st_ino, stats.st_size, stats.st_mtime_ns)
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return HTTPResponse(status=304, headers={"ETag": etag})
+
+    headers = {"ETag": etag,
+               "Accept-Ranges": "bytes",
+               "Last-Modified": time.strftime("%a, %d %b %Y %H:%M:%S GMT",
+                                              time.gmtime(stats.st_mtime))}
+    if mimetype == "auto":
+        mimetype, encoding = mimetypes.guess_type(path)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+    if mimetype:
+        headers["Content-Type"] = mimetype
+
+    size = stats.st_size
+    offset, length, status = 0, size, 200
+    range_header = request.environ.get("HTTP_RANGE")
+    if range_header:
+        ranges = list(parse_range_header(range_header, size))
+        if not ranges:
+            return HTTPResponse(status=416, headers={"Content-Range": "bytes */%d" % size})
+        offset, end = ranges[0]
+        length, status = end - offset, 206
+        headers["Content-Range"] = "bytes %d-%d/%d" % (offset, end - 1, size)
+    headers["Content-Length"] = str(length)
+
+    body = "" if request.method == "HEAD" else FileRange(path, offset, length)
+    return HTTPResponse(body, status=status, headers=headers)
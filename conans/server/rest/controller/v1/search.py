@@ -2,6 +2,7 @@ from bottle import request
 
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
+from conans.server.rest.controller.common.conditional import json_with_etag
 from conans.server.service.common.search import SearchService
 
 
@@ -22,7 +23,7 @@ class SearchController(object):
                 ignore_case = False if 'false' == ignore_case.lower() else True
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
             references = [repr(ref) for ref in search_service.search(pattern, ignore_case)]
-            return {"results": references}
+            return json_with_etag({"results": references})
 
         @app.route(r.common_search_packages, method=["GET"])
         def search_packages(name, version, username, channel, auth_user):
@@ -1,7 +1,7 @@
 from bottle import request
 
-from conans.errors import NotFoundException
-from conans.model.ref import ConanFileReference
+from conans.errors import NotFoundException, RequestErrorException
+from conans.model.ref import ConanFileReference, PackageReference
 from conans.server.rest.bottle_routes import BottleRoutes
 from conans.server.rest.controller.v2 import get_package_ref
 from conans.server.service.v2.service_v2 import ConanServiceV2
@@ -15,6 +15,28 @@ class ConanControllerV2(object):
         conan_service = ConanServiceV2(app.authorizer, app.server_store)
         r = BottleRoutes()
 
+        @app.route(r.packages_info, method=["POST"])
+        def get_packages_info(auth_user):
+            """ Returns the conaninfo.txt of many packages in a single request:
+            {pref: {"recipe_revision": RREV, "revision": PREV, "content": conaninfo.txt}},
+            with pref: None for the not found ones
+            """
+            try:
+                prefs = [PackageReference.loads(pref) for pref in request.json["packages"]]
+            except Exception:
+                raise RequestErrorException("Wrong packages_info request")
+            infos = conan_service.get_packages_info(prefs, auth_user)
+            packages = {}
+            for pref, info in infos.items():
+                if info is None:
+                    packages[pref.full_str()] = None
+                else:
+                    pref_revs, content = info
+                    packages[pref.full_str()] = {"recipe_revision": pref_revs.ref.revision,
+                                                 "revision": pref_revs.revision,
+                                                 "content": content}
+            return {"packages": packages}
+
         @app.route(r.package_revision_files, method=["GET"])
         def get_package_file_list(name, version, username, channel, package_id, auth_user,
                                   revision, p_revision):
@@ -1,7 +1,12 @@
-from bottle import request
+import json
 
+from bottle import request, response
+from six.moves.urllib.parse import urlencode
+
+from conans.errors import RequestErrorException
 from conans.model.ref import ConanFileReference
 from conans.server.rest.bottle_routes import BottleRoutes
+from conans.server.rest.controller.common.conditional import json_with_etag
 from conans.server.service.common.search import SearchService
 
 
@@ -22,13 +27,46 @@ class SearchControllerV2(object):
                 ignore_case = False if 'false' == ignore_case.lower() else True
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
             references = [repr(ref) for ref in search_service.search(pattern, ignore_case)]
-            return {"results": references}
+            return json_with_etag({"results": references})
 
         @app.route(r.common_search_packages, method=["GET"])
         @app.route(r.common_search_packages_revision, method=["GET"])
         def search_packages(name, version, username, channel, auth_user, revision=None):
             query = request.params.get("q", None)
+            page, page_size = _pagination_params()
             search_service = SearchService(app.authorizer, app.server_store, auth_user)
             ref = ConanFileReference(name, version, username, channel, revision)
-            info = search_service.search_packages(ref, query)
-            return info
+            infos, more = search_service.search_packages_page(ref, query, page, page_size)
+            if more:
+                params = dict(request.query)
+                params["page"] = page + 1
+                response.set_header("Link", '<?%s>; rel="next"' % urlencode(sorted(params.items())))
+            response.content_type = "application/json"
+            return _stream_json(infos)
+
+
+def _pagination_params():
+    """ The optional 'page' (from 1) and 'page_size' of the request, all the results in one page
+    if no 'page_size' is requested
+    """
+    try:
+        page = int(request.params.get("page", 1))
+        page_size = request.params.get("page_size")
+        page_size = int(page_size) if page_size is not None else None
+    except ValueError:
+        raise RequestErrorException("The 'page' and 'page_size' must be integers")
+    if page < 1 or (page_size is not None and page_size < 1):
+        raise RequestErrorException("The 'page' and 'page_size' must be positive")
+    return page, page_size
+
+
+def _stream_json(items):
+    """ The json object of the (key, value) 'items', serialized while they are iterated, so the
+    response is sent without building it all in memory
+    """
+    yield "{"
+    separator = ""
+    for key, value in items:
+        yield "%s%s: %s" % (separator, json.dumps(key), json.dumps(value))
+        separator = ", "
+    yield "}"
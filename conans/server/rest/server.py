@@ -2,6 +2,7 @@ import bottle
 
 from conans.server.rest.api_v1 import ApiV1
 from conans.server.rest.api_v2 import ApiV2
+from conans.server.rest.wsgi_server import ThreadPoolServer, WSGIRefServer
 
 
 class ConanServer(object):
@@ -42,5 +43,12 @@ class ConanServer(object):
         port = kwargs.pop("port", self.run_port)
         debug_set = kwargs.pop("debug", False)
         host = kwargs.pop("host", "localhost")
-        bottle.Bottle.run(self.root_app, host=host,
-                          port=port, debug=debug_set, reloader=False)
+        quiet = kwargs.pop("quiet", False)
+        workers = kwargs.pop("workers", 1)
+        if workers > 1:
+            server = ThreadPoolServer(host=host, port=port, workers=workers,
+                                      keep_alive_timeout=kwargs.pop("keep_alive_timeout", None))
+        else:
+            server = WSGIRefServer(host=host, port=port)
+        bottle.Bottle.run(self.root_app, host=host, server=server,
+                          port=port, debug=debug_set, reloader=False, quiet=quiet)
@@ -0,0 +1,132 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer, make_server
+
+import bottle
+
+from conans.server.rest.controller.common.conditional import FileRange
+
+
+class _ThreadPoolWSGIServer(WSGIServer):
+    """ wsgiref server processing every request in a thread of a pool
+    """
+    request_queue_size = 64
+    workers = 1
+
+    def server_activate(self):
+        WSGIServer.server_activate(self)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        WSGIServer.server_close(self)
+        self._pool.shutdown(wait=False)
+
+
+class _SendfileServerHandler(ServerHandler):
+
+    def sendfile(self):
+        """ Sends the files served by the file_response() with os.sendfile(), so their contents
+        are not copied from the kernel to Python and back
+        """
+        file_range = self.result.filelike
+        if not isinstance(file_range, FileRange) or not hasattr(os, "sendfile"):
+            return False
+        try:
+            out_fd = self.stdout.fileno()
+        except (AttributeError, OSError):
+            return False
+        if not self.headers_sent:
+            self.send_headers()
+        self._flush()
+        offset, remaining = file_range.offset, file_range.length
+        while remaining > 0:
+            sent = os.sendfile(out_fd, file_range.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+            self.bytes_sent += sent
+        return True
+
+
+class _RequestHandler(WSGIRequestHandler):
+    quiet = False
+
+    def handle(self):
+        """ Same as WSGIRequestHandler.handle(), with the handler supporting sendfile
+        """
+        self.raw_requestline = self.rfile.readline(65537)
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ''
+            self.request_version = ''
+            self.command = ''
+            self.send_error(414)
+            return
+
+        if not self.parse_request():  # An error code has been sent, just exit
+            return
+
+        handler = _SendfileServerHandler(self.rfile, self.wfile, self.get_stderr(),
+                                         self.get_environ(), multithread=False)
+        handler.request_handler = self  # backpointer for logging
+        handler.run(self.server.get_app())
+
+    def log_request(self, *args, **kwargs):
+        if not self.quiet:
+            WSGIRequestHandler.log_request(self, *args, **kwargs)
+
+
+class WSGIRefServer(bottle.ServerAdapter):
+    """ Standard library wsgiref server, sending the files with os.sendfile(). With more than
+    one 'workers' the requests are processed concurrently by a pool of threads
+    """
+
+    def run(self, handler):
+        workers = self.options.get("workers", 1)
+        if workers > 1:
+            server_class = type("ThreadPoolWSGIServer", (_ThreadPoolWSGIServer, ),
+                                {"workers": workers})
+        else:
+            server_class = WSGIServer
+        handler_class = type("RequestHandler", (_RequestHandler, ), {"quiet": self.quiet})
+        server = make_server(self.host, self.port, handler, server_class, handler_class)
+        server.serve_forever()
+
+
+class ThreadPoolServer(bottle.ServerAdapter):
+    """ Serves the requests concurrently with a pool of 'workers' threads, so a slow upload or
+    download doesn't block the rest of clients.
+
+    It uses waitress when it is installed, that also keeps alive the idle connections of the
+    clients 'keep_alive_timeout' seconds. Otherwise the WSGIRefServer is used, closing the
+    connection after every request
+    """
+
+    def run(self, handler):
+        workers = self.options.get("workers", 1)
+        keep_alive_timeout = self.options.get("keep_alive_timeout")
+        try:
+            import waitress
+        except ImportError:
+            waitress = None
+
+        if waitress is not None:
+            kwargs = {"threads": workers, "_quiet": self.quiet}
+            if keep_alive_timeout is not None:
+                kwargs["channel_timeout"] = keep_alive_timeout
+            waitress.serve(handler, host=self.host, port=self.port, **kwargs)
+        else:
+            server = WSGIRefServer(host=self.host, port=self.port, workers=workers)
+            server.quiet = self.quiet
+            server.run(handler)
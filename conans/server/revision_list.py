@@ -30,6 +30,11 @@ class RevisionList(object):
         else:
             return from_timestamp_to_iso8601(the_time)
 
+    def copy(self):
+        ret = RevisionList()
+        ret._data = list(self._data)
+        return ret
+
     def dumps(self):
         return json.dumps({"revisions": [{"revision": e.revision,
                                           "time": e.time} for e in self._data]})
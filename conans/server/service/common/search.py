@@ -1,5 +1,7 @@
+import json
 import os
 import re
+import uuid
 from fnmatch import translate
 
 from conans import load
@@ -12,54 +14,112 @@ from conans.util.files import list_folder_subdirs
 from conans.util.log import logger
 
 
-def _get_local_infos_min(server_store, ref, look_in_all_rrevs):
+# Index of the infos of the packages of every recipe revision, in its packages folder
+PACKAGES_INDEX_FILE = ".packages_index.json"
+
+
+def _file_stamp(path):
+    stats = os.stat(path)
+    return [stats.st_ino, stats.st_size, stats.st_mtime_ns]
+
+
+def _load_packages_index(packages_folder):
+    try:
+        with open(os.path.join(packages_folder, PACKAGES_INDEX_FILE)) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+
 
+def _save_packages_index(packages_folder, index):
+    """ Written in a temporary file and renamed, concurrent readers never see partial contents.
+    Concurrent writers could lose the entries of the other, they would be just loaded again
+    """
+    path = os.path.join(packages_folder, PACKAGES_INDEX_FILE)
+    tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+    try:
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, path)
+    except (IOError, OSError) as e:
+        logger.debug("SERVER SEARCH: Cannot save '%s': %s" % (path, str(e)))
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _get_package_refs(server_store, ref, look_in_all_rrevs):
+    """ The [(package_id, ref)] of the packages of the recipe revisions, with the ref of the
+    latest recipe revision containing every package_id, sorted by package_id
+    """
     result = {}
     rrevs = server_store.get_recipe_revisions(ref) if look_in_all_rrevs else [None]
-
     for rrev in rrevs:
         new_ref = ref.copy_with_rev(rrev.revision) if rrev else ref
-        subdirs = list_folder_subdirs(server_store.packages(new_ref), level=1)
-        for package_id in subdirs:
-            if package_id in result:
-                continue
-            # Read conaninfo
-            try:
-                pref = PackageReference(new_ref, package_id)
-                revision_entry = server_store.get_last_package_revision(pref)
-                if not revision_entry:
-                    raise NotFoundException("")
-                pref = PackageReference(new_ref, package_id, revision_entry.revision)
-                info_path = os.path.join(server_store.package(pref), CONANINFO)
-                if not os.path.exists(info_path):
-                    raise NotFoundException("")
-                content = load(info_path)
-                info = ConanInfo.loads(content)
-                # From Conan 1.48 the conaninfo.txt is sent raw.
-                result[package_id] = {"content": content}
-                # FIXME: This could be removed in the conan_server, Artifactory should keep it
-                #        to guarantee compatibility with old conan clients.
-                conan_vars_info = info.serialize_min()
-                result[package_id].update(conan_vars_info)
+        for package_id in list_folder_subdirs(server_store.packages(new_ref), level=1):
+            result.setdefault(package_id, new_ref)
+    return sorted(result.items())
+
 
+def _package_info_min(server_store, pref, index):
+    """ The info of the latest revision of the package, from the 'index' of its recipe revision
+    if its conaninfo.txt didn't change. Returns (info, index_updated)
+    """
+    revision_entry = server_store.get_last_package_revision(pref)
+    if not revision_entry:
+        raise NotFoundException("")
+    pref = pref.copy_with_revs(pref.ref.revision, revision_entry.revision)
+    info_path = os.path.join(server_store.package(pref), CONANINFO)
+    if not os.path.exists(info_path):
+        raise NotFoundException("")
+    stamp = _file_stamp(info_path)
+    entry = index.get(pref.id)
+    if entry and entry["revision"] == pref.revision and entry["stamp"] == stamp:
+        return entry["info"], False
+    content = load(info_path)
+    info = ConanInfo.loads(content)
+    # From Conan 1.48 the conaninfo.txt is sent raw.
+    result = {"content": content}
+    # FIXME: This could be removed in the conan_server, Artifactory should keep it
+    #        to guarantee compatibility with old conan clients.
+    conan_vars_info = info.serialize_min()
+    result.update(conan_vars_info)
+    index[pref.id] = {"revision": pref.revision, "stamp": stamp, "info": result}
+    return result, True
+
+
+def _iter_local_infos_min(server_store, package_refs):
+    """ Generator of the (package_id, info) of the [(package_id, ref)] packages. The infos are
+    read from the per recipe revision packages index, that is updated with the packages whose
+    conaninfo.txt changed since they were indexed
+    """
+    indexes = {}
+    modified = set()
+    try:
+        for package_id, ref in package_refs:
+            pref = PackageReference(ref, package_id)
+            if ref not in indexes:
+                indexes[ref] = _load_packages_index(server_store.packages(ref))
+            try:
+                info, updated = _package_info_min(server_store, pref, indexes[ref])
             except Exception as exc:  # FIXME: Too wide
                 logger.error("Package %s has no ConanInfo file" % str(pref))
                 if str(exc):
                     logger.error(str(exc))
-    return result
+                continue
+            if updated:
+                modified.add(ref)
+            yield package_id, info
+    finally:
+        for ref in modified:
+            _save_packages_index(server_store.packages(ref), indexes[ref])
 
 
-def search_packages(server_store, ref, query, look_in_all_rrevs):
-    """
-    Used both for v1 and v2. V1 will iterate rrevs.
+def _get_local_infos_min(server_store, ref, look_in_all_rrevs):
+    package_refs = _get_package_refs(server_store, ref, look_in_all_rrevs)
+    return dict(_iter_local_infos_min(server_store, package_refs))
 
-    Return a dict like this:
 
-            {package_ID: {name: "OpenCV",
-                           version: "2.14",
-                           settings: {os: Windows}}}
-    param ref: ConanFileReference object
-    """
+def _check_recipe(server_store, ref, look_in_all_rrevs):
     if not look_in_all_rrevs and ref.revision is None:
         found_ref = server_store.get_last_revision(ref)
         if found_ref is None:
@@ -69,11 +129,44 @@ def search_packages(server_store, ref, query, look_in_all_rrevs):
 
     if not os.path.exists(server_store.conan_revisions_root(ref.copy_clear_rev())):
         raise RecipeNotFoundException(ref)
+    return ref
+
+
+def search_packages(server_store, ref, query, look_in_all_rrevs):
+    """
+    Used both for v1 and v2. V1 will iterate rrevs.
+
+    Return a dict like this:
+
+            {package_ID: {name: "OpenCV",
+                           version: "2.14",
+                           settings: {os: Windows}}}
+    param ref: ConanFileReference object
+    """
+    ref = _check_recipe(server_store, ref, look_in_all_rrevs)
     infos = _get_local_infos_min(server_store, ref, look_in_all_rrevs)
     assert query is None, "The server is not filtering packages remotely anymore"
     return infos
 
 
+def search_packages_page(server_store, ref, page, page_size):
+    """ search_packages() of the recipe revision (the latest one if not specified), for the
+    page 'page' (from 1) of 'page_size' packages sorted by package_id, or all of them if
+    page_size is None.
+
+    Returns (infos, more), 'infos' a generator of (package_id, info), that loads the infos as
+    they are iterated, and 'more' True if there are more pages
+    """
+    ref = _check_recipe(server_store, ref, look_in_all_rrevs=False)
+    package_refs = _get_package_refs(server_store, ref, look_in_all_rrevs=False)
+    more = False
+    if page_size is not None:
+        start = (page - 1) * page_size
+        more = len(package_refs) > start + page_size
+        package_refs = package_refs[start:start + page_size]
+    return _iter_local_infos_min(server_store, package_refs), more
+
+
 class SearchService(object):
 
     def __init__(self, authorizer, server_store, auth_user):
@@ -87,6 +180,13 @@ class SearchService(object):
         info = search_packages(self._server_store, reference, query, look_in_all_rrevs)
         return info
 
+    def search_packages_page(self, reference, query, page=1, page_size=None):
+        """ Paginated search_packages() of the v2 API, returns (infos, more)
+        """
+        self._authorizer.check_read_conan(self._auth_user, reference)
+        assert query is None, "The server is not filtering packages remotely anymore"
+        return search_packages_page(self._server_store, reference, page, page_size)
+
     def _search_recipes(self, pattern=None, ignorecase=True):
         subdirs = list_folder_subdirs(basedir=self._server_store.store, level=5)
         if not pattern:
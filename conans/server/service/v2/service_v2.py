@@ -1,12 +1,16 @@
+import hashlib
 import os
 
-from bottle import FileUpload, static_file
+from bottle import FileUpload
 
-from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException
+from conans.errors import RecipeNotFoundException, PackageNotFoundException, NotFoundException, \
+    ForbiddenException, AuthenticationException
+from conans.paths import CONANINFO
+from conans.server.rest.controller.common.conditional import file_response
 from conans.server.service.common.common import CommonService
 from conans.server.service.mime import get_mime_type
 from conans.server.store.server_store import ServerStore
-from conans.util.files import mkdir
+from conans.util.files import load, mkdir
 
 
 class ConanServiceV2(CommonService):
@@ -32,8 +36,7 @@ class ConanServiceV2(CommonService):
     def get_conanfile_file(self, reference, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, reference)
         path = self._server_store.get_conanfile_file_path(reference, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_response(path)
 
     def upload_recipe_file(self, body, headers, reference, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, reference)
@@ -75,6 +78,36 @@ class ConanServiceV2(CommonService):
         return tmp
 
     # PACKAGE METHODS
+    def get_packages_info(self, prefs, auth_user):
+        """ For every pref, the (pref with revisions, conaninfo.txt contents) of the given or the
+        latest package revision, or None if it doesn't exist. The packages the user cannot read are
+        not returned
+        """
+        ret = {}
+        for pref in prefs:
+            try:
+                self._authorizer.check_read_conan(auth_user, pref.ref)
+            except (ForbiddenException, AuthenticationException):
+                continue
+            ret[pref] = self._get_package_info(pref)
+        return ret
+
+    def _get_package_info(self, pref):
+        if not pref.ref.revision:
+            latest = self._server_store.get_last_revision(pref.ref)
+            if not latest:
+                return None
+            pref = pref.copy_with_revs(latest.revision, pref.revision)
+        if not pref.revision:
+            latest = self._server_store.get_last_package_revision(pref)
+            if not latest:
+                return None
+            pref = pref.copy_with_revs(pref.ref.revision, latest.revision)
+        path = self._server_store.get_package_file_path(pref, CONANINFO)
+        if not self._server_store.path_exists(path):
+            return None
+        return pref, load(path)
+
     def get_package_file_list(self, pref, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
         file_list = self._server_store.get_package_file_list(pref)
@@ -86,8 +119,7 @@ class ConanServiceV2(CommonService):
     def get_package_file(self, pref, filename, auth_user):
         self._authorizer.check_read_conan(auth_user, pref.ref)
         path = self._server_store.get_package_file_path(pref, filename)
-        return static_file(os.path.basename(path), root=os.path.dirname(path),
-                           mimetype=get_mime_type(path))
+        return self._file_response(path)
 
     def upload_package_file(self, body, headers, pref, filename, auth_user):
         self._authorizer.check_write_conan(auth_user, pref.ref)
@@ -104,8 +136,7 @@ class ConanServiceV2(CommonService):
         self._server_store.update_last_package_revision(pref)
 
     # Misc
-    @staticmethod
-    def _upload_to_path(body, headers, path):
+    def _upload_to_path(self, body, headers, path):
         file_saver = FileUpload(body, None,
                                 filename=os.path.basename(path),
                                 headers=headers)
@@ -113,4 +144,23 @@ class ConanServiceV2(CommonService):
             os.unlink(path)
         if not os.path.exists(os.path.dirname(path)):
             mkdir(os.path.dirname(path))
-        file_saver.save(os.path.dirname(path))
+        # Same as FileUpload.save(), computing the md5 of the file while it is written, so the
+        # snapshots don't need to read it again
+        md5 = hashlib.md5()
+        offset = file_saver.file.tell()
+        with open(path, "wb") as f:
+            while True:
+                chunk = file_saver.file.read(2 ** 16)
+                if not chunk:
+                    break
+                f.write(chunk)
+                md5.update(chunk)
+        file_saver.file.seek(offset)
+        self._server_store.save_file_checksum(path, md5.hexdigest())
+
+    def _file_response(self, path):
+        try:
+            checksum = self._server_store.get_file_checksum(path)
+        except OSError:  # Not found, the response will say it
+            checksum = None
+        return file_response(path, mimetype=get_mime_type(path), checksum=checksum)
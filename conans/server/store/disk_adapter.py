@@ -1,10 +1,75 @@
+import json
 import os
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
 
 import fasteners
 
 from conans.client.tools.env import no_op
 from conans.errors import NotFoundException
-from conans.util.files import md5sum, path_exists, relative_dirs, rmdir
+from conans.util.files import load, md5sum, path_exists, relative_dirs, rmdir
+from conans.util.log import logger
+
+# Checksums of the files of every folder, so they are not computed in every snapshot request
+CHECKSUMS_FILE = ".checksums.json"
+_checksums_locks = {}  # Shared by all the adapters, the path defines the mutex
+
+
+def _file_stamp(stats):
+    """ identifies the contents of a stored file, they are replaced, never modified in place
+    """
+    return [stats.st_ino, stats.st_size, stats.st_mtime_ns]
+
+
+def _load_checksums(folder):
+    try:
+        return json.loads(load(os.path.join(folder, CHECKSUMS_FILE)))
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+@contextmanager
+def _checksums_lock(folder):
+    """ The file lock doesn't exclude the threads of the same process (threaded server workers),
+    so they are also excluded with a thread lock, acquired first
+    """
+    path = os.path.join(folder, CHECKSUMS_FILE)
+    thread_lock = _checksums_locks.setdefault(path, threading.Lock())
+    with thread_lock:
+        with fasteners.InterProcessLock(path + ".lock", logger=logger):
+            yield
+
+
+def _update_checksums(folder, entries=None, removed=None):
+    """ Adds the 'entries' {name: entry} and removes the 'removed' names of the checksums file
+    """
+    with _checksums_lock(folder):
+        checksums = _load_checksums(folder)
+        modified = False
+        for name, entry in (entries or {}).items():
+            checksums[name] = entry
+            modified = True
+        for name in removed or []:
+            modified = checksums.pop(name, None) is not None or modified
+        if modified:
+            _save_checksums(folder, checksums)
+
+
+def _save_checksums(folder, checksums):
+    """ Written in a temporary file and renamed, concurrent readers never see partial contents
+    """
+    path = os.path.join(folder, CHECKSUMS_FILE)
+    tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+    try:
+        with open(tmp, "w") as f:
+            json.dump(checksums, f)
+        os.replace(tmp, path)
+    except (IOError, OSError) as e:
+        logger.debug("SERVER CHECKSUMS: Cannot save '%s': %s" % (path, str(e)))
+        if os.path.exists(tmp):
+            os.remove(tmp)
 
 
 class ServerDiskAdapter(object):
@@ -59,7 +124,8 @@ class ServerDiskAdapter(object):
     def _get_paths(self, absolute_path, files_subset):
         if not path_exists(absolute_path, self._store_folder):
             raise NotFoundException("")
-        paths = relative_dirs(absolute_path)
+        paths = [path for path in relative_dirs(absolute_path)
+                 if not os.path.basename(path).startswith(CHECKSUMS_FILE)]
         if files_subset is not None:
             paths = set(paths).intersection(set(files_subset))
         abs_paths = [os.path.join(absolute_path, relpath) for relpath in paths]
@@ -68,7 +134,42 @@ class ServerDiskAdapter(object):
     def get_snapshot(self, absolute_path="", files_subset=None):
         """returns a dict with the filepaths and md5"""
         abs_paths = self._get_paths(absolute_path, files_subset)
-        return {filepath: md5sum(filepath) for filepath in abs_paths}
+        return self._get_checksums(abs_paths)
+
+    def get_checksum(self, path):
+        """ md5 of the file in 'path'
+        """
+        return self._get_checksums([path])[path]
+
+    def _get_checksums(self, abs_paths):
+        """ md5 of the files, from the checksums files of their folders. The ones not there yet,
+        or outdated because the file was written again, are computed and stored
+        """
+        by_folder = defaultdict(list)
+        for path in abs_paths:
+            by_folder[os.path.dirname(path)].append(path)
+
+        result = {}
+        for folder, paths in by_folder.items():
+            checksums = _load_checksums(folder)
+            computed = {}
+            for path in paths:
+                name = os.path.basename(path)
+                stamp = _file_stamp(os.stat(path))
+                entry = checksums.get(name)
+                if entry is None or entry.get("stamp") != stamp:
+                    entry = {"md5": md5sum(path), "stamp": stamp}
+                    computed[name] = entry
+                result[path] = entry["md5"]
+            if computed:
+                _update_checksums(folder, entries=computed)
+        return result
+
+    def save_checksum(self, path, md5):
+        """ Stores the md5 of a file just written, computed while writing it
+        """
+        entry = {"md5": md5, "stamp": _file_stamp(os.stat(path))}
+        _update_checksums(os.path.dirname(path), entries={os.path.basename(path): entry})
 
     def get_file_list(self, absolute_path="", files_subset=None):
         abs_paths = self._get_paths(absolute_path, files_subset)
@@ -85,6 +186,9 @@ class ServerDiskAdapter(object):
         if not path_exists(path, self._store_folder):
             raise NotFoundException("")
         os.remove(path)
+        folder = os.path.dirname(path)
+        if os.path.exists(os.path.join(folder, CHECKSUMS_FILE)):
+            _update_checksums(folder, removed=[os.path.basename(path)])
 
     def path_exists(self, path):
         return os.path.exists(path)
@@ -95,9 +199,18 @@ class ServerDiskAdapter(object):
                 return f.read()
 
     def write_file(self, path, contents, lock_file):
+        """ Written in a temporary file and renamed, so the written file is always a new one
+        (a new inode), and the readers validating their cached contents with stat() detect it
+        """
         with fasteners.InterProcessLock(lock_file) if lock_file else no_op():
-            with open(path, "w") as f:
-                f.write(contents)
+            tmp = "%s.%s.tmp" % (path, uuid.uuid4().hex)
+            try:
+                with open(tmp, "w") as f:
+                    f.write(contents)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
 
     def base_storage_folder(self):
         return self._store_folder
@@ -1,4 +1,6 @@
 import os
+import threading
+from collections import OrderedDict
 from os.path import join, normpath, relpath
 
 from conans import DEFAULT_REVISION_V1
@@ -8,13 +10,52 @@ from conans.paths import EXPORT_FOLDER, PACKAGES_FOLDER
 from conans.server.revision_list import RevisionList
 
 REVISIONS_FILE = "revisions.txt"
+# Maximum number of revisions.txt files kept parsed in memory
+REVISIONS_CACHE_SIZE = 4096
+
+
+class _RevisionsCache(object):
+    """ LRU of the parsed RevisionList of the revisions.txt files. Every entry is stored with the
+    stat() of the file when it was read, and it is discarded if the file changed since then
+    (written by other process or removed), so it is always coherent with the disk. The cached
+    RevisionList objects are shared, they must not be modified
+    """
+
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, stamp):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != stamp:
+                return None
+            self._entries.move_to_end(path)
+            return entry[1]
+
+    def put(self, path, stamp, rev_list):
+        with self._lock:
+            self._entries[path] = (stamp, rev_list)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+def _file_stamp(path):
+    stats = os.stat(path)
+    return stats.st_ino, stats.st_size, stats.st_mtime_ns
 
 
 class ServerStore(object):
+    # The file locks don't exclude the threads of the same process (threaded server workers),
+    # the read-modify-write of every revisions file is also protected with a thread lock
+    _revisions_locks = {}  # Needs to be shared among all instances
 
-    def __init__(self, storage_adapter):
+    def __init__(self, storage_adapter, revisions_cache_size=REVISIONS_CACHE_SIZE):
         self._storage_adapter = storage_adapter
         self._store_folder = storage_adapter._store_folder
+        self._revisions_cache = _RevisionsCache(revisions_cache_size)
 
     @property
     def store(self):
@@ -73,6 +114,12 @@ class ServerStore(object):
         path = self.package(pref)
         return self._get_snapshot_of_files(path)
 
+    def get_file_checksum(self, path):
+        return self._storage_adapter.get_checksum(path)
+
+    def save_file_checksum(self, path, md5):
+        self._storage_adapter.save_checksum(path, md5)
+
     def _get_snapshot_of_files(self, relative_path):
         snapshot = self._storage_adapter.get_snapshot(relative_path)
         snapshot = self._relativize_keys(snapshot, relative_path)
@@ -198,8 +245,8 @@ class ServerStore(object):
         """Get the download urls for the whole relative_path or just
         for a subset of files. files_subset has to be a list with paths
         relative to relative_path"""
-        relative_snap = self._storage_adapter.get_snapshot(relative_path, files_subset)
-        urls = self._storage_adapter.get_download_urls(list(relative_snap.keys()), user)
+        abs_paths = self._storage_adapter.get_file_list(relative_path, files_subset)
+        urls = self._storage_adapter.get_download_urls(abs_paths, user)
         urls = self._relativize_keys(urls, relative_path)
         return urls
 
@@ -253,18 +300,27 @@ class ServerStore(object):
         rev_file_path = self._package_revisions_file(pref)
         self._update_last_revision(rev_file_path, pref)
 
+    @staticmethod
+    def _revisions_lock(rev_file_path):
+        return ServerStore._revisions_locks.setdefault(rev_file_path, threading.Lock())
+
     def _update_last_revision(self, rev_file_path, ref):
-        if self._storage_adapter.path_exists(rev_file_path):
-            rev_file = self._storage_adapter.read_file(rev_file_path,
-                                                       lock_file=rev_file_path + ".lock")
-            rev_list = RevisionList.loads(rev_file)
-        else:
-            rev_list = RevisionList()
+        """ Makes 'ref.revision' the latest one, with the current time. If it is already the
+        latest one, its time is kept, like RevisionList.add_revision() does, so the uploads of
+        an existing revision (e.g. upload --force) don't change its time
+        """
         if ref.revision is None:
             raise ConanException("Invalid revision for: %s" % ref.full_str())
-        rev_list.add_revision(ref.revision)
-        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                         lock_file=rev_file_path + ".lock")
+        with self._revisions_lock(rev_file_path):
+            rev_list = self._get_revisions_list(rev_file_path)
+            latest = rev_list.latest_revision()
+            if latest and latest.revision == ref.revision:
+                # Every uploaded file updates the revision, only the first one has to write it,
+                # the file wouldn't change
+                return
+            rev_list = rev_list.copy()
+            rev_list.add_revision(ref.revision)
+            self._write_revisions_list(rev_file_path, rev_list)
 
     def get_package_revisions(self, pref):
         """Returns a RevisionList"""
@@ -281,13 +337,32 @@ class ServerStore(object):
         return ret
 
     def _get_revisions_list(self, rev_file_path):
-        if self._storage_adapter.path_exists(rev_file_path):
+        try:
+            return self._read_revisions_list(rev_file_path)
+        except (IOError, OSError):
+            return RevisionList()
+
+    def _read_revisions_list(self, rev_file_path):
+        """ The RevisionList of the file, from the cache if the file didn't change. It raises
+        IOError if it doesn't exist. The returned RevisionList must not be modified
+        """
+        stamp = _file_stamp(rev_file_path)
+        rev_list = self._revisions_cache.get(rev_file_path, stamp)
+        if rev_list is None:
             rev_file = self._storage_adapter.read_file(rev_file_path,
                                                        lock_file=rev_file_path + ".lock")
             rev_list = RevisionList.loads(rev_file)
-            return rev_list
-        else:
-            return RevisionList()
+            # If the file was written after the stat() the next call will read it again
+            self._revisions_cache.put(rev_file_path, stamp, rev_list)
+        return rev_list
+
+    def _write_revisions_list(self, rev_file_path, rev_list):
+        self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
+                                         lock_file=rev_file_path + ".lock")
+        try:
+            self._revisions_cache.put(rev_file_path, _file_stamp(rev_file_path), rev_list)
+        except (IOError, OSError):
+            pass
 
     def _get_latest_revision(self, rev_file_path):
         rev_list = self._get_revisions_list(rev_file_path)
@@ -297,8 +372,8 @@ class ServerStore(object):
             if self.path_exists(os.path.join(os.path.dirname(rev_file_path), DEFAULT_REVISION_V1)):
                 rev_list = RevisionList()
                 rev_list.add_revision(DEFAULT_REVISION_V1)
-                self._storage_adapter.write_file(rev_file_path, rev_list.dumps(),
-                                                 lock_file=rev_file_path + ".lock")
+                with self._revisions_lock(rev_file_path):
+                    self._write_revisions_list(rev_file_path, rev_list)
                 return rev_list.latest_revision()
             else:
                 return None
@@ -330,29 +405,21 @@ class ServerStore(object):
         return rev_list.get_time(pref.revision)
 
     def _remove_revision_from_index(self, ref):
-        rev_list = self._load_revision_list(ref)
-        rev_list.remove_revision(ref.revision)
-        self._save_revision_list(rev_list, ref)
+        rev_file_path = self._recipe_revisions_file(ref)
+        with self._revisions_lock(rev_file_path):
+            rev_list = self._load_revision_list(ref).copy()
+            rev_list.remove_revision(ref.revision)
+            self._write_revisions_list(rev_file_path, rev_list)
 
     def _remove_package_revision_from_index(self, pref):
-        rev_list = self._load_package_revision_list(pref)
-        rev_list.remove_revision(pref.revision)
-        self._save_package_revision_list(rev_list, pref)
+        rev_file_path = self._package_revisions_file(pref)
+        with self._revisions_lock(rev_file_path):
+            rev_list = self._load_package_revision_list(pref).copy()
+            rev_list.remove_revision(pref.revision)
+            self._write_revisions_list(rev_file_path, rev_list)
 
     def _load_revision_list(self, ref):
-        path = self._recipe_revisions_file(ref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
-
-    def _save_revision_list(self, rev_list, ref):
-        path = self._recipe_revisions_file(ref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
-
-    def _save_package_revision_list(self, rev_list, pref):
-        path = self._package_revisions_file(pref)
-        self._storage_adapter.write_file(path, rev_list.dumps(), lock_file=path + ".lock")
+        return self._read_revisions_list(self._recipe_revisions_file(ref))
 
     def _load_package_revision_list(self, pref):
-        path = self._package_revisions_file(pref)
-        rev_file = self._storage_adapter.read_file(path, lock_file=path + ".lock")
-        return RevisionList.loads(rev_file)
+        return self._read_revisions_list(self._package_revisions_file(pref))
@@ -0,0 +1,117 @@
+import os
+import unittest
+
+from mock import patch
+
+from conans.client.cache.cache import CACHE_INDEX_FILE
+from conans.model.info import ConanInfo
+from conans.model.ref import ConanFileReference
+from conans.test.utils.tools import TestClient, GenConanfile
+from conans.util.files import rmdir
+
+
+class CacheIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient(default_server_user=True)
+        self.client.save({"conanfile.py": GenConanfile().with_option("shared", [True, False])
+                                                        .with_default_option("shared", False)})
+        self.client.run("create . pkg/0.1@")
+        self.client.run("create . other/0.1@user/channel")
+        self.index_path = os.path.join(self.client.cache.store, CACHE_INDEX_FILE)
+
+    def _enable(self):
+        self.client.run("config set general.cache_index=True")
+
+    def _indexed_refs(self):
+        return sorted(str(ref) for ref in self.client.cache.cache_index.refs())
+
+    def _indexed_packages(self, ref):
+        return len(self.client.cache.cache_index.package_ids(ConanFileReference.loads(ref)))
+
+    def test_created_from_folders(self):
+        self.assertFalse(os.path.exists(self.index_path))
+        self._enable()
+        self.client.run("search")
+        self.assertTrue(os.path.exists(self.index_path))
+        self.assertIn("other/0.1@user/channel", self.client.out)
+        self.assertIn("pkg/0.1", self.client.out)
+        self.assertEqual(["other/0.1@user/channel", "pkg/0.1"], self._indexed_refs())
+        self.assertEqual(1, self._indexed_packages("pkg/0.1"))
+
+    def test_updated(self):
+        self._enable()
+        self.client.run("create . pkg/0.1@ -o pkg:shared=True")
+        self.client.run("export . new/0.1@")
+        self.assertEqual(["new/0.1", "other/0.1@user/channel", "pkg/0.1"], self._indexed_refs())
+        self.assertEqual(2, self._indexed_packages("pkg/0.1"))
+        self.assertEqual(0, self._indexed_packages("new/0.1"))
+
+        self.client.run("remove pkg/0.1@ -q shared=True -f")
+        self.assertEqual(1, self._indexed_packages("pkg/0.1"))
+        self.client.run("remove other* -f")
+        self.assertEqual(["new/0.1", "pkg/0.1"], self._indexed_refs())
+        self.assertEqual(0, self._indexed_packages("other/0.1@user/channel"))
+
+        self.client.run("upload pkg/0.1@ --all --confirm")
+        self.client.run("remove pkg* -f")
+        self.assertEqual(["new/0.1"], self._indexed_refs())
+        self.client.run("install pkg/0.1@")
+        self.assertEqual(["new/0.1", "pkg/0.1"], self._indexed_refs())
+        self.assertEqual(1, self._indexed_packages("pkg/0.1"))
+
+    def test_search_packages(self):
+        self._enable()
+        self.client.run("create . pkg/0.1@ -o pkg:shared=True")
+        infos = self.client.cache.cache_index.package_infos(ConanFileReference.loads("pkg/0.1"))
+        self.assertEqual(["False", "True"],
+                         sorted(info["options"]["shared"] for info in infos.values()))
+        with patch.object(ConanInfo, "loads", side_effect=AssertionError("conaninfo loaded")):
+            self.client.run("search pkg/0.1@ -q shared=True")
+            self.assertIn("shared: True", self.client.out)
+            self.assertNotIn("shared: False", self.client.out)
+            self.client.run("search pkg/0.1@ -q 'shared=False OR os=Linux'")
+            self.assertIn("shared: False", self.client.out)
+            self.assertNotIn("shared: True", self.client.out)
+            self.client.run("search pkg/0.1@ -q os=None")
+            self.assertIn("shared: False", self.client.out)
+            self.assertIn("shared: True", self.client.out)
+
+    def test_copy_packages(self):
+        # The packages copied without indexing them are found and indexed
+        self._enable()
+        self.client.run("search")
+        self.client.run("copy other/0.1@user/channel other/testing --all")
+        self.client.run("search other/0.1@other/testing")
+        self.assertIn("shared: False", self.client.out)
+        self.assertEqual(1, self._indexed_packages("other/0.1@other/testing"))
+        self.client.run("search other/0.1@other/testing -q shared=False")
+        self.assertIn("shared: False", self.client.out)
+        self.client.run("remove other/0.1@other/testing -q shared=False -f")
+        self.assertEqual(0, self._indexed_packages("other/0.1@other/testing"))
+
+    def test_rebuild(self):
+        self._enable()
+        self.client.run("search")
+        # Removing the folders outside Conan doesn't update the index
+        ref = ConanFileReference.loads("pkg/0.1")
+        rmdir(self.client.cache.package_layout(ref).base_folder())
+        self.client.run("search")
+        self.assertIn("pkg/0.1", self.client.out)
+        self.client.run("cache rebuild-index")
+        self.assertIn("Cache index rebuilt: 1 recipes", self.client.out)
+        self.client.run("search")
+        self.assertNotIn("pkg/0.1", self.client.out)
+
+    def test_disabled(self):
+        self.client.run("cache rebuild-index", assert_error=True)
+        self.assertIn("The cache index is not enabled", self.client.out)
+        self._enable()
+        self.client.run("search")
+        self.client.run("config set general.cache_index=False")
+        self.client.run("remove pkg* -f")
+        self.assertFalse(os.path.exists(self.index_path))
+        self._enable()
+        self.client.run("search")
+        self.assertIn("other/0.1@user/channel", self.client.out)
+        self.assertNotIn("pkg/0.1", self.client.out)
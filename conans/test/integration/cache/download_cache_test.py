@@ -6,9 +6,11 @@ from collections import Counter
 from threading import Thread
 
 from bottle import static_file, request
+from mock import patch
 import pytest
 
 from conans.client.downloaders.cached_file_downloader import CachedFileDownloader
+from conans.client.tools import environment_append
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import TestClient, StoppableThreadBottle
@@ -309,7 +311,7 @@ class DownloadCacheTest(unittest.TestCase):
 
 class CachedDownloaderUnitTest(unittest.TestCase):
     def setUp(self):
-        cache_folder = temp_folder()
+        self.cache_folder = cache_folder = temp_folder()
 
         class FakeFileDownloader(object):
             def __init__(self):
@@ -387,3 +389,62 @@ class CachedDownloaderUnitTest(unittest.TestCase):
         self.cached_downloader.download("testurl", file_path)
         self.assertEqual(self.file_downloader.calls["testurl"], 1)
         self.assertEqual("testurl", load(file_path))
+
+    def _cached_files(self):
+        return sorted(f for f in os.listdir(self.cache_folder)
+                      if os.path.isfile(os.path.join(self.cache_folder, f)))
+
+    def test_eviction_lru(self):
+        with environment_append({"CONAN_DOWNLOAD_CACHE_MAX_SIZE": "20"}):
+            cached_downloader = CachedFileDownloader(self.cache_folder, self.file_downloader)
+        cached_downloader.download("testurl1")
+        cached_downloader.download("testurl2")
+        self.assertEqual(2, len(self._cached_files()))
+        cached_downloader.download("testurl1")
+        cached_downloader.download("testurl3")  # 24 bytes, the least recently used is evicted
+        self.assertEqual(2, len(self._cached_files()))
+        cached_downloader.download("testurl1")
+        cached_downloader.download("testurl3")
+        self.assertEqual(1, self.file_downloader.calls["testurl1"])
+        self.assertEqual(1, self.file_downloader.calls["testurl3"])
+        cached_downloader.download("testurl2")
+        self.assertEqual(2, self.file_downloader.calls["testurl2"])
+
+    def test_eviction_lfu(self):
+        with environment_append({"CONAN_DOWNLOAD_CACHE_MAX_SIZE": "20",
+                                 "CONAN_DOWNLOAD_CACHE_EVICTION": "lfu"}):
+            cached_downloader = CachedFileDownloader(self.cache_folder, self.file_downloader)
+        cached_downloader.download("testurl1")
+        cached_downloader.download("testurl1")
+        cached_downloader.download("testurl2")
+        cached_downloader.download("testurl3")  # The least frequently used is evicted
+        cached_downloader.download("testurl1")
+        self.assertEqual(1, self.file_downloader.calls["testurl1"])
+        cached_downloader.download("testurl2")
+        self.assertEqual(2, self.file_downloader.calls["testurl2"])
+
+    def test_not_evicted_in_use(self):
+        with environment_append({"CONAN_DOWNLOAD_CACHE_MAX_SIZE": "1"}):
+            cached_downloader = CachedFileDownloader(self.cache_folder, self.file_downloader)
+        cached_downloader.download("testurl1")
+        self.assertEqual([], self._cached_files())
+        h = cached_downloader._get_hash("testurl2")
+        with cached_downloader._lock(h):
+            save(os.path.join(self.cache_folder, h), "testurl2")
+            cached_downloader._index.touch(h, 8)
+            self.assertFalse(cached_downloader._try_remove(h))
+        cached_downloader._evict()
+        self.assertEqual([], self._cached_files())
+
+    def test_hardlinks(self):
+        folder = temp_folder()
+        tgz_path = os.path.join(folder, "conan_package.tgz")
+        file_path = os.path.join(folder, "conanfile.py")
+        with patch("conans.client.downloaders.cached_file_downloader.reflink",
+                   return_value=False):
+            self.cached_downloader.download("testurl", tgz_path)
+            self.cached_downloader.download("testurl", file_path)
+        cached_path = os.path.join(self.cache_folder, self._cached_files()[0])
+        self.assertTrue(os.path.samefile(cached_path, tgz_path))
+        self.assertFalse(os.path.samefile(cached_path, file_path))
+        self.assertEqual("testurl", load(file_path))
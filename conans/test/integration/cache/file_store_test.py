@@ -0,0 +1,80 @@
+import os
+import textwrap
+import unittest
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.test.utils.tools import TestClient
+from conans.util.files import load
+
+
+class FileStoreTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        from conans import ConanFile
+        class Pkg(ConanFile):
+            options = {"shared": [True, False]}
+            default_options = {"shared": False}
+            exports_sources = "*"
+            def package(self):
+                self.copy("*.h", dst="include")
+                self.copy("*.sh", dst="bin")
+                self.output.info("LIB: %s" % self.options.shared)
+                with open(self.package_folder + "/lib.txt", "w") as f:
+                    f.write("shared=%s" % self.options.shared)
+        """)
+
+    def setUp(self):
+        self.client = TestClient(default_server_user=True)
+        self.client.run("config set general.content_store=True")
+        self.client.save({"conanfile.py": self.conanfile,
+                          "header.h": "header",
+                          "script.sh": "script"})
+        os.chmod(os.path.join(self.client.current_folder, "script.sh"), 0o755)
+        self.client.run("create . pkg/0.1@")
+        self.client.run("create . pkg/0.1@ -o pkg:shared=True")
+        self.ref = ConanFileReference.loads("pkg/0.1")
+
+    def _package_folders(self):
+        layout = self.client.cache.package_layout(self.ref)
+        return [layout.package(PackageReference(self.ref, package_id))
+                for package_id in sorted(layout.package_ids())]
+
+    def _check_dedup(self):
+        folders = self._package_folders()
+        self.assertEqual(2, len(folders))
+        headers = [os.path.join(f, "include", "header.h") for f in folders]
+        self.assertEqual(["header", "header"], [load(h) for h in headers])
+        self.assertTrue(os.path.samefile(headers[0], headers[1]))
+        scripts = [os.path.join(f, "bin", "script.sh") for f in folders]
+        self.assertTrue(os.path.samefile(scripts[0], scripts[1]))
+        self.assertTrue(os.access(scripts[0], os.X_OK))
+        libs = [os.path.join(f, "lib.txt") for f in folders]
+        self.assertEqual(["shared=False", "shared=True"], sorted(load(f) for f in libs))
+        self.assertFalse(os.path.samefile(libs[0], libs[1]))
+
+    def test_created_packages_dedup(self):
+        self._check_dedup()
+
+    def test_downloaded_packages_dedup(self):
+        self.client.run("upload * --all --confirm")
+        self.client.run("remove * -f")
+        self.client.run("install pkg/0.1@")
+        self.client.run("install pkg/0.1@ -o pkg:shared=True")
+        self._check_dedup()
+        self.client.run("remove * -f")
+        self.client.run("config set general.stream_downloads=True")
+        self.client.run("install pkg/0.1@")
+        self.client.run("install pkg/0.1@ -o pkg:shared=True")
+        self._check_dedup()
+
+    def test_remove_unused(self):
+        objects_folder = os.path.join(self.client.cache.store, ".objects")
+
+        def stored_files():
+            return sorted(f for d in os.listdir(objects_folder)
+                          for f in os.listdir(os.path.join(objects_folder, d)))
+
+        self.assertEqual(4, len(stored_files()))  # header, script and the 2 lib.txt
+        self.client.run("remove pkg/0.1@ -f -q shared=True")
+        self.assertEqual(3, len(stored_files()))
+        self.client.run("remove * -f")
+        self.assertEqual([], stored_files())
@@ -1,5 +1,15 @@
+import os
+import platform
+import textwrap
 import unittest
 
+import pytest
+from mock import patch
+
+from conans.client.graph.proxy import ConanProxy
+from conans.client.tools import environment_append
+from conans.model.ref import ConanFileReference
+from conans.test.utils.test_files import temp_folder
 from conans.test.utils.tools import GenConanfile, TestClient
 
 
@@ -28,3 +38,156 @@ class InstallParallelTest(unittest.TestCase):
         self.assertIn("Downloading binary packages in %s parallel threads" % threads, client.out)
         for i in range(counter):
             self.assertIn("pkg%s/0.1@user/testing: Package installed" % i, client.out)
+
+    def test_parallel_recipes_download(self):
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        for i in range(3):
+            client.run("create . pkg%s/0.1@user/testing" % i)
+        client.save({"conanfile.py": GenConanfile().with_require("pkg0/0.1@user/testing")})
+        client.run("create . pkg3/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+
+        client.run("config set general.parallel_download=4")
+        conanfile_txt = "[requires]\n" + "\n".join("pkg%s/0.1@user/testing" % i
+                                                   for i in (3, 0, 1, 2))
+        client.save({"conanfile.txt": conanfile_txt}, clean_first=True)
+        client.run("install .")
+        for i in range(4):
+            self.assertIn("pkg%s/0.1@user/testing from 'default' - Downloaded" % i, client.out)
+            self.assertEqual(1, str(client.out).count("pkg%s/0.1@user/testing: Downloaded recipe "
+                                                 "revision" % i))
+
+    def test_parallel_recipes_download_chain(self):
+        # The recipes of the next levels are prefetched too, before expanding the first one
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": GenConanfile()})
+        client.run("create . pkg0/0.1@user/testing")
+        for i in (1, 2):
+            conanfile = GenConanfile().with_require("pkg%s/0.1@user/testing" % (i - 1))
+            client.save({"conanfile.py": conanfile})
+            client.run("create . pkg%s/0.1@user/testing" % i)
+        client.run("upload * --all --confirm")
+        client.run("remove * -f")
+
+        client.run("config set general.parallel_download=4")
+        last_layout = client.cache.package_layout(ConanFileReference.loads("pkg0/0.1@user/testing"))
+        in_cache = []
+        get_recipe = ConanProxy.get_recipe
+
+        def _get_recipe(proxy, ref, *args, **kwargs):
+            in_cache.append(os.path.exists(last_layout.conanfile()))
+            return get_recipe(proxy, ref, *args, **kwargs)
+
+        with patch.object(ConanProxy, "get_recipe", _get_recipe):
+            client.run("install pkg2/0.1@user/testing")
+        self.assertEqual([True, True, True], in_cache)
+        for i in range(3):
+            self.assertEqual(1, str(client.out).count("pkg%s/0.1@user/testing: Downloaded recipe "
+                                                 "revision" % i))
+
+
+@pytest.mark.skipif(platform.system() != "Linux", reason="Parallel builds only in Linux")
+class InstallParallelBuildsTest(unittest.TestCase):
+    # Every build waits until the build of the other independent package has started
+    conanfile = textwrap.dedent("""
+        import os, time
+        from conans import ConanFile
+        from conans.errors import ConanException
+
+        class Pkg(ConanFile):
+            def build(self):
+                folder = os.environ["SYNC_FOLDER"]
+                open(os.path.join(folder, self.name), "w").close()
+                other = "pkgb" if self.name == "pkga" else "pkga"
+                for _ in range(100):
+                    if os.path.exists(os.path.join(folder, other)):
+                        break
+                    time.sleep(0.1)
+                else:
+                    raise ConanException("{} not built in parallel".format(other))
+                if os.environ.get("PKGB_FAIL"):
+                    failed = os.path.join(folder, "pkgb_failed")
+                    if self.name == "pkgb":
+                        open(failed, "w").close()
+                        raise ConanException("PKGB FAILED")
+                    # Finishes after the failed job, so no new build should start
+                    for _ in range(100):
+                        if os.path.exists(failed):
+                            break
+                        time.sleep(0.1)
+                    time.sleep(2)
+                self.output.info("BUILT {}".format(self.name))
+
+            def package_info(self):
+                self.cpp_info.defines = [self.name.upper()]
+        """)
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.save({"conanfile.py": self.conanfile,
+                          "pkgc/conanfile.py": GenConanfile().with_require("pkga/0.1")})
+        self.client.run("export . pkga/0.1@")
+        self.client.run("export . pkgb/0.1@")
+        self.client.run("export pkgc pkgc/0.1@")
+        self.client.save({"conanfile.txt": "[requires]\npkgb/0.1\npkgc/0.1"}, clean_first=True)
+        self.client.run("config set general.parallel_builds=2")
+
+    def test_parallel_builds(self):
+        with environment_append({"SYNC_FOLDER": temp_folder()}):
+            self.client.run("install . --build=missing")
+        out = str(self.client.out)
+        for name in ("pkga", "pkgb", "pkgc"):
+            self.assertIn("%s/0.1: Building package in a parallel job" % name, out)
+        # The output of every build is written together when it finishes
+        for name in ("pkga", "pkgb"):
+            build_output = out[out.index("%s/0.1: Building your package" % name):]
+            self.assertTrue(build_output.startswith("%s/0.1: Building your package in " % name))
+            lines = build_output.splitlines()[:6]
+            self.assertTrue(all(line.startswith("%s/0.1: " % name) for line in lines), lines)
+            self.assertIn("%s/0.1: BUILT %s" % (name, name), out)
+        # pkgc is built after pkga and has its information
+        self.assertLess(out.index("pkga/0.1: Package '"), out.index("pkgc/0.1: Building package"))
+        conanbuildinfo = self.client.load("conanbuildinfo.txt")
+        self.assertIn("[defines_pkga]\nPKGA", conanbuildinfo)
+        self.assertIn("[defines_pkgb]\nPKGB", conanbuildinfo)
+
+        self.client.run("install .")
+        self.assertIn("pkgc/0.1: Already installed!", self.client.out)
+
+    def test_parallel_builds_error(self):
+        with environment_append({"SYNC_FOLDER": temp_folder(), "PKGB_FAIL": "1"}):
+            self.client.run("install . --build=missing", assert_error=True)
+        self.assertIn("pkgb/0.1: Error in build() method, line", self.client.out)
+        self.assertIn("PKGB FAILED", self.client.out)
+        # The running build finished, but no new build is started
+        self.assertIn("pkga/0.1: BUILT pkga", self.client.out)
+        self.assertNotIn("pkgc/0.1: Building package", self.client.out)
+        self.client.run("install .", assert_error=True)
+        self.assertIn("Missing prebuilt package for 'pkgb/0.1', 'pkgc/0.1'", self.client.out)
+
+    def test_parallel_builds_exports_sources(self):
+        # The jobs download the exports sources of the recipes installed from a remote
+        build = textwrap.indent(textwrap.dedent("""
+            exports_sources = "*.h"
+
+            def build(self):
+                self.output.info("HEADER {}".format(open("header.h").read()))
+            """), "    ")
+        conanfile = self.conanfile.replace("    def build(self):\n", build)
+        client = TestClient(default_server_user=True)
+        client.save({"conanfile.py": conanfile,
+                     "header.h": "contents"})
+        client.run("export . pkga/0.1@")
+        client.run("export . pkgb/0.1@")
+        client.run("upload * --confirm")
+        client.run("remove * -f")
+        client.save({"conanfile.txt": "[requires]\npkga/0.1\npkgb/0.1"}, clean_first=True)
+        client.run("config set general.parallel_builds=2")
+        with environment_append({"SYNC_FOLDER": temp_folder()}):
+            client.run("install . --build=missing")
+        for name in ("pkga", "pkgb"):
+            self.assertIn("%s/0.1: Building package in a parallel job" % name, client.out)
+            self.assertIn("%s/0.1: HEADER contents" % name, client.out)
+            self.assertIn("%s/0.1: BUILT %s" % (name, name), client.out)
@@ -11,11 +11,13 @@ from mock import patch
 import pytest
 
 from conans import DEFAULT_REVISION_V1
+from conans.client.rest.rest_client_v2 import RestV2Methods
 from conans.model.manifest import FileTreeManifest
 from conans.model.package_metadata import PackageMetadata
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO, EXPORT_FOLDER, PACKAGES_FOLDER
 from conans.server.revision_list import RevisionList
+from conans.server.service.common.search import PACKAGES_INDEX_FILE
 from conans.test.utils.tools import TestClient, TestServer, NO_SETTINGS_PACKAGE_ID, GenConanfile
 from conans.util.dates import iso8601_to_str, from_timestamp_to_iso8601
 from conans.util.env_reader import get_env
@@ -1666,3 +1668,34 @@ def test_no_user_channel_error():
     assert "Uploading pkg/1.0 to remote 'default'" in c.out
     assert "user/channel" not in c.out
 
+
+
+def test_search_packages_paginated():
+    c = TestClient(default_server_user=True)
+    c.run("config set general.revisions_enabled=1")
+    c.save({"conanfile.py": GenConanfile("pkg", "0.1").with_option("opt", [1, 2, 3, 4, 5])})
+    for opt in range(1, 6):
+        c.run("create . -o pkg:opt=%s" % opt)
+    c.run("upload pkg/0.1@ --all -c")
+
+    original_json_request = RestV2Methods._json_request
+    with patch("conans.client.rest.rest_client_v2.SEARCH_PACKAGES_PAGE_SIZE", 2):
+        with patch.object(RestV2Methods, "_json_request", autospec=True,
+                          side_effect=original_json_request) as json_request:
+            c.run("search pkg/0.1@ -r=default")
+    urls = [call[0][1] for call in json_request.call_args_list if "/search" in call[0][1]]
+    assert ["page_size=2", "page=2&page_size=2", "page=3&page_size=2"] == \
+           [url.split("?")[1] for url in urls]
+    for opt in range(1, 6):
+        assert "opt: %s" % opt in c.out
+
+    # The infos of the packages are indexed in the server
+    ref = ConanFileReference.loads("pkg/0.1")
+    server_store = c.servers["default"].server_store
+    ref = ref.copy_with_rev(server_store.get_last_revision(ref).revision)
+    assert os.path.exists(os.path.join(server_store.packages(ref), PACKAGES_INDEX_FILE))
+    with patch("conans.server.service.common.search.ConanInfo") as conan_info:
+        c.run("search pkg/0.1@ -r=default")
+        assert not conan_info.loads.called
+    for opt in range(1, 6):
+        assert "opt: %s" % opt in c.out
@@ -1,7 +1,9 @@
 # coding=utf-8
 
 import os
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import six
 from mock import Mock, MagicMock
@@ -99,3 +101,52 @@ class ConanRequesterHeadersTests(unittest.TestCase):
         requester.get(url="aaa", headers={"User-Agent": "MyUserAgent"})
         headers = mock_http_requester.get.call_args[1]["headers"]
         self.assertEqual("MyUserAgent", headers["User-Agent"])
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+class ConanRequesterConnectionsTests(unittest.TestCase):
+
+    def test_connections_reused(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            cache = ClientCache(temp_folder(), TestBufferConanOutput())
+            requester = ConanRequester(cache.config)
+            url = "http://127.0.0.1:%s/file" % server.server_address[1]
+            for _ in range(5):
+                self.assertEqual("ok", requester.get(url).text)
+            self.assertEqual({"requests": 5, "connections": 1}, requester.connection_stats())
+            # A forked child process doesn't reuse the connections of the parent
+            requester.reset_connections()
+            self.assertEqual("ok", requester.get(url).text)
+            self.assertEqual({"requests": 1, "connections": 1}, requester.connection_stats())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_max_connections(self):
+        cache = ClientCache(temp_folder(), TestBufferConanOutput())
+        requester = ConanRequester(cache.config)
+        self.assertEqual(32, requester._adapter._pool_maxsize)
+        with environment_append({"CONAN_MAX_CONNECTIONS": "64"}):
+            requester = ConanRequester(cache.config)
+        self.assertEqual(64, requester._adapter._pool_maxsize)
+        with environment_append({"CONAN_MAX_CONNECTIONS": "many"}):
+            with six.assertRaisesRegex(self, ConanException, "Specify a numeric parameter for "
+                                                             "'max_connections'"):
+                ConanRequester(cache.config)
+        self.assertIsNone(ConanRequester(cache.config, MagicMock()).connection_stats())
@@ -7,6 +7,7 @@ from parameterized.parameterized import parameterized
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import EXPORT_SOURCES_TGZ_NAME, EXPORT_SRC_FOLDER, EXPORT_TGZ_NAME
+from conans.server.store.disk_adapter import CHECKSUMS_FILE
 from conans.test.utils.test_files import scan_folder
 from conans.test.utils.tools import NO_SETTINGS_PACKAGE_ID, TestClient, TestServer
 from conans.util.files import load, md5sum, save
@@ -119,7 +120,10 @@ class ExportsSourcesTest(unittest.TestCase):
         server = server or self.server
         rev, _ = server.server_store.get_last_revision(self.ref)
         ref = self.ref.copy_with_rev(rev)
-        self.assertEqual(scan_folder(server.server_store.export(ref)), expected_server)
+        # The server can keep the checksums of the uploaded files next to them
+        server_files = [f for f in scan_folder(server.server_store.export(ref))
+                        if not f.startswith(CHECKSUMS_FILE)]
+        self.assertEqual(server_files, expected_server)
 
     def _check_export_folder(self, mode, export_folder=None, export_src_folder=None):
         if mode == "exports_sources":
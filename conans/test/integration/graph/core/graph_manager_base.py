@@ -52,9 +52,9 @@ class GraphManagerTest(unittest.TestCase):
         generator_manager = GeneratorManager()
         hook_manager = Mock()
         app_type = namedtuple("ConanApp", "cache out remote_manager hook_manager graph_manager"
-                              " binaries_analyzer generator_manager")
+                              " binaries_analyzer generator_manager requester")
         app = app_type(self.cache, self.output, self.remote_manager, hook_manager, self.manager,
-                       binaries, generator_manager)
+                       binaries, generator_manager, Mock())
         return app
 
     def recipe_cache(self, reference, requires=None):
@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from conans.client.cache.cache import GRAPH_SNAPSHOTS_FOLDER
+from conans.test.utils.tools import TestClient, GenConanfile
+
+
+class GraphSnapshotsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.client.run("config set general.graph_snapshot_cache=1")
+        self.client.save({"pkga/conanfile.py": GenConanfile().with_settings("os"),
+                          "pkgb/conanfile.py": GenConanfile().with_require("pkga/[>=0.1]"),
+                          "conanfile.txt": "[requires]\npkgb/[>=0.1]"})
+        self.client.run("create pkga pkga/0.1@ -s os=Linux")
+        self.client.run("create pkgb pkgb/0.1@ -s os=Linux")
+
+    def _snapshots(self):
+        folder = os.path.join(self.client.cache_folder, GRAPH_SNAPSHOTS_FOLDER)
+        return os.listdir(folder) if os.path.exists(folder) else []
+
+    def _install(self, resolved, args="-s os=Linux"):
+        self.client.run("install . %s" % args)
+        if resolved:
+            self.assertIn("Version ranges solved", self.client.out)
+        else:  # Restored from the snapshot
+            self.assertNotIn("Version ranges solved", self.client.out)
+        self.assertIn("pkgb/0.1: Already installed!", self.client.out)
+
+    def test_restored(self):
+        self._install(resolved=True)
+        self.assertEqual(1, len(self._snapshots()))
+        self._install(resolved=False)
+        self.assertIn("pkga/0.1 from local cache - Cache", self.client.out)
+        self.assertIn("pkga/0.1:cb054d0b3e1ca595dc66bc2339d40f1f8f04ab31 - Cache",
+                      self.client.out)
+        self.client.run("info . -s os=Linux")
+        self.assertNotIn("Version ranges solved", self.client.out)
+        self.assertIn("Binary: Cache", self.client.out)
+
+        # Any change of the inputs resolves the graph again
+        self._install(resolved=True, args="-s os=Windows --build=missing")
+        self.client.save({"conanfile.txt": "[requires]\npkgb/[>=0.1]\n[generators]\ncmake"})
+        self._install(resolved=True)
+        self._install(resolved=False)
+
+    def test_cache_changed(self):
+        self._install(resolved=True)
+        # A new version that the version range resolves to
+        self.client.run("create pkga pkga/0.2@ -s os=Linux")
+        self.client.run("install . -s os=Linux --build=missing")
+        self.assertIn("resolved to 'pkga/0.2' in local cache", self.client.out)
+        # A new recipe revision
+        self.client.save({"pkgb/conanfile.py": GenConanfile().with_require("pkga/[>=0.1]")
+                                                             .with_class_attribute("a=1")})
+        self.client.run("create pkgb pkgb/0.1@ -s os=Linux")
+        self._install(resolved=True)
+        # A removed binary
+        self._install(resolved=False)
+        self.client.run("remove pkga/0.2 -p -f")
+        self.client.run("install . -s os=Linux", assert_error=True)
+        self.assertIn("Version ranges solved", self.client.out)
+        self.assertIn("Missing prebuilt package for 'pkga/0.2'", self.client.out)
+
+    def test_disabled(self):
+        self.client.run("config set general.graph_snapshot_cache=0")
+        self._install(resolved=True)
+        self._install(resolved=True)
+        self.assertEqual([], self._snapshots())
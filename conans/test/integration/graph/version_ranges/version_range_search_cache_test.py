@@ -0,0 +1,78 @@
+import json
+import os
+import unittest
+
+from mock import patch
+
+from conans.client.rest.rest_client_common import RestCommonMethods
+from conans.test.utils.tools import TestClient, TestServer, GenConanfile
+from conans.util.files import load, save
+
+
+class RemoteSearchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.servers = {"default": TestServer(users={"user": "password"},
+                                              write_permissions=[("*/*@*/*", "*")])}
+        self.creator = TestClient(servers=self.servers, users={"default": [("user", "password")]})
+        self.creator.save({"conanfile.py": GenConanfile()})
+        self.creator.run("export . pkg/1.0@user/testing")
+        self.creator.run("upload * --confirm")
+        self.client = TestClient(servers=self.servers,
+                                 users={"default": [("user", "password")]})
+        self.client.run("config set general.remote_search_cache_ttl=3600")
+        self.client.save({"conanfile.py": GenConanfile().with_require("pkg/[>=1.0]@user/testing")})
+
+    def _install(self, *args):
+        self.client.run("remove * -f")
+        self.client.run("install . --build=missing %s" % " ".join(args))
+        return str(self.client.out)
+
+    def test_cached_search(self):
+        self.assertIn("resolved to 'pkg/1.0@user/testing' in remote 'default'", self._install())
+        self.creator.run("export . pkg/1.1@user/testing")
+        self.creator.run("upload * --confirm")
+        # Within the TTL the cached versions are used
+        with patch.object(RestCommonMethods, "search") as search:
+            self.assertIn("resolved to 'pkg/1.0@user/testing'", self._install())
+        search.assert_not_called()
+        # --update revalidates it
+        self.assertIn("resolved to 'pkg/1.1@user/testing'", self._install("--update"))
+        self.assertIn("resolved to 'pkg/1.1@user/testing'", self._install())
+
+    def test_revalidate_not_modified(self):
+        self._install()
+        cache_folder = os.path.join(self.client.cache_folder, "search_cache")
+        entries = os.listdir(cache_folder)
+        self.assertEqual(1, len(entries))
+        entry_path = os.path.join(cache_folder, entries[0])
+        entry = json.loads(load(entry_path))
+        self.assertEqual(["pkg/1.0@user/testing"], entry["refs"])
+        self.assertIsNotNone(entry["etag"])
+        # Expired, the server answers that it didn't change
+        entry["time"] = 0
+        save(entry_path, json.dumps(entry))
+        original = RestCommonMethods._search_results
+        with patch.object(RestCommonMethods, "_search_results",
+                          side_effect=original) as search_results:
+            self.assertIn("resolved to 'pkg/1.0@user/testing'", self._install())
+        search_results.assert_not_called()
+        self.assertNotEqual(0, json.loads(load(entry_path))["time"])
+
+    def test_entry_per_user(self):
+        self._install()
+        cache_folder = os.path.join(self.client.cache_folder, "search_cache")
+        self.assertEqual(1, len(os.listdir(cache_folder)))
+        # The recipes visible to an authenticated user can be different, it is not reused
+        self.client.run("user user -p password -r default")
+        self.creator.run("export . pkg/1.1@user/testing")
+        self.creator.run("upload * --confirm")
+        self.assertIn("resolved to 'pkg/1.1@user/testing'", self._install())
+        entries = [json.loads(load(os.path.join(cache_folder, f)))
+                   for f in os.listdir(cache_folder)]
+        self.assertEqual([None, "user"], sorted([e["user"] for e in entries], key=str))
+
+    def test_disabled(self):
+        self.client.run("config rm general.remote_search_cache_ttl")
+        self._install()
+        self.assertFalse(os.path.exists(os.path.join(self.client.cache_folder, "search_cache")))
@@ -0,0 +1,80 @@
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans.model.info import ConanInfo
+from conans.test.utils.tools import TestClient, GenConanfile
+
+
+class PackageIdMemoizedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = TestClient()
+        self.create_calls = 0
+        create = ConanInfo.create
+
+        def counted_create(*args, **kwargs):
+            self.create_calls += 1
+            return create(*args, **kwargs)
+
+        self.patch = patch.object(ConanInfo, "create", side_effect=counted_create)
+
+    def _install(self, conanfile, assert_error=False):
+        self.client.save({"conanfile.py": conanfile}, clean_first=True)
+        self.client.run("export . pkga/0.1@")
+        self.client.run("export . pkgb/0.1@")
+        self.client.save({"conanfile.txt": "[requires]\npkga/0.1\npkgb/0.1"}, clean_first=True)
+        with self.patch:
+            self.client.run("install . -s os=Linux --build=missing", assert_error=assert_error)
+
+    def test_memoized(self):
+        # Both recipes have the same package_id inputs, only one ConanInfo is created for them
+        # and another one for the consumer
+        self._install(GenConanfile().with_settings("os", "build_type").with_option("shared",
+                                                                                    [True, False])
+                                    .with_default_option("shared", False))
+        self.assertEqual(2, self.create_calls)
+        package_id = "24c3aa2d6c5929d53bd86b31e020c55d96b265c7"
+        self.assertIn("pkga/0.1:%s - Build" % package_id, self.client.out)
+        self.assertIn("pkgb/0.1:%s - Build" % package_id, self.client.out)
+        for name in ("pkga", "pkgb"):
+            self.client.run("search %s/0.1@" % name)
+            self.assertIn("os: Linux", self.client.out)
+            self.assertIn("shared: False", self.client.out)
+        self.client.run("install . -s os=Linux")
+        self.assertIn("pkga/0.1:%s - Cache" % package_id, self.client.out)
+        self.assertIn("pkgb/0.1:%s - Cache" % package_id, self.client.out)
+
+    def test_not_memoized_package_id(self):
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+
+            class Pkg(ConanFile):
+                settings = "os"
+
+                def package_id(self):
+                    if self.name == "pkga":
+                        del self.info.settings.os
+            """)
+        self._install(conanfile)
+        self.assertEqual(3, self.create_calls)
+        self.assertIn("pkga/0.1:5ab84d6acfe1f23c4fae0ab88f26e3a396351ac9 - Build", self.client.out)
+        self.assertIn("pkgb/0.1:cb054d0b3e1ca595dc66bc2339d40f1f8f04ab31 - Build", self.client.out)
+
+    def test_not_memoized_validate(self):
+        conanfile = textwrap.dedent("""
+            from conans import ConanFile
+            from conans.errors import ConanInvalidConfiguration
+
+            class Pkg(ConanFile):
+                settings = "os"
+
+                def validate(self):
+                    if self.name == "pkgb":
+                        raise ConanInvalidConfiguration("pkgb invalid")
+            """)
+        self._install(conanfile, assert_error=True)
+        self.assertEqual(3, self.create_calls)
+        self.assertIn("pkga/0.1:cb054d0b3e1ca595dc66bc2339d40f1f8f04ab31 - Build", self.client.out)
+        self.assertIn("pkgb/0.1:INVALID - Invalid", self.client.out)
@@ -0,0 +1,93 @@
+import os
+import textwrap
+import unittest
+
+import pytest
+from mock import patch
+
+from conans import COMPLEX_SEARCH_CAPABILITY, REVISIONS
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME
+from conans.test.utils.tools import TestClient, TestServer
+from conans.util import compression
+from conans.util.files import load
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="Requires zstandard")
+class ZstdCompressionFormatTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        from conans import ConanFile
+        class Pkg(ConanFile):
+            exports_sources = "*"
+            def package(self):
+                self.copy("*")
+        """)
+
+    def _upload(self, server_capabilities=None):
+        server = TestServer(users={"user": "password"}, write_permissions=[("*/*@*/*", "*")],
+                            server_capabilities=server_capabilities)
+        servers = {"default": server}
+        client = TestClient(servers=servers, users={"default": [("user", "password")]},
+                            revisions_enabled=True)
+        client.run("config set general.compression_format=zstd")
+        client.save({"conanfile.py": self.conanfile,
+                     "include/header.h": "header"})
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        rrev = server.server_store.get_last_revision(ref).revision
+        pref = PackageReference(ref.copy_with_rev(rrev), os.listdir(
+            client.cache.package_layout(ref).packages())[0])
+        prev = server.server_store.get_last_package_revision(pref).revision
+        package_files = os.listdir(server.server_store.package(pref.copy_with_revs(rrev, prev)))
+        return servers, package_files
+
+    def _check_install(self, servers, stream_downloads=False):
+        client = TestClient(servers=servers, users={"default": [("user", "password")]},
+                            revisions_enabled=True)
+        if stream_downloads:
+            client.run("config set general.stream_downloads=True")
+        client.run("install pkg/0.1@user/testing")
+        ref = ConanFileReference.loads("pkg/0.1@user/testing")
+        layout = client.cache.package_layout(ref)
+        pref = PackageReference(ref, os.listdir(layout.packages())[0])
+        header = os.path.join(layout.package(pref), "include", "header.h")
+        self.assertEqual("header", load(header))
+        return layout.load_metadata().packages[pref.id].checksums
+
+    def test_zstd_upload_install(self):
+        servers, package_files = self._upload()
+        # The tgz is also uploaded, for the clients without zstd support
+        self.assertIn(PACKAGE_TZST_NAME, package_files)
+        self.assertIn(PACKAGE_TGZ_NAME, package_files)
+        checksums = self._check_install(servers)
+        self.assertIn(PACKAGE_TZST_NAME, checksums)
+        self.assertNotIn(PACKAGE_TGZ_NAME, checksums)
+        checksums = self._check_install(servers, stream_downloads=True)
+        self.assertIn(PACKAGE_TZST_NAME, checksums)
+        self.assertNotIn(PACKAGE_TGZ_NAME, checksums)
+
+    def test_zstd_install_without_zstandard(self):
+        servers, _ = self._upload()
+        with patch("conans.client.remote_manager.zstandard", None):
+            checksums = self._check_install(servers)
+            self.assertIn(PACKAGE_TGZ_NAME, checksums)
+            self.assertNotIn(PACKAGE_TZST_NAME, checksums)
+            checksums = self._check_install(servers, stream_downloads=True)
+            self.assertIn(PACKAGE_TGZ_NAME, checksums)
+
+    def test_fallback_tgz_server_not_capable(self):
+        servers, package_files = self._upload([COMPLEX_SEARCH_CAPABILITY, REVISIONS])
+        self.assertIn(PACKAGE_TGZ_NAME, package_files)
+        self.assertNotIn(PACKAGE_TZST_NAME, package_files)
+        checksums = self._check_install(servers)
+        self.assertIn(PACKAGE_TGZ_NAME, checksums)
+
+
+def test_invalid_compression_format():
+    client = TestClient(default_server_user=True)
+    client.run("config set general.compression_format=bzip2")
+    client.save({"conanfile.py": ZstdCompressionFormatTest.conanfile})
+    client.run("create . pkg/0.1@user/testing")
+    client.run("upload * --all --confirm", assert_error=True)
+    assert "Invalid compression_format 'bzip2'" in client.out
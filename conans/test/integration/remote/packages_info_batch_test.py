@@ -0,0 +1,78 @@
+import textwrap
+import unittest
+
+from mock import patch
+
+from conans import COMPLEX_SEARCH_CAPABILITY, REVISIONS
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.test.utils.tools import TestClient, TestServer, GenConanfile
+
+
+class PackagesInfoBatchTest(unittest.TestCase):
+
+    def _upload(self, server_capabilities=None):
+        server = TestServer(users={"user": "password"}, write_permissions=[("*/*@*/*", "*")],
+                            server_capabilities=server_capabilities)
+        self.servers = {"default": server}
+        client = self._client()
+        client.save({"conanfile.py": GenConanfile()})
+        for name in ("liba", "libb", "libc"):
+            client.run("create . %s/0.1@" % name)
+        compatible = textwrap.dedent("""
+            from conans import ConanFile
+            class Pkg(ConanFile):
+                settings = "build_type"
+                def package_id(self):
+                    if self.settings.build_type == "Debug":
+                        compatible_pkg = self.info.clone()
+                        compatible_pkg.settings.build_type = "Release"
+                        self.compatible_packages.append(compatible_pkg)
+            """)
+        client.save({"conanfile.py": compatible})
+        client.run("create . libd/0.1@ -s build_type=Release")
+        client.run("upload * --all --confirm")
+
+    def _client(self):
+        return TestClient(servers=self.servers, users={"default": [("user", "password")]},
+                          revisions_enabled=True)
+
+    def _install(self, *args):
+        client = self._client()
+        client.save({"conanfile.txt": "[requires]\nliba/0.1\nlibb/0.1\nlibc/0.1\nlibd/0.1"})
+        original = RestV2Methods.get_package_info
+        with patch.object(RestV2Methods, "get_package_info", autospec=True,
+                          side_effect=original) as get_package_info:
+            client.run("install . -s build_type=Debug %s" % " ".join(args))
+        return client, get_package_info.call_count
+
+    def test_batch(self):
+        self._upload()
+        client, package_info_requests = self._install()
+        self.assertEqual(0, package_info_requests)
+        for name in ("liba", "libb", "libc"):
+            self.assertIn("%s/0.1: Retrieving package" % name, client.out)
+        self.assertIn("libd/0.1: Main binary package", client.out)
+        self.assertIn("Using compatible package", client.out)
+
+    def test_server_not_capable(self):
+        self._upload([COMPLEX_SEARCH_CAPABILITY, REVISIONS])
+        client, package_info_requests = self._install()
+        # One request per existing binary, the compatible one of libd too
+        self.assertEqual(4, package_info_requests)
+        for name in ("liba", "libb", "libc", "libd"):
+            self.assertIn("%s/0.1: Retrieving package" % name, client.out)
+
+    def test_missing_binaries(self):
+        self._upload()
+        client = self._client()
+        client.save({"conanfile.py": GenConanfile().with_settings("build_type")})
+        client.run("create . libe/0.1@ -s build_type=Release")
+        client.run("upload libe* --all --confirm")
+        client.run("remove libe* -f")
+        client.save({"conanfile.txt": "[requires]\nliba/0.1\nlibb/0.1\nlibe/0.1"},
+                    clean_first=True)
+        client.run("install . -s build_type=Debug", assert_error=True)
+        self.assertIn("Missing prebuilt package for 'libe/0.1'", client.out)
+        client.run("install . -s build_type=Debug --build=missing")
+        self.assertIn("libe/0.1: Created package revision", client.out)
+        self.assertIn("liba/0.1: Downloaded package revision", client.out)
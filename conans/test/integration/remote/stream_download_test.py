@@ -0,0 +1,95 @@
+import os
+import textwrap
+import unittest
+
+from requests.exceptions import ConnectionError
+
+from conans.model.ref import ConanFileReference, PackageReference
+from conans.paths import PACKAGE_TGZ_NAME
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import TestClient, TestRequester, TestServer
+from conans.util.files import load, md5sum, sha1sum
+
+
+class StreamDownloadTest(unittest.TestCase):
+    conanfile = textwrap.dedent("""
+        from conans import ConanFile
+        class Pkg(ConanFile):
+            exports_sources = "*"
+            def package(self):
+                self.copy("*")
+        """)
+
+    def setUp(self):
+        self.server = TestServer(users={"user": "password"},
+                                 write_permissions=[("*/*@*/*", "*")])
+        self.servers = {"default": self.server}
+        client = TestClient(servers=self.servers, users={"default": [("user", "password")]},
+                            revisions_enabled=True)
+        files = {"include/header%s.h" % i: "header %s" % i for i in range(20)}
+        files["conanfile.py"] = self.conanfile
+        client.save(files)
+        client.run("create . pkg/0.1@user/testing")
+        client.run("upload * --all --confirm")
+        self.ref = ConanFileReference.loads("pkg/0.1@user/testing")
+
+    def _client(self, requester_class=None):
+        client = TestClient(servers=self.servers, users={"default": [("user", "password")]},
+                            requester_class=requester_class, revisions_enabled=True)
+        client.run("config set general.stream_downloads=True")
+        return client
+
+    def _check_package(self, client, streamed=True):
+        layout = client.cache.package_layout(self.ref)
+        pref = PackageReference(self.ref, os.listdir(layout.packages())[0])
+        package_folder = layout.package(pref)
+        self.assertEqual("header 7", load(os.path.join(package_folder, "include", "header7.h")))
+        self.assertTrue(os.path.exists(os.path.join(package_folder, "conaninfo.txt")))
+        self.assertFalse(layout.package_is_dirty(pref))
+        # The tgz is not stored, but its checksums are the ones of the server file
+        tgz = os.path.join(layout.download_package(pref), PACKAGE_TGZ_NAME)
+        self.assertEqual(not streamed, os.path.exists(tgz))
+        rrev = self.server.server_store.get_last_revision(self.ref).revision
+        prev = self.server.server_store.get_last_package_revision(
+            pref.copy_with_revs(rrev, None)).revision
+        server_pref = pref.copy_with_revs(rrev, prev)
+        server_tgz = os.path.join(self.server.server_store.package(server_pref), PACKAGE_TGZ_NAME)
+        checksums = layout.load_metadata().packages[pref.id].checksums[PACKAGE_TGZ_NAME]
+        self.assertEqual(checksums, {"md5": md5sum(server_tgz), "sha1": sha1sum(server_tgz)})
+
+    def test_stream_download(self):
+        client = self._client()
+        client.run("install pkg/0.1@user/testing")
+        self._check_package(client)
+
+    def test_stream_download_cache(self):
+        client = self._client()
+        cache_folder = temp_folder()
+        client.run('config set storage.download_cache="%s"' % cache_folder)
+        client.run("install pkg/0.1@user/testing")
+        self._check_package(client)
+        client.run("remove * -f")
+        client.run("install pkg/0.1@user/testing")
+        self._check_package(client)
+
+    def test_stream_download_failure_fallback(self):
+
+        class BrokenStreamRequester(TestRequester):
+            failed = False
+
+            def get(self, url, **kwargs):
+                response = super(BrokenStreamRequester, self).get(url, **kwargs)
+                if PACKAGE_TGZ_NAME in url and not BrokenStreamRequester.failed:
+                    BrokenStreamRequester.failed = True
+
+                    def broken_iter_content(*args, **kwargs):
+                        yield response.content[:100]
+                        raise ConnectionError("Fake connection error exception")
+                    response.iter_content = broken_iter_content
+                return response
+
+        client = self._client(requester_class=BrokenStreamRequester)
+        client.run("install pkg/0.1@user/testing")
+        self.assertIn("Streamed download of package", client.out)
+        self.assertIn("Fake connection error exception", client.out)
+        self._check_package(client, streamed=False)
@@ -1,10 +1,11 @@
+import random
 import unittest
-from mock import Mock
 
 from mock import Mock
 
 from conans.client.graph.graph import CONTEXT_HOST
 from conans.client.graph.graph_builder import DepsGraph, Node
+from conans.errors import ConanException
 from conans.model.conan_file import ConanFile
 from conans.model.ref import ConanFileReference
 
@@ -112,3 +113,59 @@ class DepsGraphTest(unittest.TestCase):
         deps.add_edge(n2, n32, None)
         deps.add_edge(n32, n5, None)
         self.assertEqual([[n5, n31], [n32], [n2], [n1]], deps.by_levels())
+
+
+class DepsGraphLevelsTest(unittest.TestCase):
+    """ Levels of synthetic 5k nodes graphs, that are computed in linear time
+    """
+
+    @staticmethod
+    def _graph(dependencies):
+        deps = DepsGraph()
+        nodes = [Node(ConanFileReference.loads("pkg%s/1.0@user/stable" % i), Mock(),
+                      context=CONTEXT_HOST) for i in range(len(dependencies))]
+        for node in nodes:
+            deps.add_node(node)
+        for node, node_deps in zip(nodes, dependencies):
+            for dep in node_deps:
+                deps.add_edge(node, nodes[dep], None)
+        return deps, nodes
+
+    def _check_levels(self, dependencies):
+        deps, nodes = self._graph(dependencies)
+        node_levels = []  # The node level is the next one of its highest dependency
+        for node_deps in dependencies:
+            node_levels.append(max([node_levels[d] + 1 for d in node_deps] or [0]))
+        expected = [[] for _ in range(max(node_levels) + 1)]
+        for node, level in zip(nodes, node_levels):
+            expected[level].append(node)
+        expected = [sorted(level) for level in expected]
+
+        levels = deps.by_levels()
+        inverse_levels = deps.inverse_levels()
+        self.assertEqual(expected, levels)
+        self.assertEqual(sorted(nodes), sorted(n for level in inverse_levels for n in level))
+        inverse = {n: i for i, level in enumerate(inverse_levels) for n in level}
+        for node, node_deps in zip(nodes, dependencies):
+            for dep in node_deps:
+                self.assertLess(inverse[node], inverse[nodes[dep]])
+
+    def test_chain(self):
+        self._check_levels([[]] + [[i] for i in range(4999)])
+
+    def test_wide(self):
+        rng = random.Random(1)
+        dependencies = [[] for _ in range(100)]
+        for i in range(100, 5000):
+            dependencies.append(rng.sample(range(i - 100, i), 4))
+        self._check_levels(dependencies)
+
+    def test_nodes_subset(self):
+        deps, nodes = self._graph([[], [0], [1], [2], [1, 3]])
+        subset = {nodes[1], nodes[3], nodes[4]}
+        self.assertEqual([[nodes[1], nodes[3]], [nodes[4]]], deps.by_levels(subset))
+
+    def test_cycle(self):
+        deps, nodes = self._graph([[], [0, 2], [1]])
+        with self.assertRaisesRegex(ConanException, "There is a cycle in the graph between: "):
+            deps.by_levels()
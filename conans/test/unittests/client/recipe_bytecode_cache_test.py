@@ -0,0 +1,76 @@
+import os
+import textwrap
+import traceback
+import unittest
+
+from mock import patch
+
+from conans.client.cache.bytecode_cache import RecipeBytecodeCache
+from conans.client.loader import _parse_conanfile, set_bytecode_cache_folder
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+source = textwrap.dedent("""
+    def value():
+        return 42
+
+    def fail():
+        raise Exception("failed")
+    """).encode()
+
+
+class RecipeBytecodeCacheTest(unittest.TestCase):
+
+    def _get_code(self, cache, path):
+        with patch("conans.client.cache.bytecode_cache.compile", side_effect=compile,
+                   create=True) as compile_mock:
+            code = cache.get_code(source, path)
+        namespace = {}
+        exec(code, namespace)
+        self.assertEqual(42, namespace["value"]())
+        return code, compile_mock.called
+
+    def test_compiled_once(self):
+        cache = RecipeBytecodeCache()
+        code, compiled = self._get_code(cache, "/path1/conanfile.py")
+        self.assertTrue(compiled)
+        self.assertEqual("/path1/conanfile.py", code.co_filename)
+        code, compiled = self._get_code(cache, "/path2/conanfile.py")
+        self.assertFalse(compiled)
+        # The file of the tracebacks is the one of every recipe
+        self.assertEqual("/path2/conanfile.py", code.co_filename)
+        function = next(c for c in code.co_consts if getattr(c, "co_name", None) == "fail")
+        self.assertEqual("/path2/conanfile.py", function.co_filename)
+
+    def test_folder(self):
+        folder = temp_folder()
+        _, compiled = self._get_code(RecipeBytecodeCache(folder), "/path1/conanfile.py")
+        self.assertTrue(compiled)
+        self.assertEqual(1, len(os.listdir(folder)))
+        # Other processes load it from the folder
+        _, compiled = self._get_code(RecipeBytecodeCache(folder), "/path2/conanfile.py")
+        self.assertFalse(compiled)
+
+        save(os.path.join(folder, os.listdir(folder)[0]), "corrupted")
+        _, compiled = self._get_code(RecipeBytecodeCache(folder), "/path2/conanfile.py")
+        self.assertTrue(compiled)
+        _, compiled = self._get_code(RecipeBytecodeCache(folder), "/path2/conanfile.py")
+        self.assertFalse(compiled)
+
+    def test_parse_conanfile(self):
+        folder = temp_folder()
+        set_bytecode_cache_folder(folder)
+        try:
+            paths = [os.path.join(temp_folder(), "conanfile.py") for _ in range(2)]
+            for path in paths:
+                save(path, source)
+                module, _ = _parse_conanfile(path)
+                self.assertEqual(42, module.value())
+                self.assertEqual(path, module.__file__)
+                try:
+                    module.fail()
+                except Exception:
+                    self.assertIn('File "%s", line 6, in fail' % path, traceback.format_exc())
+            self.assertEqual(1, len(os.listdir(folder)))
+        finally:
+            set_bytecode_cache_folder(None)
@@ -6,6 +6,7 @@ import unittest
 import pytest
 
 from conans.client.downloaders.file_downloader import FileDownloader
+from conans.client.tools import environment_append
 from conans.errors import ConanException
 from conans.test.utils.mocks import TestBufferConanOutput
 from conans.util.files import load
@@ -45,17 +46,20 @@ class MockRequester(object):
 
     def get(self, *_args, **kwargs):
         start = 0
+        end = len(self._data) - 1
         headers = kwargs.get("headers") or {}
         transfer_range = headers.get("range", "")
-        match = re.match(r"bytes=([0-9]+)-", transfer_range)
+        match = re.match(r"bytes=([0-9]+)-([0-9]*)", transfer_range)
         status = 200
         headers = {"Content-Length": len(self._data), "Accept-Ranges": "bytes"}
         if match and self._accept_ranges:
             start = int(match.groups()[0])
+            if match.groups()[1]:
+                end = min(int(match.groups()[1]), end)
             if start < len(self._data):
                 status = 206
-                headers.update({"Content-Length": str(len(self._data) - start),
-                                "Content-Range": "bytes {}-{}/{}".format(start, len(self._data) - 1,
+                headers.update({"Content-Length": str(end + 1 - start),
+                                "Content-Range": "bytes {}-{}/{}".format(start, end,
                                                                          len(self._data))})
             else:
                 status = 416
@@ -63,8 +67,8 @@ class MockRequester(object):
                                 "Content-Range": "bytes */{}".format(len(self._data))})
         else:
             headers.update(self._echo_header)
-        response = MockResponse(self._data[start:start + self._chunk_size], status_code=status,
-                                headers=headers)
+        end = min(end + 1, start + self._chunk_size)
+        response = MockResponse(self._data[start:end], status_code=status, headers=headers)
         return response
 
 
@@ -143,3 +147,84 @@ class DownloaderUnitTest(unittest.TestCase):
         downloader.download("fake_url", file_path=self.target)
         actual_content = load(self.target, binary=True)
         self.assertEqual(expected_content, actual_content)
+
+
+class SegmentedDownloaderTest(unittest.TestCase):
+    def setUp(self):
+        d = tempfile.mkdtemp()
+        self.target = os.path.join(d, "target")
+        self.out = TestBufferConanOutput()
+        self.content = os.urandom(1000)
+
+    def _download(self, requester, segments="4", min_size="100"):
+        downloader = FileDownloader(requester=requester, output=self.out, verify=None,
+                                    config_retry=1, config_retry_wait=0)
+        with environment_append({"CONAN_DOWNLOAD_SEGMENTS": segments,
+                                 "CONAN_DOWNLOAD_SEGMENTS_MIN_SIZE": min_size}):
+            downloader.download("fake_url", file_path=self.target)
+
+    def test_segmented_download(self):
+        class RangesRequester(MockRequester):
+            ranges = []
+
+            def get(self, *args, **kwargs):
+                self.ranges.append((kwargs.get("headers") or {}).get("range"))
+                return super(RangesRequester, self).get(*args, **kwargs)
+
+        requester = RangesRequester(self.content)
+        self._download(requester)
+        self.assertEqual(self.content, load(self.target, binary=True))
+        self.assertEqual(sorted(requester.ranges[1:]),
+                         ["bytes=250-499", "bytes=500-749", "bytes=750-999"])
+
+    def test_segmented_download_resumes_segments(self):
+        requester = MockRequester(self.content, chunk_size=200)
+        self._download(requester)
+        self.assertEqual(self.content, load(self.target, binary=True))
+
+    def test_not_segmented(self):
+        class NoRangesRequester(MockRequester):
+            def get(self, *args, **kwargs):
+                assert "range" not in (kwargs.get("headers") or {})
+                return super(NoRangesRequester, self).get(*args, **kwargs)
+
+        # Small file
+        self._download(NoRangesRequester(self.content), min_size="2000")
+        self.assertEqual(self.content, load(self.target, binary=True))
+        os.remove(self.target)
+        # Not enabled
+        self._download(NoRangesRequester(self.content), segments="1")
+        self.assertEqual(self.content, load(self.target, binary=True))
+        os.remove(self.target)
+        # Server doesn't advertise ranges
+        echo_header = {"Accept-Ranges": "none"}
+        self._download(NoRangesRequester(self.content, accept_ranges=False,
+                                         echo_header=echo_header))
+        self.assertEqual(self.content, load(self.target, binary=True))
+
+    def test_segmented_download_retried_once(self):
+        class FailingSegmentRequester(MockRequester):
+            requests = 0
+
+            def get(self, *args, **kwargs):
+                self.requests += 1
+                if (kwargs.get("headers") or {}).get("range") == "bytes=750-999":
+                    raise Exception("Connection reset")
+                return super(FailingSegmentRequester, self).get(*args, **kwargs)
+
+        requester = FailingSegmentRequester(self.content)
+        with pytest.raises(ConanException, match=r"Connection reset"):
+            self._download(requester)
+        # The whole file, 2 of the segments and 2 attempts (retry=1) of the failing one
+        self.assertEqual(5, requester.requests)
+        self.assertFalse(os.path.exists(self.target))
+
+    def test_segmented_download_wrong_range(self):
+        class WrongRangeRequester(MockRequester):
+            def get(self, *args, **kwargs):
+                kwargs.pop("headers", None)  # Ignores the range and returns 200
+                return super(WrongRangeRequester, self).get(*args, **kwargs)
+
+        with pytest.raises(ConanException, match=r"Incorrect Content-Range header"):
+            self._download(WrongRangeRequester(self.content))
+        self.assertFalse(os.path.exists(self.target))
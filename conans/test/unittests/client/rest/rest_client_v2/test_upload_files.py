@@ -0,0 +1,75 @@
+import os
+import threading
+import unittest
+from collections import namedtuple
+
+from mock import patch
+
+from conans.client.rest.rest_client_v2 import RestV2Methods
+from conans.errors import ConanException
+from conans.test.utils.mocks import TestBufferConanOutput
+from conans.test.utils.test_files import temp_folder
+from conans.util.files import save
+
+
+class _ConfigMock:
+    retry = 0
+    retry_wait = 0
+
+
+class _RequesterMock(object):
+    """ Fails the uploads of the files in 'fail', and waits until the first 'concurrent' files are
+    being uploaded at the same time
+    """
+
+    def __init__(self, concurrent, fail=()):
+        self.uploaded = []
+        self._fail = fail
+        self._barrier = threading.Barrier(concurrent, timeout=5)
+        self._concurrent = concurrent
+
+    def put(self, url, data, **kwargs):
+        if url in self._fail:
+            return namedtuple("response", "status_code content")(500, "error")
+        if len(self.uploaded) < self._concurrent:
+            self._barrier.wait()
+        for _ in data:
+            pass
+        self.uploaded.append(url)
+        return namedtuple("response", "status_code raise_for_status")(200, lambda: None)
+
+
+class UploadFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        folder = temp_folder()
+        names = ["conan_package.tgz", "conan_sources.tgz", "conaninfo.txt", "conanmanifest.txt"]
+        self.files = {name: os.path.join(folder, name) for name in names}
+        for path in self.files.values():
+            save(path, "contents")
+        self.urls = {name: name for name in names}
+
+    def _upload(self, requester):
+        v2 = RestV2Methods("http://some.url", token=None, custom_headers=None,
+                           output=TestBufferConanOutput(), requester=requester,
+                           config=_ConfigMock(), verify_ssl=None)
+        v2._upload_files(self.files, self.urls, retry=0, retry_wait=0)
+
+    def test_concurrent(self):
+        requester = _RequesterMock(concurrent=2)
+        self._upload(requester)
+        self.assertEqual(["conan_package.tgz", "conan_sources.tgz"], sorted(requester.uploaded[:2]))
+        self.assertEqual(["conaninfo.txt", "conanmanifest.txt"], requester.uploaded[2:])
+
+    def test_sequential(self):
+        requester = _RequesterMock(concurrent=1)
+        with patch.dict("os.environ", {"CONAN_UPLOAD_FILE_THREADS": "1"}):
+            self._upload(requester)
+        self.assertEqual(sorted(self.files), requester.uploaded)
+
+    def test_failed(self):
+        requester = _RequesterMock(concurrent=1, fail=("conan_package.tgz", "conaninfo.txt"))
+        with self.assertRaisesRegex(ConanException, "failed files: conan_package.tgz, "
+                                                    "conaninfo.txt"):
+            self._upload(requester)
+        self.assertEqual(["conan_sources.tgz", "conanmanifest.txt"], requester.uploaded)
@@ -28,6 +28,12 @@ class Retriever(object):
         conan_path = os.path.join(self.folder, "data", ref.dir_repr(), CONANFILE)
         save(conan_path, content)
 
+    def prefetch_recipes(self, refs, remotes):
+        return []
+
+    def discard_prefetched(self):
+        pass
+
     def get_recipe(self, ref, check_updates, update, remote_name, recorder):  # @UnusedVariable
         conan_path = os.path.join(self.folder, "data", ref.dir_repr(), CONANFILE)
         return conan_path, None, None, ref.copy_with_rev(DEFAULT_REVISION_V1)
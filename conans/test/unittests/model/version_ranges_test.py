@@ -115,3 +115,24 @@ class BasicMaxVersionTest(unittest.TestCase):
             satisfying(["2.1.1"], "2.3 3.2, include_prerelease=Ture, loose=False", output)
         with self.assertRaises(ConanException):
             satisfying(["2.1.1"], "~2.3, abc, loose=False", output)
+
+    def test_equal_versions_first_wins(self):
+        output = []
+        result = satisfying(["1.2", "1.2.0", "1.1"], "", output)
+        self.assertEqual(result, "1.2")
+        result = satisfying(["1.2.0", "1.2", "1.1"], "", output)
+        self.assertEqual(result, "1.2.0")
+
+    def test_same_as_semver_max_satisfying(self):
+        from semver import SemVer, max_satisfying
+        versions = ["0.1", "1.0", "1.0.1", "1.1-pre", "1.1.0-alpha.2", "1.1.0-alpha.10",
+                    "1.1.0-beta", "1.1.0", "1.2", "1.10", "2.0.0-rc.1", "2.0", "2.0.1", "10.0"]
+        for expr in ("", "1", "~1.0", "^1.0", ">1.0 <2", "<1.1 || >=2.0", "1.1 - 2.0",
+                     ">=1.1.0-alpha", "~1.1.0-alpha", "2.0.0-rc.1", "*", ">=3"):
+            for include_prerelease in (False, True):
+                versionexpr = expr + (", include_prerelease=True" if include_prerelease else "")
+                candidates = {SemVer(v, loose=True): v for v in versions}
+                expected = max_satisfying(candidates, expr, loose=True,
+                                          include_prerelease=include_prerelease)
+                self.assertEqual(satisfying(versions, versionexpr, []),
+                                 candidates.get(expected), versionexpr)
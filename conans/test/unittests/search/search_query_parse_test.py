@@ -2,7 +2,7 @@ import unittest
 
 import six
 
-from conans.search.query_parse import evaluate_postfix, infix_to_postfix
+from conans.search.query_parse import compile_postfix, evaluate_postfix, infix_to_postfix
 
 
 class QueryParseTest(unittest.TestCase):
@@ -46,3 +46,21 @@ class QueryParseTest(unittest.TestCase):
         self.assertTrue(evaluate("a=2 AND j=45 OR (h=23 AND a=2)"))
         self.assertTrue(evaluate("((((a=2 AND ((((f=23 OR j=45))))))))"))
         self.assertFalse(evaluate("((((a=2 AND ((((f=23 OR j=42))))))))"))
+
+    def test_compile_postfix(self):
+        compiled = []
+
+        def compiler(expr):
+            compiled.append(expr)
+            return lambda values: expr in values
+
+        query = compile_postfix(infix_to_postfix("a=2 AND (f=23 OR j=45)"), compiler)
+        self.assertEqual(["a=2", "f=23", "j=45"], compiled)
+        self.assertTrue(query(("a=2", "j=45")))
+        self.assertTrue(query(("a=2", "f=23")))
+        self.assertFalse(query(("a=2", "j=42")))
+        self.assertFalse(query(("f=23", "j=45")))
+        self.assertEqual(3, len(compiled))
+
+        self.assertTrue(compile_postfix([], compiler)(()))
+        self.assertTrue(compile_postfix(["a=2"], compiler)(("a=2", )))
@@ -20,6 +20,7 @@ ssl_enabled: true
 port: 9220
 host_name: localhost
 public_port: 12345
+workers: 4
 
 
 [write_permissions]
@@ -87,6 +88,8 @@ text=value
         self.assertEqual(config.host_name, "localhost")
         self.assertEqual(config.public_port, 12345)
         self.assertEqual(config.public_url, "https://localhost:12345/v1")
+        self.assertEqual(config.workers, 4)
+        self.assertIsNone(config.keep_alive_timeout)
 
         # Now check with environments
         tmp_storage = temp_folder()
@@ -98,6 +101,8 @@ text=value
         self.environ["CONAN_SERVER_USERS"] = "lasote:lasotepass,pepe2:pepepass2"
         self.environ["CONAN_HOST_NAME"] = "remotehost"
         self.environ["CONAN_SERVER_PUBLIC_PORT"] = "33333"
+        self.environ["CONAN_SERVER_WORKERS"] = "8"
+        self.environ["CONAN_SERVER_KEEP_ALIVE_TIMEOUT"] = "60"
 
         config = ConanServerConfigParser(self.file_path, environment=self.environ)
         self.assertEqual(config.jwt_secret,  "newkey")
@@ -112,3 +117,11 @@ text=value
         self.assertEqual(config.host_name, "remotehost")
         self.assertEqual(config.public_port, 33333)
         self.assertEqual(config.public_url, "http://remotehost:33333/v1")
+        self.assertEqual(config.workers, 8)
+        self.assertEqual(config.keep_alive_timeout, 60)
+
+        self.environ["CONAN_SERVER_WORKERS"] = "0"
+        config = ConanServerConfigParser(self.file_path, environment=self.environ)
+        with six.assertRaisesRegex(self, ConanException,
+                                   "positive numeric parameter for 'workers'"):
+            config.workers
@@ -1,19 +1,24 @@
+import json
 import os
 import unittest
 from datetime import timedelta
+from multiprocessing.pool import ThreadPool
 from time import sleep
 
+from mock import patch
+
 from conans import DEFAULT_REVISION_V1
 from conans.errors import NotFoundException, RequestErrorException
 from conans.model.manifest import FileTreeManifest
 from conans.model.ref import ConanFileReference, PackageReference
 from conans.paths import CONANINFO, CONAN_MANIFEST
 from conans.server.crypto.jwt.jwt_updown_manager import JWTUpDownAuthManager
+from conans.server.revision_list import RevisionList
 from conans.server.service.authorize import BasicAuthorizer
 from conans.server.service.common.search import SearchService
 from conans.server.service.v1.service import ConanService
 from conans.server.service.v1.upload_download_service import FileUploadDownloadService
-from conans.server.store.disk_adapter import ServerDiskAdapter
+from conans.server.store.disk_adapter import CHECKSUMS_FILE, ServerDiskAdapter
 from conans.server.store.server_store import ServerStore
 from conans.test.assets.genconanfile import GenConanfile
 from conans.test.utils.test_files import temp_folder
@@ -114,6 +119,107 @@ class ConanServiceTest(unittest.TestCase):
 
         self.assertEqual(snap, snap_expected)
 
+    def test_get_recipe_snapshot_cached(self):
+        snap = self.service.get_recipe_snapshot(self.ref)
+        base_path = self.server_store.export(self.ref)
+        self.assertTrue(os.path.exists(os.path.join(base_path, CHECKSUMS_FILE)))
+        with patch("conans.server.store.disk_adapter.md5sum") as md5sum_mock:
+            self.assertEqual(snap, self.service.get_recipe_snapshot(self.ref))
+            self.assertFalse(md5sum_mock.called)
+        self.assertEqual(["conanfile.py", "conanmanifest.txt"],
+                         sorted(self.server_store.get_recipe_file_list(self.ref)))
+
+        # Written again, the checksum is computed again
+        conanfile_path = os.path.join(base_path, "conanfile.py")
+        os.remove(conanfile_path)
+        save(conanfile_path, "new contents")
+        snap = self.service.get_recipe_snapshot(self.ref)
+        self.assertEqual(md5sum(conanfile_path), snap["conanfile.py"])
+
+        self.server_store.remove_conanfile_files(self.ref, ["conanfile.py"])
+        self.assertEqual(["conanmanifest.txt"], list(self.service.get_recipe_snapshot(self.ref)))
+
+    def test_checksums_concurrent_threads(self):
+        folder = self.server_store.package(self.pref)
+        files = {"file%s.lib" % i: "contents %s" % i for i in range(8)}
+        save_files(folder, files)
+        adapter = self.server_store._storage_adapter
+
+        def _save(name):
+            path = os.path.join(folder, name)
+            adapter.save_checksum(path, md5sum(path))
+
+        pool = ThreadPool(8)
+        try:
+            pool.map(_save, files)
+        finally:
+            pool.close()
+            pool.join()
+        checksums = json.loads(load(os.path.join(folder, CHECKSUMS_FILE)))
+        self.assertEqual(sorted(files), sorted(checksums))
+
+    def test_revisions_cached(self):
+        adapter = self.server_store._storage_adapter
+        ref = self.ref.copy_clear_rev()
+        # Cached since it was written in the setUp
+        with patch.object(adapter, "read_file", side_effect=adapter.read_file) as read_file:
+            with patch.object(adapter, "write_file", side_effect=adapter.write_file) as write_file:
+                for _ in range(3):
+                    self.assertEqual(DEFAULT_REVISION_V1,
+                                     self.server_store.get_last_revision(ref).revision)
+                    self.server_store.update_last_revision(self.ref)
+                self.assertFalse(read_file.called)
+                self.assertFalse(write_file.called)
+
+                new_ref = ref.copy_with_rev("new_rev")
+                mkdir(self.server_store.base_folder(new_ref))
+                self.server_store.update_last_revision(new_ref)
+                self.assertEqual(1, write_file.call_count)
+                self.assertEqual(["new_rev", DEFAULT_REVISION_V1],
+                                 [r.revision for r in self.server_store.get_recipe_revisions(ref)])
+                self.assertFalse(read_file.called)
+
+        # Written by other process
+        other_store = ServerStore(storage_adapter=adapter)
+        other_store.remove_conanfile(new_ref)
+        self.assertEqual(DEFAULT_REVISION_V1, self.server_store.get_last_revision(ref).revision)
+        other_store.remove_conanfile(ref)
+        self.assertIsNone(self.server_store.get_last_revision(ref))
+
+    def test_revisions_time(self):
+        ref = self.ref.copy_clear_rev()
+        new_ref = ref.copy_with_rev("new_rev")
+        other_ref = ref.copy_with_rev("other_rev")
+        for r in (new_ref, other_ref):
+            mkdir(self.server_store.base_folder(r))
+            with patch.object(RevisionList, "_now", return_value="2020-01-01T00:00:00Z"):
+                self.server_store.update_last_revision(r)
+        # Uploading again the latest revision (e.g. upload --force) keeps its time
+        with patch.object(RevisionList, "_now", return_value="2021-01-01T00:00:00Z"):
+            self.server_store.update_last_revision(other_ref)
+            self.assertEqual("2020-01-01T00:00:00Z",
+                             self.server_store.get_revision_time(other_ref))
+            # A previous revision uploaded again is the latest one, with a new time
+            self.server_store.update_last_revision(new_ref)
+        self.assertEqual("new_rev", self.server_store.get_last_revision(ref).revision)
+        self.assertEqual("2021-01-01T00:00:00Z", self.server_store.get_revision_time(new_ref))
+
+    def test_revisions_concurrent_threads(self):
+        ref = self.ref.copy_clear_rev()
+        revisions = ["rev%s" % i for i in range(8)]
+        for revision in revisions:
+            mkdir(self.server_store.base_folder(ref.copy_with_rev(revision)))
+
+        pool = ThreadPool(8)
+        try:
+            pool.map(lambda r: self.server_store.update_last_revision(ref.copy_with_rev(r)),
+                     revisions)
+        finally:
+            pool.close()
+            pool.join()
+        stored = [r.revision for r in self.server_store.get_recipe_revisions(ref)]
+        self.assertEqual(sorted(revisions + [DEFAULT_REVISION_V1]), sorted(stored))
+
     def test_get_conanfile_download_urls(self):
         urls = self.service.get_conanfile_download_urls(self.ref)
         # Remove parameters
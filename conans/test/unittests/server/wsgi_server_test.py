@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+import bottle
+import requests
+from mock import patch
+
+from conans.server.rest.controller.common.conditional import file_response
+from conans.server.rest.wsgi_server import ThreadPoolServer, WSGIRefServer
+from conans.test.utils.test_files import temp_folder
+from conans.test.utils.tools import get_free_port
+from conans.util.files import save
+
+
+class WSGIServerTest(unittest.TestCase):
+    delay = 0.5
+
+    def _run_server(self, server_class, **options):
+        app = bottle.Bottle()
+        self.file_path = os.path.join(temp_folder(), "conanmanifest.txt")
+        save(self.file_path, "0123456789" * 1000)
+
+        @app.route("/slow")
+        def slow():
+            time.sleep(self.delay)
+            return "done"
+
+        @app.route("/file")
+        def get_file():
+            return file_response(self.file_path)
+
+        port = get_free_port()
+        server = server_class(host="127.0.0.1", port=port, **options)
+        server.quiet = True
+        thread = threading.Thread(target=server.run, args=(app, ))
+        thread.daemon = True
+        thread.start()
+        url = "http://127.0.0.1:%s" % port
+        for _ in range(50):  # Wait until it is listening
+            try:
+                requests.get(url)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+        return url
+
+    def _concurrent_requests(self, url, number):
+        results = []
+
+        def get():
+            results.append(requests.get(url).text)
+
+        threads = [threading.Thread(target=get) for _ in range(number)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(["done"] * number, results)
+        return time.time() - start
+
+    def _check_concurrency(self):
+        url = self._run_server(ThreadPoolServer, workers=4)
+        elapsed = self._concurrent_requests(url + "/slow", 4)
+        # Served one at a time it would take 4 * delay
+        self.assertLess(elapsed, 3 * self.delay)
+
+    def test_concurrent_requests(self):
+        self._check_concurrency()
+
+    def test_concurrent_requests_wsgiref(self):
+        with patch.dict(sys.modules, {"waitress": None}):  # import waitress raises ImportError
+            self._check_concurrency()
+
+    def _check_file_response(self, url):
+        url = url + "/file"
+        content = "0123456789" * 1000
+        r = requests.get(url)
+        self.assertEqual(200, r.status_code)
+        self.assertEqual(content, r.text)
+        self.assertEqual("bytes", r.headers["Accept-Ranges"])
+        etag = r.headers["ETag"]
+
+        r = requests.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(304, r.status_code)
+        self.assertEqual("", r.text)
+
+        r = requests.get(url, headers={"Range": "bytes=9995-"})
+        self.assertEqual(206, r.status_code)
+        self.assertEqual("56789", r.text)
+        self.assertEqual("bytes 9995-9999/10000", r.headers["Content-Range"])
+        r = requests.get(url, headers={"Range": "bytes=10-14"})
+        self.assertEqual(206, r.status_code)
+        self.assertEqual("01234", r.text)
+        r = requests.get(url, headers={"Range": "bytes=20000-"})
+        self.assertEqual(416, r.status_code)
+
+        # The file is replaced, not modified in place
+        os.remove(self.file_path)
+        save(self.file_path, "new contents")
+        r = requests.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(200, r.status_code)
+        self.assertEqual("new contents", r.text)
+        self.assertNotEqual(etag, r.headers["ETag"])
+
+    def test_file_response_sendfile(self):
+        with patch("os.sendfile", side_effect=os.sendfile) as sendfile:
+            url = self._run_server(WSGIRefServer)
+            self._check_file_response(url)
+        self.assertTrue(sendfile.called)
+
+    def test_file_response_workers(self):
+        url = self._run_server(ThreadPoolServer, workers=2)
+        self._check_file_response(url)
@@ -0,0 +1,178 @@
+import gzip
+import io
+import os
+import random
+import tarfile
+import unittest
+
+import pytest
+
+from conans.client.cmd.uploader import compress_files
+from conans.client import remote_manager
+from conans.client.remote_manager import calc_files_checksum
+from conans.client.tools import environment_append
+from conans.errors import ConanException
+from conans.paths import PACKAGE_TGZ_NAME, PACKAGE_TZST_NAME
+from conans.test.utils.test_files import temp_folder
+from conans.util import compression
+from conans.util.compression import ChecksumWriter, ParallelGzipWriter, extract_parallel
+from conans.util.files import md5sum, save, sha1sum
+
+
+def _random_content(size, seed=0):
+    # Repetitive but not trivial data, so blocks reference data in previous blocks
+    rnd = random.Random(seed)
+    words = [bytes(bytearray(rnd.randint(0, 255) for _ in range(rnd.randint(3, 12))))
+             for _ in range(200)]
+    chunks = []
+    total = 0
+    while total < size:
+        word = rnd.choice(words)
+        chunks.append(word)
+        total += len(word)
+    return b"".join(chunks)[:size]
+
+
+class ParallelGzipWriterTest(unittest.TestCase):
+
+    def _compress(self, content, threads, block_size=64 * 1024):
+        output = io.BytesIO()
+        writer = ParallelGzipWriter(output, "file.tgz", 9, threads, block_size=block_size)
+        # Write in uneven chunks to exercise the block splitting
+        for i in range(0, len(content), 10000):
+            writer.write(content[i:i + 10000])
+        writer.close()
+        return output.getvalue()
+
+    def test_roundtrip(self):
+        for size in (0, 1, 64 * 1024, 64 * 1024 + 1, 500000):
+            content = _random_content(size)
+            compressed = self._compress(content, threads=4)
+            self.assertEqual(gzip.decompress(compressed), content)
+
+    def test_reproducible_regardless_threads(self):
+        content = _random_content(700000)
+        compressed = self._compress(content, threads=1)
+        for threads in (2, 3, 8):
+            self.assertEqual(compressed, self._compress(content, threads=threads))
+
+    def test_header_without_timestamp(self):
+        compressed = self._compress(b"Hello", threads=2)
+        self.assertEqual(compressed[4:8], b"\0\0\0\0")
+        self.assertEqual(compressed[10:19], b"file.tgz\0")
+
+
+class CompressFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.files = {}
+        for i in range(5):
+            name = "file%s.txt" % i
+            save(os.path.join(self.folder, "pkg", name), _random_content(100000, seed=i))
+            self.files[name] = os.path.join(self.folder, "pkg", name)
+
+    def test_checksums_computed_while_writing(self):
+        path = compress_files(self.files, {}, PACKAGE_TGZ_NAME, dest_dir=self.folder)
+        checksums = calc_files_checksum({PACKAGE_TGZ_NAME: path})
+        self.assertEqual(checksums[PACKAGE_TGZ_NAME], {"md5": md5sum(path),
+                                                       "sha1": sha1sum(path)})
+
+    def test_modified_tgz_is_hashed_again(self):
+        path = compress_files(self.files, {}, PACKAGE_TGZ_NAME, dest_dir=self.folder)
+        save(path, "other content")
+        checksums = calc_files_checksum({PACKAGE_TGZ_NAME: path})
+        self.assertEqual(checksums[PACKAGE_TGZ_NAME], {"md5": md5sum(path),
+                                                       "sha1": sha1sum(path)})
+
+    def test_written_checksums_bounded(self):
+        for i in range(remote_manager._MAX_WRITTEN_FILES_CHECKSUMS + 5):
+            path = os.path.join(self.folder, str(i), PACKAGE_TGZ_NAME)
+            save(path, "content")
+            remote_manager.register_file_checksum(path, {"md5": "md5", "sha1": "sha1"})
+        self.assertEqual(remote_manager._MAX_WRITTEN_FILES_CHECKSUMS,
+                         len(remote_manager._written_files_checksums))
+        # The oldest ones are hashed again
+        checksums = calc_files_checksum({PACKAGE_TGZ_NAME: os.path.join(self.folder, "0",
+                                                                        PACKAGE_TGZ_NAME)})
+        self.assertEqual(checksums[PACKAGE_TGZ_NAME]["md5"], md5sum(path))
+        checksums = calc_files_checksum({PACKAGE_TGZ_NAME: path})
+        self.assertEqual(checksums[PACKAGE_TGZ_NAME], {"md5": "md5", "sha1": "sha1"})
+
+    def test_parallel_compression(self):
+        with environment_append({"CONAN_COMPRESSION_THREADS": "4"}):
+            path = compress_files(self.files, {}, PACKAGE_TGZ_NAME, dest_dir=self.folder)
+            first = md5sum(path)
+            path = compress_files(self.files, {}, PACKAGE_TGZ_NAME, dest_dir=self.folder)
+            self.assertEqual(first, md5sum(path))
+
+        with tarfile.open(path) as tar:
+            self.assertEqual(sorted(tar.getnames()), sorted(self.files))
+            content = tar.extractfile("file3.txt").read()
+        self.assertEqual(content, _random_content(100000, seed=3))
+
+
+@pytest.mark.skipif(compression.zstandard is None, reason="Requires zstandard")
+class ZstdCompressFilesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = temp_folder()
+        self.files = {}
+        for i in range(5):
+            name = "file%s.txt" % i
+            save(os.path.join(self.folder, "pkg", name), _random_content(100000, seed=i))
+            self.files[name] = os.path.join(self.folder, "pkg", name)
+
+    def test_roundtrip(self):
+        for threads in ("1", "2"):
+            with environment_append({"CONAN_COMPRESSION_THREADS": threads,
+                                     "CONAN_COMPRESSION_LEVEL": "3"}):
+                path = compress_files(self.files, {"link": "file1.txt"}, PACKAGE_TZST_NAME,
+                                      dest_dir=self.folder)
+            checksums = calc_files_checksum({PACKAGE_TZST_NAME: path})
+            self.assertEqual(checksums[PACKAGE_TZST_NAME], {"md5": md5sum(path),
+                                                            "sha1": sha1sum(path)})
+            dest = temp_folder()
+            with open(path, "rb") as f:
+                extract_parallel(PACKAGE_TZST_NAME, f, dest, threads=2)
+            self.assertEqual(sorted(os.listdir(dest)), sorted(list(self.files) + ["link"]))
+            self.assertEqual(os.readlink(os.path.join(dest, "link")), "file1.txt")
+            with open(os.path.join(dest, "file3.txt"), "rb") as f:
+                self.assertEqual(f.read(), _random_content(100000, seed=3))
+
+    def test_corrupted(self):
+        path = compress_files(self.files, {}, PACKAGE_TZST_NAME, dest_dir=self.folder)
+        with open(path, "rb") as f:
+            data = f.read()
+        # data[:-2] still contains all the tar members, only the end of the frame is missing
+        for corrupted in (data[:len(data) // 2], data[:-2], b"not a zstd file"):
+            with self.assertRaises(tarfile.ReadError):
+                extract_parallel(PACKAGE_TZST_NAME, io.BytesIO(corrupted), temp_folder(),
+                                 threads=2)
+
+
+class ZstdNotAvailableTest(unittest.TestCase):
+
+    def test_missing_zstandard(self):
+        zstandard = compression.zstandard
+        compression.zstandard = None
+        try:
+            with pytest.raises(ConanException, match="pip install zstandard"):
+                compress_files({}, {}, PACKAGE_TZST_NAME, dest_dir=temp_folder())
+            with pytest.raises(ConanException, match="pip install zstandard"):
+                extract_parallel(PACKAGE_TZST_NAME, io.BytesIO(b""), temp_folder(), threads=2)
+        finally:
+            compression.zstandard = zstandard
+
+
+class ChecksumWriterTest(unittest.TestCase):
+
+    def test_checksums(self):
+        folder = temp_folder()
+        path = os.path.join(folder, "file.bin")
+        with open(path, "wb") as f:
+            writer = ChecksumWriter(f)
+            writer.write(b"Hello ")
+            writer.write(b"world")
+        self.assertEqual(writer.checksums, {"md5": md5sum(path), "sha1": sha1sum(path)})
+        self.assertEqual(writer.tell(), 11)
@@ -0,0 +1,118 @@
+import io
+import os
+import platform
+import stat
+import tarfile
+import unittest
+
+import pytest
+
+from conans.test.utils.test_files import temp_folder
+from conans.util.compression import InflateReader, tgz_extract_parallel
+from conans.util.files import gzopen_without_timestamps, load
+
+
+def _tgz(members):
+    """ members: list of (TarInfo, content or None) """
+    output = io.BytesIO()
+    tgz = gzopen_without_timestamps("file.tgz", mode="w", fileobj=output)
+    for info, content in members:
+        if content is not None:
+            info.size = len(content)
+            tgz.addfile(info, io.BytesIO(content))
+        else:
+            tgz.addfile(info)
+    tgz.close()
+    output.seek(0)
+    return output
+
+
+def _file(name, mode=0o644):
+    info = tarfile.TarInfo(name)
+    info.mode = mode
+    return info
+
+
+class TarExtractParallelTest(unittest.TestCase):
+
+    def test_extract(self):
+        members = [(_file("include/lib%s/header%s.h" % (i % 7, i)), b"content %d" % i)
+                   for i in range(500)]
+        folder = tarfile.TarInfo("include/empty")
+        folder.type = tarfile.DIRTYPE
+        folder.mode = 0o755
+        members.append((folder, None))
+        members.append((_file("bin/exe", 0o755), b"binary"))
+        dest = temp_folder()
+        tgz_extract_parallel(_tgz(members), dest, threads=4)
+
+        for i in range(500):
+            path = os.path.join(dest, "include", "lib%s" % (i % 7), "header%s.h" % i)
+            self.assertEqual(load(path), "content %d" % i)
+        self.assertTrue(os.path.isdir(os.path.join(dest, "include", "empty")))
+        if platform.system() != "Windows":
+            self.assertTrue(os.stat(os.path.join(dest, "bin/exe")).st_mode & stat.S_IXUSR)
+
+    def test_big_files_and_repeated(self):
+        big = os.urandom(1024) * 1024 * 5
+        members = [(_file("big.bin"), big), (_file("file.txt"), b"first"),
+                   (_file("file.txt"), b"second")]
+        dest = temp_folder()
+        tgz_extract_parallel(_tgz(members), dest, threads=2)
+        self.assertEqual(load(os.path.join(dest, "big.bin"), binary=True), big)
+        self.assertEqual(load(os.path.join(dest, "file.txt")), "second")
+
+    def test_unsafe_members_skipped(self):
+        hardlink = tarfile.TarInfo("hardlink")
+        hardlink.type = tarfile.LNKTYPE
+        hardlink.linkname = "file.txt"
+        members = [(_file("../outside.txt"), b"evil"),
+                   (_file("folder/../../outside2.txt"), b"evil"),
+                   (_file("file.txt"), b"good"),
+                   (hardlink, None)]
+        root = temp_folder()
+        dest = os.path.join(root, "dest")
+        tgz_extract_parallel(_tgz(members), dest, threads=2)
+        self.assertEqual(os.listdir(root), ["dest"])
+        self.assertEqual(os.listdir(dest), ["file.txt"])
+
+    @pytest.mark.skipif(platform.system() == "Windows", reason="Requires symlinks")
+    def test_symlinks(self):
+        outside = temp_folder()
+        link_inside = tarfile.TarInfo("lib/libfoo.so")
+        link_inside.type = tarfile.SYMTYPE
+        link_inside.linkname = "libfoo.so.1"
+        link_outside = tarfile.TarInfo("out")
+        link_outside.type = tarfile.SYMTYPE
+        link_outside.linkname = outside
+        members = [(_file("lib/libfoo.so.1"), b"lib"), (link_inside, None),
+                   (link_outside, None), (_file("out/evil.txt"), b"evil")]
+        dest = temp_folder()
+        tgz_extract_parallel(_tgz(members), dest, threads=2)
+        self.assertEqual(os.readlink(os.path.join(dest, "lib/libfoo.so")), "libfoo.so.1")
+        self.assertEqual(os.listdir(outside), [])
+
+    def test_corrupted(self):
+        data = _tgz([(_file("file.txt"), os.urandom(100000))]).getvalue()
+        with self.assertRaises(tarfile.ReadError):
+            tgz_extract_parallel(io.BytesIO(data[:len(data) // 2]), temp_folder(), threads=2)
+        with self.assertRaises(tarfile.ReadError):
+            tgz_extract_parallel(io.BytesIO(b"not a gzip file"), temp_folder(), threads=2)
+
+
+class InflateReaderTest(unittest.TestCase):
+
+    def test_read(self):
+        content = os.urandom(100000)
+        tgz = _tgz([(_file("file.bin"), content)])
+        reader = InflateReader(tgz, chunk_size=1000, max_chunks=2)
+        header = reader.read(512)
+        self.assertEqual(len(header), 512)
+        self.assertEqual(reader.read(len(content)), content)
+        reader.close()
+
+    def test_close_before_end(self):
+        tgz = _tgz([(_file("file.bin"), os.urandom(100000))])
+        reader = InflateReader(tgz, chunk_size=100, max_chunks=1)
+        reader.read(10)
+        reader.close()
@@ -97,7 +97,8 @@ class TestingResponse(object):
 
     @property
     def ok(self):
-        return self.test_response.status_code == 200
+        # 206 for the responses to range requests
+        return self.test_response.status_code in (200, 206)
 
     def raise_for_status(self):
         """Raises stored :class:`HTTPError`, if one occurred."""
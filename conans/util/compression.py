@@ -0,0 +1,511 @@
+import gzip
+import hashlib
+import os
+import shutil
+import struct
+import tarfile
+import threading
+import zlib
+from collections import deque
+from multiprocessing.pool import ThreadPool
+from os.path import abspath, realpath
+
+from six.moves import queue
+
+from conans.errors import ConanException
+from conans.util.log import logger
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, only needed for the zstd compressed artifacts
+    zstandard = None
+
+# Size of the uncompressed blocks deflated in parallel, same default as pigz
+PARALLEL_GZIP_BLOCK_SIZE = 128 * 1024
+# Deflate back-references reach as far as 32KB, the max dictionary size
+_DICTIONARY_SIZE = 32 * 1024
+# Extension of the tar files compressed with zstd
+ZSTD_EXTENSION = ".tzst"
+# zstd long distance matching window (128MB). It is the biggest window that the zstd decoders
+# accept by default, without raising their memory limit
+ZSTD_WINDOW_LOG = 27
+
+
+def _new_hash(algorithm_name):
+    try:
+        return hashlib.new(algorithm_name)
+    except ValueError:  # FIPS error https://github.com/conan-io/conan/issues/7800
+        return hashlib.new(algorithm_name, usedforsecurity=False)
+
+
+class ChecksumWriter(object):
+    """ Write-only file-like wrapper that computes the md5 and sha1 of the written bytes, so
+    a file checksum is available as soon as it is written, without reading it back
+    """
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._md5 = _new_hash("md5")
+        self._sha1 = _new_hash("sha1")
+        self._size = 0
+
+    def write(self, data):
+        self._md5.update(data)
+        self._sha1.update(data)
+        self._size += len(data)
+        return self._fileobj.write(data)
+
+    def tell(self):
+        return self._size
+
+    def flush(self):
+        self._fileobj.flush()
+
+    @property
+    def checksums(self):
+        return {"md5": self._md5.hexdigest(), "sha1": self._sha1.hexdigest()}
+
+
+class ChecksumReader(object):
+    """ Read-only file-like wrapper that computes the md5 and sha1 of the read bytes, and
+    optionally copies them to a 'tee' file-like object
+    """
+    def __init__(self, fileobj, tee=None):
+        self._fileobj = fileobj
+        self._tee = tee
+        self._md5 = _new_hash("md5")
+        self._sha1 = _new_hash("sha1")
+        self.size = 0
+
+    def read(self, size=-1):
+        data = self._fileobj.read(size)
+        self._md5.update(data)
+        self._sha1.update(data)
+        self.size += len(data)
+        if self._tee is not None:
+            self._tee.write(data)
+        return data
+
+    def drain(self, chunk_size=1024 * 1024):
+        """ read until the end, so the checksums are from the whole input
+        """
+        while self.read(chunk_size):
+            pass
+
+    @property
+    def checksums(self):
+        return {"md5": self._md5.hexdigest(), "sha1": self._sha1.hexdigest()}
+
+
+def _deflate_block(block, dictionary, compresslevel, last):
+    if dictionary:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS,
+                                      zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, dictionary)
+    else:
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    data = compressor.compress(block)
+    # A sync flush byte-aligns the raw deflate stream without marking it as final, so the
+    # compressed blocks can be concatenated in order into a single valid deflate stream
+    return data + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+class ParallelGzipWriter(object):
+    """ Write-only gzip file-like object that deflates fixed size blocks in a pool of threads,
+    the same approach of pigz. Each block is primed with the last 32KB of the previous one as
+    dictionary, so the compression ratio is close to the single threaded one.
+
+    The output only depends on the input data, the compression level and the block size, never
+    on the number of threads or their scheduling, so it is reproducible. Memory is bounded, at
+    most 2 blocks per thread are kept in flight.
+    """
+    def __init__(self, fileobj, filename="", compresslevel=9, threads=2,
+                 block_size=PARALLEL_GZIP_BLOCK_SIZE):
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._block_size = block_size
+        self._threads = max(1, threads)
+        self._pool = ThreadPool(self._threads)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = zlib.crc32(b"")
+        self._size = 0
+        self.closed = False
+        self._write_header(filename)
+
+    def _write_header(self, filename):
+        # Same header as gzip.GzipFile(mtime=0) writes, the name without the ".gz" extension
+        fname = os.path.basename(filename).encode("latin-1") if filename else b""
+        if fname.endswith(b".gz"):
+            fname = fname[:-3]
+        flags = 0x08 if fname else 0  # FNAME
+        if self._compresslevel == 9:
+            xfl = b"\002"
+        elif self._compresslevel == 1:
+            xfl = b"\004"
+        else:
+            xfl = b"\000"
+        header = b"\037\213\010" + struct.pack("<BI", flags, 0) + xfl + b"\377"
+        if fname:
+            header += fname + b"\000"
+        self._fileobj.write(header)
+
+    def write(self, data):
+        if self.closed:
+            raise ValueError("write() on closed ParallelGzipWriter")
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def tell(self):
+        return self._size + len(self._buffer)
+
+    def _submit(self, block, last):
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        dictionary = self._dictionary
+        self._dictionary = block[-_DICTIONARY_SIZE:]
+        result = self._pool.apply_async(_deflate_block,
+                                        (block, dictionary, self._compresslevel, last))
+        self._pending.append(result)
+        while len(self._pending) > 2 * self._threads:
+            self._fileobj.write(self._pending.popleft().get())
+
+    def flush(self):
+        # Only the already deflated blocks can be flushed, without altering the final output
+        self._fileobj.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            block = bytes(self._buffer)
+            self._buffer = bytearray()
+            self._submit(block, last=True)
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().get())
+            self._fileobj.write(struct.pack("<II", self._crc & 0xffffffff,
+                                            self._size & 0xffffffff))
+            self._fileobj.flush()
+        finally:
+            self._pool.close()
+            self._pool.join()
+
+
+def gzopen_parallel(name, fileobj, compresslevel=9, threads=2):
+    """ Like gzopen_without_timestamps() in write mode, but deflating in parallel blocks with
+    ParallelGzipWriter. It generates a different (still reproducible) stream than the single
+    threaded gzip
+    """
+    gzfileobj = ParallelGzipWriter(fileobj, name, compresslevel, threads)
+    try:
+        # Format is forced because in Python3.8, it changed and it generates different tarfiles
+        # with different checksums, which break hashes of tgzs
+        t = tarfile.TarFile.taropen(name, "w", gzfileobj, format=tarfile.GNU_FORMAT)
+    except Exception:
+        gzfileobj.close()
+        raise
+    t._extfileobj = False
+    return t
+
+
+def is_zstd_file(filename):
+    return filename.endswith(ZSTD_EXTENSION)
+
+
+def check_zstd_available(filename):
+    if zstandard is None:
+        raise ConanException("The 'zstandard' python package is needed to handle the zstd "
+                             "compressed file '%s'. Install it with 'pip install zstandard'"
+                             % filename)
+
+
+def zstdopen(name, fileobj, compresslevel=9, threads=1):
+    """ Like gzopen_without_timestamps() in write mode, but compressing with zstd, with long
+    distance matching. threads > 1 compresses with the zstd internal threads
+    """
+    check_zstd_available(name)
+    params = zstandard.ZstdCompressionParameters.from_level(compresslevel,
+                                                            window_log=ZSTD_WINDOW_LOG,
+                                                            enable_ldm=True,
+                                                            write_checksum=True,
+                                                            threads=threads if threads > 1 else 0)
+    compressor = zstandard.ZstdCompressor(compression_params=params)
+    zstfileobj = compressor.stream_writer(fileobj, closefd=False)
+    try:
+        t = tarfile.TarFile.taropen(name, "w", zstfileobj, format=tarfile.GNU_FORMAT)
+    except Exception:
+        zstfileobj.close()
+        raise
+    t._extfileobj = False
+    return t
+
+
+def _gzip_reader(fileobj):
+    return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+
+class _ZstdReader(object):
+    """ Read-only file-like object returning the data of a zstd stream. Unlike the zstandard
+    stream_reader(), it fails if the stream ends in the middle of a frame
+    """
+    def __init__(self, fileobj, read_size=128 * 1024):
+        self._fileobj = fileobj
+        self._read_size = read_size
+        self._decompressor = zstandard.ZstdDecompressor(max_window_size=1 << ZSTD_WINDOW_LOG)
+        self._frame = self._decompressor.decompressobj()
+        self._in_frame = False
+        self._data = b""
+        self._pos = 0
+
+    def _decompress(self, compressed):
+        chunks = []
+        while compressed:
+            self._in_frame = True
+            chunks.append(self._frame.decompress(compressed))
+            compressed = b""
+            if self._frame.eof:  # Concatenated frames are valid zstd streams
+                compressed = self._frame.unused_data
+                self._frame = self._decompressor.decompressobj()
+                self._in_frame = False
+        self._data = b"".join(chunks)
+        self._pos = 0
+
+    def read(self, size):
+        while self._pos >= len(self._data):
+            compressed = self._fileobj.read(self._read_size)
+            if not compressed:
+                if self._in_frame:
+                    raise EOFError("Compressed file ended before the end of the zstd frame")
+                return b""
+            self._decompress(compressed)
+        data = self._data[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+
+_DECOMPRESS_ERRORS = (OSError, EOFError, zlib.error)
+if zstandard is not None:
+    _DECOMPRESS_ERRORS += (zstandard.ZstdError, )
+
+
+class InflateReader(object):
+    """ Read-only file-like object returning the data of a compressed stream, decompressed in a
+    background thread, so decompression overlaps with the consumer work. At most 'max_chunks'
+    decompressed chunks are buffered. 'decompressor(fileobj)' returns the file-like object
+    reading the decompressed data, gzip by default
+    """
+    def __init__(self, fileobj, chunk_size=1024 * 1024, max_chunks=16, decompressor=None):
+        self._decompressor = decompressor or _gzip_reader
+        self._queue = queue.Queue(max_chunks)
+        self._chunk_size = chunk_size
+        self._current = b""
+        self._pos = 0
+        self._eof = False
+        self._stopped = False
+        self._thread = threading.Thread(target=self._inflate, args=(fileobj, ))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _inflate(self, fileobj):
+        try:
+            gz = self._decompressor(fileobj)
+            while not self._stopped:
+                data = gz.read(self._chunk_size)
+                self._queue.put(data)
+                if not data:
+                    break
+        except BaseException as e:
+            self._queue.put(e)
+
+    def _next_chunk(self):
+        data = self._queue.get()
+        if isinstance(data, BaseException):
+            self._eof = True
+            if isinstance(data, _DECOMPRESS_ERRORS):
+                raise tarfile.ReadError("not a compressed file or corrupted: %s" % str(data))
+            raise data
+        if not data:
+            self._eof = True
+        self._current = data
+        self._pos = 0
+
+    def read(self, size=-1):
+        chunks = []
+        while size != 0 and not self._eof:
+            if self._pos >= len(self._current):
+                self._next_chunk()
+                continue
+            if size < 0:
+                chunk = self._current[self._pos:]
+            else:
+                chunk = self._current[self._pos:self._pos + size]
+                size -= len(chunk)
+            self._pos += len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def close(self):
+        self._stopped = True
+        # Unblock the inflating thread if it is waiting for room in the queue
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+
+class ParallelTarExtractor(object):
+    """ Extracts a tgz stream: the gzip inflate runs in a reader thread, while the regular files
+    are written to disk by a pool of threads. The tar members are parsed sequentially by the
+    caller thread, which creates the folders and validates the paths, once per folder instead of
+    resolving the real path of every single file.
+
+    Same policy as files.tar_extract(): members outside the destination and hardlinks are skipped
+    and windows separators fixed.
+
+    If given, file_linker(name, size, mode, target) is called before writing every regular file,
+    returning True if it already created the target, so its data is skipped
+    """
+    # Files bigger than this are written by the parsing thread, to keep memory bounded
+    inline_size = 4 * 1024 * 1024
+
+    def __init__(self, destination_dir, threads, file_linker=None):
+        self._destination_dir = destination_dir
+        self._file_linker = file_linker
+        self._base = realpath(abspath(destination_dir))
+        self._threads = max(1, threads)
+        self._safe_dirs = {}
+        self._created_dirs = set()
+        self._directories = []
+        self._pending = deque()
+        self._pending_paths = set()
+        self._set_owner = hasattr(os, "geteuid") and os.geteuid() == 0
+
+    def extract(self, fileobj, decompressor=None):
+        reader = InflateReader(fileobj, decompressor=decompressor)
+        pool = ThreadPool(self._threads)
+        try:
+            the_tar = tarfile.open(fileobj=reader, mode="r|")
+            for member in the_tar:
+                self._extract_member(the_tar, member, pool)
+            # Consume the tar padding until the end, so the whole compressed stream is read and
+            # its checksum verified, and streamed inputs are fully hashed
+            while reader.read(1024 * 1024):
+                pass
+            self._wait_pending()
+            # Like TarFile.extractall(), set folders attributes after its files are created
+            for member in sorted(self._directories, key=lambda m: m.name, reverse=True):
+                self._set_attrs(the_tar, member, os.path.join(self._destination_dir,
+                                                              member.name))
+            the_tar.close()
+        finally:
+            pool.close()
+            pool.join()
+            reader.close()
+
+    def _is_safe_dir(self, dir_name):
+        safe = self._safe_dirs.get(dir_name)
+        if safe is None:
+            full_path = realpath(abspath(os.path.join(self._base, dir_name)))
+            safe = full_path == self._base or full_path.startswith(self._base + os.sep)
+            self._safe_dirs[dir_name] = safe
+        return safe
+
+    def _is_safe(self, name):
+        dir_name, base_name = os.path.split(name)
+        if not self._is_safe_dir(dir_name):
+            return False
+        if base_name in ("", ".", ".."):
+            return self._is_safe_dir(name)
+        target = os.path.join(self._base, name)
+        if os.path.islink(target):  # Existing links could point anywhere, check them fully
+            return realpath(target).startswith(self._base)
+        return True
+
+    def _makedirs(self, dir_path):
+        if dir_path not in self._created_dirs:
+            if not os.path.isdir(dir_path):
+                os.makedirs(dir_path)
+            self._created_dirs.add(dir_path)
+
+    def _extract_member(self, the_tar, member, pool):
+        # Fixes unzip a windows zipped file in linux
+        member.name = member.name.replace("\\", "/")
+        if member.islnk() or not self._is_safe(member.name):
+            logger.warning("file:%s is skipped since it's not safe." % str(member.name))
+            return
+
+        target = os.path.join(self._destination_dir, member.name)
+        if target in self._pending_paths:  # Repeated member in the tar, the last one wins
+            self._wait_pending()
+        self._makedirs(os.path.dirname(target))
+        if member.isreg():
+            if self._file_linker and self._file_linker(member.name, member.size, member.mode,
+                                                       target):
+                return
+            if member.size > self.inline_size:
+                with open(target, "wb") as f:
+                    shutil.copyfileobj(the_tar.extractfile(member), f, 1024 * 1024)
+                self._set_attrs(the_tar, member, target)
+            else:
+                data = the_tar.extractfile(member).read()
+                result = pool.apply_async(self._write_file, (the_tar, member, target, data))
+                self._pending.append((target, result))
+                self._pending_paths.add(target)
+                while len(self._pending) > 8 * self._threads:
+                    self._pop_pending()
+        elif member.isdir():
+            self._directories.append(member)
+            self._makedirs(target)
+        else:
+            self._wait_pending()
+            the_tar.extract(member, self._destination_dir)
+            if member.issym():  # New links can change the real path of the folders
+                self._safe_dirs.clear()
+
+    def _write_file(self, the_tar, member, target, data):
+        with open(target, "wb") as f:
+            f.write(data)
+        self._set_attrs(the_tar, member, target)
+
+    def _set_attrs(self, the_tar, member, target):
+        # The same as TarFile with errorlevel=1, attributes errors are ignored
+        try:
+            if self._set_owner:
+                the_tar.chown(member, target, False)
+            the_tar.chmod(member, target)
+            the_tar.utime(member, target)
+        except tarfile.ExtractError as e:
+            logger.debug("tarfile: %s" % e)
+
+    def _pop_pending(self):
+        target, result = self._pending.popleft()
+        self._pending_paths.discard(target)
+        result.get()
+
+    def _wait_pending(self):
+        while self._pending:
+            self._pop_pending()
+
+
+def tgz_extract_parallel(fileobj, destination_dir, threads):
+    """ Extract a tgz file, with the inflate and the files writing done in parallel
+    """
+    ParallelTarExtractor(destination_dir, threads).extract(fileobj)
+
+
+def extract_parallel(filename, fileobj, destination_dir, threads, file_linker=None):
+    """ Same as tgz_extract_parallel(), for tgz or zstd compressed tar files, the format is given
+    by the 'filename' extension
+    """
+    decompressor = None
+    if is_zstd_file(filename):
+        check_zstd_available(filename)
+        decompressor = _ZstdReader
+    extractor = ParallelTarExtractor(destination_dir, threads, file_linker)
+    extractor.extract(fileobj, decompressor)
@@ -18,6 +18,14 @@ import six
 
 from conans.util.log import logger
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl request to clone the extents of a file (reflink), supported by btrfs and xfs
+_FICLONE = 0x40049409
+
 
 def walk(top, **kwargs):
     if six.PY2:
@@ -289,6 +297,24 @@ def mkdir(path):
     os.makedirs(path)
 
 
+def reflink(src, dst):
+    """ Creates 'dst' sharing the data blocks of 'src' (copy on write), only Linux. Returns False
+    if the filesystem doesn't support it
+    """
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    with open(src, "rb") as src_handle, open(dst, "wb") as dst_handle:
+        try:
+            fcntl.ioctl(dst_handle.fileno(), _FICLONE, src_handle.fileno())
+        except (IOError, OSError):
+            cloned = False
+        else:
+            cloned = True
+    if not cloned:
+        os.remove(dst)
+    return cloned
+
+
 def path_exists(path, basedir):
     """Case sensitive, for windows, optional
     basedir for skip caps check for tmp folders in testing for example (returned always
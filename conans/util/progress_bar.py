@@ -63,15 +63,17 @@ class Progress(object):
     def update(self, chunks):
         for chunk in chunks:
             yield chunk
-            data_size = len(chunk)
-            self._processed_size += data_size
-            self._pb_update(data_size)
+            self.increment(len(chunk))
 
         if self._total_length > self._processed_size:
             self._pb_update(self._total_length - self._processed_size)
 
         self.pb_close()
 
+    def increment(self, size):
+        self._processed_size += size
+        self._pb_update(size)
+
     def pb_close(self):
         if self._tqdm_bar is not None:
             self._tqdm_bar.close()